@@ -6,20 +6,46 @@ Lightweight quantum simulation and VQC training service
 import os
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Literal, Tuple
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context, shared_memory
 import json
+import base64
 import numpy as np
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel, Field, field_validator
 import uvicorn
 from contextlib import asynccontextmanager
 import time
-import hashlib
+from secrets import token_hex
 from functools import lru_cache
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = True
+except ImportError:
+    CUPY_AVAILABLE = False
+
+try:
+    from cuquantum import custatevec, cudaDataType, ComputeType
+    CUSTATEVEC_AVAILABLE = True
+except ImportError:
+    CUSTATEVEC_AVAILABLE = False
+
+# "cpu" (NumPy/Numba) or "gpu" (CuPy, with cuStateVec when installed)
+QUANTUM_BACKEND = os.environ.get("QUANTUM_BACKEND", "cpu").lower()
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -28,29 +54,144 @@ logger = logging.getLogger(__name__)
 SIMULATION_CACHE = {}
 VQC_MODELS = {}
 JOB_QUEUE = []
-COMPLETED_JOBS = {}
+
+# Job records in insertion order; the oldest are evicted beyond MAX_JOBS
+MAX_JOBS = int(os.environ.get("MAX_JOBS", 1024))
+COMPLETED_JOBS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+JOBS_LOCK = asyncio.Lock()
+
+# Live parameter/progress buffers of running training jobs, keyed by job ID
+TRAINING_PROGRESS: Dict[str, np.ndarray] = {}
+
+# Worker pool for CPU-bound jobs; None (before startup) means the default thread pool
+EXECUTOR: Optional[ProcessPoolExecutor] = None
+
+# Upper bound on samples x features accepted by a single training request
+MAX_TRAINING_VALUES = 65536
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _apply_1q_kernel(state, gates, target, num_qubits):
+        """Apply a 2x2 gate in place to every row of a (batch, 2**n) state"""
+        stride = 1 << (num_qubits - 1 - target)
+        num_pairs = state.shape[1] // 2
+        shared = gates.shape[0] == 1
+        for p in prange(state.shape[0] * num_pairs):
+            b = p // num_pairs
+            k = p % num_pairs
+            i = (k // stride) * 2 * stride + (k % stride)
+            j = i + stride
+            g = 0 if shared else b
+            a0 = state[b, i]
+            a1 = state[b, j]
+            state[b, i] = gates[g, 0, 0] * a0 + gates[g, 0, 1] * a1
+            state[b, j] = gates[g, 1, 0] * a0 + gates[g, 1, 1] * a1
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _apply_2q_kernel(state, gate, first, second, num_qubits):
+        """Apply a 4x4 gate in place to every row of a (batch, 2**n) state"""
+        bit_first = num_qubits - 1 - first
+        bit_second = num_qubits - 1 - second
+        low = min(bit_first, bit_second)
+        high = max(bit_first, bit_second)
+        num_quads = state.shape[1] // 4
+        for p in prange(state.shape[0] * num_quads):
+            b = p // num_quads
+            k = p % num_quads
+            # Insert zero bits at both target positions to get the |00> index
+            base = ((k >> low) << (low + 1)) | (k & ((1 << low) - 1))
+            base = ((base >> high) << (high + 1)) | (base & ((1 << high) - 1))
+            i00 = base
+            i01 = base | (1 << bit_second)
+            i10 = base | (1 << bit_first)
+            i11 = i10 | (1 << bit_second)
+            a00 = state[b, i00]
+            a01 = state[b, i01]
+            a10 = state[b, i10]
+            a11 = state[b, i11]
+            state[b, i00] = gate[0, 0] * a00 + gate[0, 1] * a01 + gate[0, 2] * a10 + gate[0, 3] * a11
+            state[b, i01] = gate[1, 0] * a00 + gate[1, 1] * a01 + gate[1, 2] * a10 + gate[1, 3] * a11
+            state[b, i10] = gate[2, 0] * a00 + gate[2, 1] * a01 + gate[2, 2] * a10 + gate[2, 3] * a11
+            state[b, i11] = gate[3, 0] * a00 + gate[3, 1] * a01 + gate[3, 2] * a10 + gate[3, 3] * a11
+
+# Permutation gates that are applied as amplitude swaps rather than products
+PAULI_X_MATRIX = np.array([[0, 1], [1, 0]], dtype=np.complex64)
+CNOT_MATRIX = np.array([[1, 0, 0, 0], [0, 1, 0, 0],
+                        [0, 0, 0, 1], [0, 0, 1, 0]], dtype=np.complex64)
+
+# Fixed gates accepted by the circuit simulation endpoint
+GATES = {
+    'h': (np.array([[1, 1], [1, -1]]) / np.sqrt(2)).astype(np.complex64),
+    'x': PAULI_X_MATRIX,
+    'y': np.array([[0, -1j], [1j, 0]], dtype=np.complex64),
+    'z': np.array([[1, 0], [0, -1]], dtype=np.complex64),
+    'cnot': CNOT_MATRIX,
+}
+
+def _check_gate_targets(gate: np.ndarray, targets: List[int], num_qubits: int) -> None:
+    """Reject target lists the gate kernels cannot apply safely
+
+    The in-place kernels index the state without bounds checks, so every
+    target must be a distinct qubit of the register and there must be one
+    per gate qubit.
+    """
+    if len(set(targets)) != len(targets):
+        raise ValueError(f"Gate targets {targets} must be distinct")
+    for qubit in targets:
+        if not 0 <= qubit < num_qubits:
+            raise ValueError(f"Target qubit {qubit} out of range for {num_qubits} qubits")
+    gate_qubits = gate.shape[-1].bit_length() - 1
+    if len(targets) != gate_qubits:
+        raise ValueError(f"A {gate_qubits}-qubit gate needs {gate_qubits} targets, got {len(targets)}")
 
 # Quantum simulation with reduced memory footprint
 class QuantumSimulatorLite:
     """Lightweight quantum simulator for App Runner constraints"""
+
+    # Array module holding the state vectors
+    xp = np
     
-    def __init__(self, max_qubits: int = 12):  # Limited for 4GB memory
+    def __init__(self, max_qubits: int = 12, dtype=np.complex64):  # Limited for 4GB memory
         self.max_qubits = max_qubits
+        # Single precision halves memory traffic in the bandwidth-bound gate kernels
+        self.dtype = dtype
+        self.rng = np.random.default_rng()
         
     def create_state_vector(self, num_qubits: int) -> np.ndarray:
         """Create quantum state vector"""
         if num_qubits > self.max_qubits:
             raise ValueError(f"Maximum {self.max_qubits} qubits supported")
         
-        state = np.zeros(2**num_qubits, dtype=complex)
+        state = self.xp.zeros(2**num_qubits, dtype=self.dtype)
         state[0] = 1.0  # |0...0⟩
         return state
+
+    def asnumpy(self, array) -> np.ndarray:
+        """Host copy of an array produced by this simulator"""
+        return array
     
     def apply_gate(self, state: np.ndarray, gate_matrix: np.ndarray, 
                    target_qubits: List[int]) -> np.ndarray:
-        """Apply quantum gate to state vector"""
-        num_qubits = int(np.log2(len(state)))
-        
+        """Apply quantum gate to a state vector or a (batch, 2**n) stack of them
+
+        Permutation gates (and, with Numba available, all gates) are applied in
+        place and ``state`` itself is returned; callers should always use the
+        return value.
+        """
+        num_qubits = int(np.log2(state.shape[-1]))
+        gate_matrix = np.asarray(gate_matrix, dtype=state.dtype)
+        _check_gate_targets(gate_matrix, target_qubits, num_qubits)
+
+        # X and CNOT only permute amplitudes, so swap them in place
+        if len(target_qubits) == 1 and np.array_equal(gate_matrix, PAULI_X_MATRIX):
+            return self._swap_target_amplitudes(state, target_qubits[0], num_qubits)
+        if len(target_qubits) == 2 and np.array_equal(gate_matrix, CNOT_MATRIX):
+            return self._swap_target_amplitudes(state, target_qubits[1], num_qubits,
+                                                control=target_qubits[0])
+
+        if NUMBA_AVAILABLE and state.flags.c_contiguous:
+            return self._apply_gate_jit(state, gate_matrix, target_qubits, num_qubits)
+
         if len(target_qubits) == 1:
             return self._apply_single_qubit_gate(state, gate_matrix, target_qubits[0], num_qubits)
         elif len(target_qubits) == 2:
@@ -58,57 +199,210 @@ class QuantumSimulatorLite:
         else:
             raise ValueError("Only 1 and 2 qubit gates supported")
     
+    def _swap_target_amplitudes(self, state: np.ndarray, target: int, num_qubits: int,
+                                control: Optional[int] = None) -> np.ndarray:
+        """Flip the target bit (where the control bit is 1, if given) by swapping halves"""
+        state = self.xp.ascontiguousarray(state)
+        state_nd = state.reshape([-1] + [2] * num_qubits)
+
+        # Axis 0 is the batch axis; select target=0 and target=1 slices
+        zero_idx = [slice(None)] * (num_qubits + 1)
+        if control is not None:
+            zero_idx[control + 1] = 1
+        one_idx = list(zero_idx)
+        zero_idx[target + 1] = 0
+        one_idx[target + 1] = 1
+        zero_idx, one_idx = tuple(zero_idx), tuple(one_idx)
+
+        zero_half = state_nd[zero_idx].copy()
+        state_nd[zero_idx] = state_nd[one_idx]
+        state_nd[one_idx] = zero_half
+        return state
+
+    def _apply_gate_jit(self, state: np.ndarray, gate: np.ndarray,
+                        targets: List[int], num_qubits: int) -> np.ndarray:
+        """Dispatch to the in-place Numba kernels"""
+        state_2d = state.reshape(-1, state.shape[-1])
+
+        if len(targets) == 1:
+            _apply_1q_kernel(state_2d, gate.reshape(-1, 2, 2), targets[0], num_qubits)
+        elif len(targets) == 2:
+            _apply_2q_kernel(state_2d, gate, targets[0], targets[1], num_qubits)
+        else:
+            raise ValueError("Only 1 and 2 qubit gates supported")
+        return state
+
     def _apply_single_qubit_gate(self, state: np.ndarray, gate: np.ndarray, 
                                 target: int, num_qubits: int) -> np.ndarray:
-        """Apply single qubit gate"""
-        new_state = state.copy()
-        
-        for i in range(len(state)):
-            bit_string = format(i, f'0{num_qubits}b')
-            target_bit = int(bit_string[target])
-            
-            # Calculate the index after flipping target bit
-            flipped_i = i ^ (1 << (num_qubits - 1 - target))
-            
-            if target_bit == 0:
-                new_state[i] = gate[0, 0] * state[i] + gate[0, 1] * state[flipped_i]
-            else:
-                new_state[i] = gate[1, 0] * state[flipped_i] + gate[1, 1] * state[i]
-        
-        return new_state
-    
-    def _apply_two_qubit_gate(self, state: np.ndarray, gate: np.ndarray, 
+        """Apply single qubit gate (one shared gate or one gate per batch row)"""
+        # Qubit 0 is the most significant bit, so the target axis splits the
+        # index space into (batch, left qubits, target, right qubits)
+        state_4d = state.reshape(-1, 1 << target, 2, 1 << (num_qubits - target - 1))
+        subscripts = 'bij,bajc->baic' if gate.ndim == 3 else 'ij,bajc->baic'
+        return self.xp.einsum(subscripts, gate, state_4d).reshape(state.shape)
+
+    def _apply_two_qubit_gate(self, state: np.ndarray, gate: np.ndarray,
                              targets: List[int], num_qubits: int) -> np.ndarray:
-        """Apply two qubit gate (simplified CNOT)"""
-        new_state = state.copy()
-        control, target = targets[0], targets[1]
-        
-        for i in range(len(state)):
-            bit_string = format(i, f'0{num_qubits}b')
-            control_bit = int(bit_string[control])
-            target_bit = int(bit_string[target])
-            
-            if control_bit == 1:  # Apply X gate to target
-                flipped_i = i ^ (1 << (num_qubits - 1 - target))
-                new_state[i] = state[flipped_i]
-        
-        return new_state
+        """Apply two qubit gate"""
+        # Axis 0 of the reshaped state is the batch axis
+        first, second = targets[0] + 1, targets[1] + 1
+        state_nd = state.reshape([-1] + [2] * num_qubits)
+        gate_4d = gate.reshape(2, 2, 2, 2)
+
+        # Contract the gate's input indices with the two target axes; the
+        # output indices land in front and are moved back into place
+        new_state = self.xp.tensordot(gate_4d, state_nd, axes=([2, 3], [first, second]))
+        new_state = self.xp.moveaxis(new_state, [0, 1], [first, second])
+        return new_state.reshape(state.shape)
     
     def measure(self, state: np.ndarray, shots: int = 1000) -> Dict[str, int]:
         """Simulate quantum measurement"""
-        probabilities = np.abs(state)**2
+        probabilities = (state.real * state.real + state.imag * state.imag).astype(float)
+        probabilities /= probabilities.sum()  # absorb single-precision rounding
         num_qubits = int(np.log2(len(state)))
         
-        # Sample outcomes
-        outcomes = np.random.choice(len(probabilities), size=shots, p=probabilities)
-        
-        # Count results
-        counts = {}
-        for outcome in outcomes:
-            bit_string = format(outcome, f'0{num_qubits}b')
-            counts[bit_string] = counts.get(bit_string, 0) + 1
+        # Draw the per-outcome counts directly instead of individual shots
+        tally = self.rng.multinomial(shots, probabilities)
         
-        return counts
+        # Format only the outcomes that were observed
+        observed = np.nonzero(tally)[0]
+        return {format(int(i), f'0{num_qubits}b'): int(tally[i]) for i in observed}
+
+class QuantumSimulatorGPU(QuantumSimulatorLite):
+    """State-vector simulator keeping states resident in GPU memory
+
+    Shared gates go through cuStateVec's apply_matrix when cuquantum is
+    installed; per-sample gate stacks (and everything without cuquantum) use
+    the CuPy versions of the einsum/tensordot kernels.
+    """
+
+    xp = cp if CUPY_AVAILABLE else None
+
+    def __init__(self, max_qubits: int = 12, dtype=np.complex64):
+        super().__init__(max_qubits, dtype)
+        self.handle = custatevec.create() if CUSTATEVEC_AVAILABLE else None
+
+    def asnumpy(self, array) -> np.ndarray:
+        """Host copy of a device array"""
+        return cp.asnumpy(array)
+
+    def apply_gate(self, state, gate_matrix: np.ndarray, target_qubits: List[int]):
+        """Apply quantum gate to a device state vector or (batch, 2**n) stack"""
+        num_qubits = int(np.log2(state.shape[-1]))
+        gate_matrix = cp.asarray(gate_matrix, dtype=state.dtype)
+        _check_gate_targets(gate_matrix, target_qubits, num_qubits)
+
+        if self.handle is not None and gate_matrix.ndim == 2 and len(target_qubits) <= 2:
+            return self._apply_custatevec(state, gate_matrix, target_qubits, num_qubits)
+
+        if len(target_qubits) == 1:
+            return self._apply_single_qubit_gate(state, gate_matrix, target_qubits[0], num_qubits)
+        elif len(target_qubits) == 2:
+            return self._apply_two_qubit_gate(state, gate_matrix, target_qubits, num_qubits)
+        else:
+            raise ValueError("Only 1 and 2 qubit gates supported")
+
+    def _apply_custatevec(self, state, gate, targets: List[int], num_qubits: int):
+        """Apply a shared gate in place to every state row with cuStateVec"""
+        state = cp.ascontiguousarray(state)
+        single = state.dtype == np.complex64
+        data_type = cudaDataType.CUDA_C_32F if single else cudaDataType.CUDA_C_64F
+        compute_type = ComputeType.COMPUTE_32F if single else ComputeType.COMPUTE_64F
+
+        # cuStateVec counts bits from the LSB and takes the matrix's low-order
+        # target first; qubit 0 here is the MSB and the first gate index
+        bits = [num_qubits - 1 - q for q in reversed(targets)]
+        gate = cp.ascontiguousarray(gate)
+
+        workspace_size = custatevec.apply_matrix_get_workspace_size(
+            self.handle, data_type, num_qubits, gate.data.ptr, data_type,
+            custatevec.MatrixLayout.ROW, 0, len(bits), 0, compute_type)
+        workspace = cp.cuda.alloc(workspace_size) if workspace_size else None
+        workspace_ptr = workspace.ptr if workspace is not None else 0
+
+        for row in state.reshape(-1, state.shape[-1]):
+            custatevec.apply_matrix(
+                self.handle, row.data.ptr, data_type, num_qubits,
+                gate.data.ptr, data_type, custatevec.MatrixLayout.ROW, 0,
+                bits, len(bits), [], [], 0, compute_type,
+                workspace_ptr, workspace_size)
+        return state
+
+    def measure(self, state, shots: int = 1000) -> Dict[str, int]:
+        """Sample on the host from the device state"""
+        return super().measure(self.asnumpy(state), shots)
+
+def create_simulator(max_qubits: int = 12) -> QuantumSimulatorLite:
+    """Simulator for the configured QUANTUM_BACKEND"""
+    if QUANTUM_BACKEND == "gpu":
+        if CUPY_AVAILABLE:
+            return QuantumSimulatorGPU(max_qubits)
+        logger.warning("QUANTUM_BACKEND=gpu but CuPy is not installed; using CPU simulator")
+    return QuantumSimulatorLite(max_qubits)
+
+def _ry_matrices(theta: np.ndarray, dtype=np.complex64) -> np.ndarray:
+    """Stack of RY gates with shape theta.shape + (2, 2)"""
+    half = np.asarray(theta, dtype=float) / 2
+    cos, sin = np.cos(half), np.sin(half)
+    gates = np.empty(half.shape + (2, 2), dtype=dtype)
+    gates[..., 0, 0] = cos
+    gates[..., 0, 1] = -sin
+    gates[..., 1, 0] = sin
+    gates[..., 1, 1] = cos
+    return gates
+
+def _rz_matrices(theta: np.ndarray, dtype=np.complex64) -> np.ndarray:
+    """Stack of RZ gates with shape theta.shape + (2, 2)"""
+    phase = np.exp(0.5j * np.asarray(theta, dtype=float))
+    gates = np.zeros(phase.shape + (2, 2), dtype=dtype)
+    gates[..., 0, 0] = phase.conj()
+    gates[..., 1, 1] = phase
+    return gates
+
+def _entangling_permutation(num_qubits: int) -> np.ndarray:
+    """Gather indices equivalent to the CNOT(i, i+1) chain of one VQC layer"""
+    index = np.arange(2**num_qubits)
+    permutation = index.copy()
+    for i in range(num_qubits - 1):
+        control_bit = 1 << (num_qubits - 1 - i)
+        target_bit = 1 << (num_qubits - 2 - i)
+        # After CNOT, amplitude k comes from k with the target flipped when
+        # the control is set
+        source = np.where(index & control_bit, index ^ target_bit, index)
+        permutation = permutation[source]
+    return permutation
+
+@lru_cache(maxsize=None)
+def _compile_forward(num_qubits: int, num_layers: int):
+    """Generate a fully unrolled forward pass for one (num_qubits, num_layers) shape
+
+    The returned ``forward(state, rotation_gates)`` takes a (batch, 2**n)
+    state and the (layers, qubits, 2, 2) fused rotation gates. Reshapes and
+    qubit strides are emitted as constants, and each layer's CNOT chain is
+    folded into a single precomputed gather.
+    """
+    dim = 2**num_qubits
+    lines = ["def forward(state, rotation_gates):",
+             f"    rows = np.ascontiguousarray(state).reshape(-1, {dim})"]
+    for layer in range(num_layers):
+        for qubit in range(num_qubits):
+            if NUMBA_AVAILABLE:
+                lines.append(f"    _apply_1q_kernel(rows, rotation_gates[{layer}, {qubit}:{qubit + 1}], "
+                             f"{qubit}, {num_qubits})")
+            else:
+                lines.append(f"    rows = np.einsum('ij,bajc->baic', rotation_gates[{layer}, {qubit}], "
+                             f"rows.reshape(-1, {1 << qubit}, 2, {1 << (num_qubits - qubit - 1)}))"
+                             f".reshape(-1, {dim})")
+        if num_qubits > 1:
+            lines.append("    rows = rows[:, ENTANGLE]")
+    lines.append("    return rows")
+
+    namespace = {'np': np, 'ENTANGLE': _entangling_permutation(num_qubits)}
+    if NUMBA_AVAILABLE:
+        namespace['_apply_1q_kernel'] = _apply_1q_kernel
+    source = "\n".join(lines)
+    exec(compile(source, f"<vqc_forward_{num_qubits}x{num_layers}>", "exec"), namespace)
+    return namespace['forward']
 
 # Simplified VQC for App Runner
 class VQCLite:
@@ -117,83 +411,168 @@ class VQCLite:
     def __init__(self, num_qubits: int, num_layers: int):
         self.num_qubits = num_qubits
         self.num_layers = num_layers
-        self.simulator = QuantumSimulatorLite()
+        self.simulator = create_simulator()
         
         # Initialize parameters
         self.num_params = num_qubits * num_layers * 2  # RY + RZ per qubit per layer
         self.parameters = np.random.uniform(0, 2*np.pi, self.num_params)
         
-        # Precompute gates
-        self.ry_gate = lambda theta: np.array([
-            [np.cos(theta/2), -np.sin(theta/2)],
-            [np.sin(theta/2), np.cos(theta/2)]
-        ], dtype=complex)
-        
-        self.rz_gate = lambda theta: np.array([
-            [np.exp(-1j*theta/2), 0],
-            [0, np.exp(1j*theta/2)]
-        ], dtype=complex)
+        # Gate builders accept scalars or arrays of angles
+        self.ry_gate = _ry_matrices
+        self.rz_gate = _rz_matrices
         
-        self.cnot_gate = np.array([
-            [1, 0, 0, 0],
-            [0, 1, 0, 0],
-            [0, 0, 0, 1],
-            [0, 0, 1, 0]
-        ], dtype=complex)
+        self.cnot_gate = CNOT_MATRIX
+
+        # Pauli-Z eigenvalue (+1/-1) of every basis state for each qubit, so
+        # all expectation values reduce to a single matrix product
+        basis = np.arange(2**num_qubits)
+        shifts = num_qubits - 1 - np.arange(num_qubits)
+        z_signs = (1 - 2 * ((basis[None, :] >> shifts[:, None]) & 1)).astype(float)
+        self._z_signs = self.simulator.xp.asarray(z_signs)
+
+        # Shape-specialized forward pass (host arrays only)
+        self._compiled_forward = None
+        if self.simulator.xp is np:
+            self._compiled_forward = _compile_forward(num_qubits, num_layers)
     
     def forward(self, input_data: Optional[List[float]] = None) -> List[float]:
         """Forward pass through VQC"""
-        state = self.simulator.create_state_vector(self.num_qubits)
-        
-        # Encode input data if provided
-        if input_data:
-            for i, val in enumerate(input_data[:self.num_qubits]):
-                ry_matrix = self.ry_gate(val)
-                state = self.simulator.apply_gate(state, ry_matrix, [i])
-        
-        # Apply variational layers
-        param_idx = 0
+        input_batch = np.array([input_data or []], dtype=float)
+        return self.forward_batch(input_batch)[0].tolist()
+
+    def forward_batch(self, input_batch: np.ndarray,
+                      parameters: Optional[np.ndarray] = None) -> np.ndarray:
+        """Forward pass for a (batch, features) array; returns (batch, num_qubits) expectations
+
+        ``parameters`` overrides the model's own parameters for this pass only.
+        """
+        return self._expectations(self._evolve(input_batch, parameters))
+
+    def forward_observable(self, input_data: Optional[List[float]] = None,
+                           qubit_index: int = 0) -> float:
+        """<Z> of a single qubit, the model output used for training"""
+        input_batch = np.array([input_data or []], dtype=float)
+        return float(self.forward_observable_batch(input_batch, qubit_index)[0])
+
+    def forward_observable_batch(self, input_batch: np.ndarray, qubit_index: int = 0,
+                                 parameters: Optional[np.ndarray] = None) -> np.ndarray:
+        """Batched forward_observable; reduces only the requested qubit's sign mask"""
+        return self._expectations(self._evolve(input_batch, parameters), qubit_index)
+
+    def parameter_shift_jacobian(self, input_batch: np.ndarray,
+                                 qubit_index: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact d<Z_q>/dθ for every parameter via the parameter-shift rule
+
+        The state before each rotation gate is cached during one unshifted
+        pass, so each shifted evaluation resumes mid-circuit instead of
+        replaying the gates in front of the shifted parameter.
+
+        Returns the (num_params, batch) jacobian and the unshifted (batch,)
+        predictions.
+        """
+        circuit = self._build_circuit(self.parameters)
+        state = self._encode_inputs(input_batch)
+
+        # (circuit index, state before the gate) for each rotation, in parameter order
+        checkpoints = []
+        for op_index, (gate, targets) in enumerate(circuit):
+            if len(targets) == 1:
+                checkpoints.append((op_index, state.copy()))
+            state = self.simulator.apply_gate(state, gate, targets)
+        predictions = self._expectations(state, qubit_index)
+
+        shift = np.pi / 2
+        angles = self.parameters.reshape(self.num_layers, self.num_qubits, 2)
+        jacobian = np.empty((self.num_params, input_batch.shape[0]))
+        for j in range(self.num_params):
+            op_index, checkpoint = checkpoints[j // 2]
+            layer, qubit = divmod(j // 2, self.num_qubits)
+            shifted_predictions = []
+            for sign in (1, -1):
+                ry_angle, rz_angle = angles[layer, qubit]
+                if j % 2 == 0:
+                    ry_angle = ry_angle + sign * shift
+                else:
+                    rz_angle = rz_angle + sign * shift
+                gate = self.rz_gate(rz_angle) @ self.ry_gate(ry_angle)
+                shifted = self.simulator.apply_gate(checkpoint.copy(), gate, [qubit])
+                shifted = self._run_circuit(shifted, circuit, op_index + 1)
+                shifted_predictions.append(self._expectations(shifted, qubit_index))
+            jacobian[j] = (shifted_predictions[0] - shifted_predictions[1]) * 0.5
+
+        return jacobian, predictions
+
+    def _evolve(self, input_batch: np.ndarray,
+                parameters: Optional[np.ndarray] = None) -> np.ndarray:
+        """Final (batch, 2**n) state for the given inputs and parameters"""
+        if parameters is None:
+            parameters = self.parameters
+        state = self._encode_inputs(input_batch)
+        if self._compiled_forward is not None:
+            return self._compiled_forward(state, self._rotation_gates(parameters))
+        return self._run_circuit(state, self._build_circuit(parameters))
+
+    def _encode_inputs(self, input_batch: np.ndarray) -> np.ndarray:
+        """Initial (batch, 2**n) state with each feature RY-encoded on its qubit"""
+        batch_size = input_batch.shape[0]
+        state = self.simulator.xp.zeros((batch_size, 2**self.num_qubits), dtype=self.simulator.dtype)
+        state[:, 0] = 1.0  # |0...0⟩ for every sample
+
+        for i in range(min(input_batch.shape[1], self.num_qubits)):
+            state = self.simulator.apply_gate(state, self.ry_gate(input_batch[:, i]), [i])
+        return state
+
+    def _build_circuit(self, parameters: np.ndarray) -> List[Tuple[np.ndarray, List[int]]]:
+        """Variational layers as an ordered list of (gate, targets)"""
+        rotation_gates = self._rotation_gates(parameters)
+
+        circuit = []
         for layer in range(self.num_layers):
             # Rotation gates
             for qubit in range(self.num_qubits):
-                # RY rotation
-                ry_matrix = self.ry_gate(self.parameters[param_idx])
-                state = self.simulator.apply_gate(state, ry_matrix, [qubit])
-                param_idx += 1
-                
-                # RZ rotation
-                rz_matrix = self.rz_gate(self.parameters[param_idx])
-                state = self.simulator.apply_gate(state, rz_matrix, [qubit])
-                param_idx += 1
-            
+                circuit.append((rotation_gates[layer, qubit], [qubit]))
+
             # Entangling gates
             for i in range(self.num_qubits - 1):
-                state = self.simulator.apply_gate(state, self.cnot_gate, [i, i+1])
-        
-        # Calculate expectation values
-        expectations = []
-        for qubit in range(self.num_qubits):
-            # Pauli-Z expectation value
-            prob_0 = 0
-            prob_1 = 0
-            
-            for i in range(len(state)):
-                bit_string = format(i, f'0{self.num_qubits}b')
-                if bit_string[qubit] == '0':
-                    prob_0 += np.abs(state[i])**2
-                else:
-                    prob_1 += np.abs(state[i])**2
-            
-            expectation = prob_0 - prob_1
-            expectations.append(expectation)
-        
-        return expectations
+                circuit.append((self.cnot_gate, [i, i+1]))
+        return circuit
+
+    def _rotation_gates(self, parameters: np.ndarray) -> np.ndarray:
+        """Fused (layers, qubits, 2, 2) rotation gates for a parameter vector"""
+        # Build every rotation gate of the circuit in one vectorized pass;
+        # parameters are laid out as (layer, qubit, [RY, RZ])
+        angles = parameters.reshape(self.num_layers, self.num_qubits, 2)
+        ry_gates = self.ry_gate(angles[..., 0])
+        rz_gates = self.rz_gate(angles[..., 1])
+
+        # RY followed by RZ on the same qubit fuses into one 2x2 (RZ @ RY),
+        # halving the number of passes over the state vector
+        return rz_gates @ ry_gates
+
+    def _run_circuit(self, state: np.ndarray, circuit: List[Tuple[np.ndarray, List[int]]],
+                     start: int = 0) -> np.ndarray:
+        """Apply circuit[start:] to the state"""
+        for gate, targets in circuit[start:]:
+            state = self.simulator.apply_gate(state, gate, targets)
+        return state
+
+    def _expectations(self, state: np.ndarray,
+                      qubit_index: Optional[int] = None) -> np.ndarray:
+        """Pauli-Z expectation values per sample and qubit, or per sample for one qubit"""
+        probabilities = (state.conj() * state).real
+        if qubit_index is not None:
+            return self.simulator.asnumpy(probabilities @ self._z_signs[qubit_index])
+        return self.simulator.asnumpy(probabilities @ self._z_signs.T)
 
 # Pydantic models for API
 class QuantumCircuitRequest(BaseModel):
     num_qubits: int = Field(..., ge=1, le=12, description="Number of qubits (1-12)")
     gates: List[Dict[str, Any]] = Field(..., description="List of quantum gates")
     shots: int = Field(1000, ge=1, le=10000, description="Number of measurement shots")
+    precision: Literal['f64', 'f32', 'bf16'] = Field(
+        'f32', description="Precision of the returned state vector; f64 returns it at the "
+                           "simulator's full precision, bf16 suits visualization"
+    )
 
 class VQCRequest(BaseModel):
     num_qubits: int = Field(..., ge=1, le=8, description="Number of qubits (1-8)")
@@ -206,6 +585,21 @@ class TrainingRequest(BaseModel):
     training_labels: List[float] = Field(..., description="Training labels")
     learning_rate: float = Field(0.1, ge=0.001, le=1.0, description="Learning rate")
     iterations: int = Field(100, ge=1, le=1000, description="Training iterations")
+    method: Literal['spsa', 'parameter_shift'] = Field(
+        'spsa',
+        description="Gradient estimator: 'spsa' uses two forward passes per iteration, "
+                    "'parameter_shift' is exact but needs two per parameter"
+    )
+
+    @field_validator('training_data')
+    @classmethod
+    def check_training_size(cls, value: List[List[float]]) -> List[List[float]]:
+        total = sum(len(row) for row in value)
+        if total > MAX_TRAINING_VALUES:
+            raise ValueError(
+                f"training_data has {total} values; at most {MAX_TRAINING_VALUES} are accepted"
+            )
+        return value
 
 class JobStatus(BaseModel):
     job_id: str
@@ -216,49 +610,202 @@ class JobStatus(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime] = None
 
+def _to_bfloat16_bits(values: np.ndarray) -> np.ndarray:
+    """Round float32 values to bfloat16 (nearest even), returned as raw uint16"""
+    bits = np.ascontiguousarray(values, dtype=np.float32).view(np.uint32)
+    rounded = bits + np.uint32(0x7FFF) + ((bits >> 16) & np.uint32(1))
+    return (rounded >> 16).astype(np.uint16)
+
+def _encode_state_vector(state: np.ndarray, precision: str = 'f32') -> Dict[str, Any]:
+    """Pack a state vector as base64 bytes instead of a nested list
+
+    f64 keeps the simulator's own complex dtype (never upcast), f32 is
+    complex64; both are interleaved. bf16 is planar, all real parts followed
+    by all imaginary parts.
+    """
+    if precision == 'bf16':
+        packed = np.concatenate([_to_bfloat16_bits(state.real), _to_bfloat16_bits(state.imag)])
+        dtype, layout = 'bfloat16', 'planar'
+    else:
+        packed = np.ascontiguousarray(state if precision == 'f64' else state.astype(np.complex64, copy=False))
+        dtype, layout = packed.dtype.name, 'interleaved'
+    return {
+        'data': base64.b64encode(packed.tobytes()).decode('ascii'),
+        'dtype': dtype,
+        'layout': layout,
+        'shape': list(state.shape)
+    }
+
+async def _create_job(job_id: str, **fields: Any) -> None:
+    """Record a new job, evicting the oldest records past MAX_JOBS"""
+    async with JOBS_LOCK:
+        COMPLETED_JOBS[job_id] = {'created_at': datetime.now(), **fields}
+        while len(COMPLETED_JOBS) > MAX_JOBS:
+            COMPLETED_JOBS.popitem(last=False)
+
+async def _update_job(job_id: str, **fields: Any) -> None:
+    """Merge fields into an existing job record and mark it most recently used"""
+    async with JOBS_LOCK:
+        record = COMPLETED_JOBS.get(job_id)
+        if record is None:
+            # Evicted while running; a partial record could not be reported
+            logger.warning(f"Job {job_id} was evicted before its update; dropping it")
+            return
+        record.update(fields)
+        COMPLETED_JOBS.move_to_end(job_id)
+
+def _fuse_single_qubit_gates(
+    operations: List[Tuple[np.ndarray, List[int]]]
+) -> List[Tuple[np.ndarray, List[int]]]:
+    """Multiply runs of single-qubit gates on the same wire into one gate
+
+    A wire's pending product is flushed when a multi-qubit gate touches it;
+    single-qubit gates on different wires commute, so order is preserved
+    where it matters.
+    """
+    pending: Dict[int, np.ndarray] = {}
+    fused = []
+    for gate, targets in operations:
+        if len(targets) == 1:
+            qubit = targets[0]
+            pending[qubit] = gate @ pending[qubit] if qubit in pending else gate
+            continue
+        for qubit in targets:
+            if qubit in pending:
+                fused.append((pending.pop(qubit), [qubit]))
+        fused.append((gate, targets))
+    fused.extend((gate, [qubit]) for qubit, gate in pending.items())
+    return fused
+
+def _circuit_operations(circuit_data: Dict[str, Any]) -> List[Tuple[np.ndarray, List[int]]]:
+    """Look up and validate the (gate matrix, targets) pairs of a circuit request"""
+    operations = []
+    for gate_info in circuit_data['gates']:
+        gate_type = str(gate_info.get('type', '')).lower()
+        if gate_type not in GATES:
+            raise ValueError(f"Unsupported gate type {gate_info.get('type')}")
+        targets = gate_info.get('targets')
+        if not isinstance(targets, list) or not all(isinstance(q, int) for q in targets):
+            raise ValueError(f"Gate {gate_type} needs a list of integer targets")
+        _check_gate_targets(GATES[gate_type], targets, circuit_data['num_qubits'])
+        operations.append((GATES[gate_type], list(targets)))
+    return operations
+
+def _run_simulation(circuit_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Simulate a circuit and measure it; runs in a worker process"""
+    simulator = create_simulator()
+    
+    # Create initial state
+    state = simulator.create_state_vector(circuit_data['num_qubits'])
+    
+    # Look up gate matrices, then fuse before touching the state vector
+    operations = _circuit_operations(circuit_data)
+    
+    # Apply gates
+    for gate, targets in _fuse_single_qubit_gates(operations):
+        state = simulator.apply_gate(state, gate, targets)
+    
+    # Measure
+    counts = simulator.measure(state, circuit_data['shots'])
+    
+    return {
+        'counts': counts,
+        'state_vector': _encode_state_vector(simulator.asnumpy(state),
+                                             circuit_data.get('precision', 'f32')),
+        'fidelity': 1.0  # Simplified
+    }
+
+def _run_training(training_data: Dict[str, Any], num_qubits: int, num_layers: int,
+                  buffer_name: str) -> Dict[str, Any]:
+    """Train a VQC in a worker process
+
+    The model's parameters followed by a progress slot live in the shared
+    memory block ``buffer_name``; they are updated in place every iteration
+    so the API process can report progress and pick up the trained values.
+    """
+    buffer = shared_memory.SharedMemory(name=buffer_name)
+    # Views into the buffer must be released before it can be closed
+    vqc = shared = None
+    try:
+        vqc = VQCLite(num_qubits, num_layers)
+        shared = np.ndarray((vqc.num_params + 1,), dtype=np.float64, buffer=buffer.buf)
+        vqc.parameters = shared[:-1]
+        
+        # Simple gradient descent training (simplified)
+        X = np.array(training_data['training_data'])
+        y = np.array(training_data['training_labels'])
+        lr = training_data['learning_rate']
+        iterations = training_data['iterations']
+        method = training_data.get('method', 'spsa')
+        
+        losses = []
+        for iteration in range(iterations):
+            # Evaluate the whole training set at once; first qubit is the output
+            if method == 'spsa':
+                # Simultaneous perturbation: perturb every parameter at once
+                # along a random +/-1 direction, two forward passes in total
+                perturbation = 0.1
+                delta = 2 * np.random.randint(0, 2, size=vqc.num_params) - 1
+                params_plus = vqc.parameters + perturbation * delta
+                params_minus = vqc.parameters - perturbation * delta
+                loss_plus = np.mean((vqc.forward_observable_batch(X, parameters=params_plus) - y) ** 2)
+                loss_minus = np.mean((vqc.forward_observable_batch(X, parameters=params_minus) - y) ** 2)
+                gradients = (loss_plus - loss_minus) / (2 * perturbation) * delta
+                # The midpoint of the two evaluations stands in for the
+                # loss at the current parameters, saving a third pass
+                loss = 0.5 * (loss_plus + loss_minus)
+            else:
+                # Parameter-shift rule: exact for the Pauli rotations
+                # (RY/RZ) that make up every VQCLite parameter
+                jacobian, predictions = vqc.parameter_shift_jacobian(X)
+                residuals = predictions - y
+                gradients = np.mean(2 * residuals * jacobian, axis=1)
+                loss = np.mean(residuals ** 2)
+
+            # Update parameters (in place, i.e. in shared memory)
+            vqc.parameters -= lr * gradients
+            losses.append(float(loss))
+
+            # Update progress
+            shared[-1] = (iteration + 1) / iterations
+        
+        return {
+            'final_loss': losses[-1],
+            'training_history': losses,
+            'parameters': vqc.parameters.tolist()
+        }
+    finally:
+        del vqc, shared
+        buffer.close()
+
+def _create_executor() -> ProcessPoolExecutor:
+    """Worker pool for CPU-bound jobs"""
+    # Spawned (not forked) workers, since the API process already runs threads
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=get_context("spawn"))
+
+async def _run_in_executor(func, *args):
+    """Run func in the worker pool, replacing the pool if a worker died"""
+    global EXECUTOR
+    executor = EXECUTOR
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        # The job that hit the dead worker fails; later jobs get a fresh pool
+        if executor is not None and executor is EXECUTOR:
+            logger.error("Worker process died; recreating the process pool")
+            executor.shutdown(wait=False, cancel_futures=True)
+            EXECUTOR = _create_executor()
+        raise
+
 # Background task processing
 async def process_quantum_job(job_id: str, job_data: Dict[str, Any]):
-    """Process quantum computation job in background"""
+    """Run a quantum computation job off the event loop and record the outcome"""
     try:
         job_type = job_data['type']
         
         if job_type == 'simulation':
             # Process quantum circuit simulation
-            circuit_data = job_data['circuit']
-            simulator = QuantumSimulatorLite()
-            
-            # Create initial state
-            state = simulator.create_state_vector(circuit_data['num_qubits'])
-            
-            # Apply gates
-            for gate_info in circuit_data['gates']:
-                gate_type = gate_info['type']
-                targets = gate_info['targets']
-                
-                if gate_type == 'h':  # Hadamard
-                    h_gate = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
-                    state = simulator.apply_gate(state, h_gate, targets)
-                elif gate_type == 'x':  # Pauli-X
-                    x_gate = np.array([[0, 1], [1, 0]], dtype=complex)
-                    state = simulator.apply_gate(state, x_gate, targets)
-                elif gate_type == 'cnot':  # CNOT
-                    cnot_gate = np.array([[1, 0, 0, 0], [0, 1, 0, 0], 
-                                        [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex)
-                    state = simulator.apply_gate(state, cnot_gate, targets)
-            
-            # Measure
-            counts = simulator.measure(state, circuit_data['shots'])
-            
-            # Store result
-            COMPLETED_JOBS[job_id] = {
-                'status': 'completed',
-                'result': {
-                    'counts': counts,
-                    'state_vector': state.tolist(),
-                    'fidelity': 1.0  # Simplified
-                },
-                'completed_at': datetime.now()
-            }
+            result = await _run_in_executor(_run_simulation, job_data['circuit'])
             
         elif job_type == 'vqc_training':
             # Process VQC training
@@ -270,76 +817,69 @@ async def process_quantum_job(job_id: str, job_data: Dict[str, Any]):
             
             vqc = VQC_MODELS[model_id]
             
-            # Simple gradient descent training (simplified)
-            X = np.array(training_data['training_data'])
-            y = np.array(training_data['training_labels'])
-            lr = training_data['learning_rate']
-            iterations = training_data['iterations']
-            
-            losses = []
-            for iteration in range(iterations):
-                total_loss = 0
-                gradients = np.zeros_like(vqc.parameters)
-                
-                for i, (x_i, y_i) in enumerate(zip(X, y)):
-                    prediction = vqc.forward(x_i.tolist())[0]  # Use first qubit
-                    loss = (prediction - y_i) ** 2
-                    total_loss += loss
-                    
-                    # Simple finite difference gradient
-                    eps = 0.01
-                    for j in range(len(vqc.parameters)):
-                        vqc.parameters[j] += eps
-                        pred_plus = vqc.forward(x_i.tolist())[0]
-                        vqc.parameters[j] -= 2 * eps
-                        pred_minus = vqc.forward(x_i.tolist())[0]
-                        vqc.parameters[j] += eps
-                        
-                        gradient = (pred_plus - pred_minus) / (2 * eps)
-                        gradients[j] += 2 * (prediction - y_i) * gradient
-                
-                # Update parameters
-                vqc.parameters -= lr * gradients / len(X)
-                losses.append(total_loss / len(X))
-                
-                # Update progress
-                progress = (iteration + 1) / iterations
-                if job_id in COMPLETED_JOBS:
-                    COMPLETED_JOBS[job_id]['progress'] = progress
-            
-            # Store final result
-            COMPLETED_JOBS[job_id] = {
-                'status': 'completed',
-                'result': {
-                    'final_loss': losses[-1],
-                    'training_history': losses,
-                    'parameters': vqc.parameters.tolist()
-                },
-                'completed_at': datetime.now(),
-                'progress': 1.0
-            }
+            # Share parameters and progress with the worker process
+            buffer = shared_memory.SharedMemory(create=True, size=(vqc.num_params + 1) * 8)
+            shared = np.ndarray((vqc.num_params + 1,), dtype=np.float64, buffer=buffer.buf)
+            shared[:-1] = vqc.parameters
+            shared[-1] = 0.0
+            TRAINING_PROGRESS[job_id] = shared
+            try:
+                result = await _run_in_executor(
+                    _run_training, training_data,
+                    vqc.num_qubits, vqc.num_layers, buffer.name
+                )
+                vqc.parameters = shared[:-1].copy()
+            finally:
+                del TRAINING_PROGRESS[job_id]
+                del shared
+                buffer.close()
+                buffer.unlink()
+        else:
+            raise ValueError(f"Unknown job type {job_type}")
+        
+        # Store result
+        await _update_job(
+            job_id,
+            status='completed',
+            result=result,
+            completed_at=datetime.now(),
+            progress=1.0
+        )
             
     except Exception as e:
-        COMPLETED_JOBS[job_id] = {
-            'status': 'failed',
-            'error': str(e),
-            'completed_at': datetime.now()
-        }
+        await _update_job(
+            job_id,
+            status='failed',
+            error=str(e),
+            completed_at=datetime.now()
+        )
 
 # FastAPI app with lifespan context
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global EXECUTOR
     # Startup
     logger.info("Starting Quantum Service Lite for AWS App Runner")
+    EXECUTOR = _create_executor()
+    if NUMBA_AVAILABLE:
+        # Compile (or load cached) gate kernels before the first request
+        warmup = QuantumSimulatorLite()
+        state = warmup.create_state_vector(2)
+        state = warmup.apply_gate(state, np.eye(2, dtype=warmup.dtype), [0])
+        warmup.apply_gate(state, np.eye(4, dtype=warmup.dtype), [0, 1])
+        logger.info("Numba gate kernels compiled")
     yield
     # Shutdown
     logger.info("Shutting down Quantum Service Lite")
+    EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    EXECUTOR = None
 
 app = FastAPI(
     title="Quantum Computing Service Lite",
     description="Lightweight quantum computing service for AWS App Runner",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend integration
@@ -371,23 +911,27 @@ async def simulate_quantum_circuit(
     background_tasks: BackgroundTasks
 ):
     """Simulate quantum circuit"""
+    circuit = request.dict()
+    try:
+        _circuit_operations(circuit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     # Generate job ID
-    job_id = hashlib.md5(
-        f"{request.dict()}{time.time()}".encode()
-    ).hexdigest()
+    job_id = token_hex(16)
     
     # Add to job queue
     job_data = {
         'type': 'simulation',
-        'circuit': request.dict()
+        'circuit': circuit
     }
     
     # Initialize job status
-    COMPLETED_JOBS[job_id] = {
-        'status': 'processing',
-        'progress': 0.0,
-        'created_at': datetime.now()
-    }
+    await _create_job(
+        job_id,
+        status='processing',
+        progress=0.0
+    )
     
     # Process in background
     background_tasks.add_task(process_quantum_job, job_id, job_data)
@@ -402,9 +946,7 @@ async def simulate_quantum_circuit(
 @app.post("/api/v1/vqc/create")
 async def create_vqc_model(request: VQCRequest):
     """Create VQC model"""
-    model_id = hashlib.md5(
-        f"{request.dict()}{time.time()}".encode()
-    ).hexdigest()
+    model_id = token_hex(16)
     
     try:
         vqc = VQCLite(request.num_qubits, request.num_layers)
@@ -446,14 +988,18 @@ async def train_vqc_model(
     request: TrainingRequest,
     background_tasks: BackgroundTasks
 ):
-    """Train VQC model"""
+    """Train VQC model
+
+    Gradients default to SPSA, whose cost does not grow with the number of
+    parameters. ``method='parameter_shift'`` gives exact gradients instead,
+    valid because every trainable VQCLite parameter is a Pauli rotation
+    (RY/RZ) angle.
+    """
     if request.model_id not in VQC_MODELS:
         raise HTTPException(status_code=404, detail="Model not found")
     
     # Generate job ID
-    job_id = hashlib.md5(
-        f"{request.dict()}{time.time()}".encode()
-    ).hexdigest()
+    job_id = token_hex(16)
     
     # Add to job queue
     job_data = {
@@ -462,11 +1008,11 @@ async def train_vqc_model(
     }
     
     # Initialize job status
-    COMPLETED_JOBS[job_id] = {
-        'status': 'processing',
-        'progress': 0.0,
-        'created_at': datetime.now()
-    }
+    await _create_job(
+        job_id,
+        status='processing',
+        progress=0.0
+    )
     
     # Process in background
     background_tasks.add_task(process_quantum_job, job_id, job_data)
@@ -481,10 +1027,16 @@ async def train_vqc_model(
 @app.get("/api/v1/jobs/{job_id}")
 async def get_job_status(job_id: str):
     """Get job status and results"""
-    if job_id not in COMPLETED_JOBS:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    job_info = COMPLETED_JOBS[job_id]
+    async with JOBS_LOCK:
+        job_info = COMPLETED_JOBS.get(job_id)
+        if job_info is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        job_info = dict(job_info)
+
+    progress = TRAINING_PROGRESS.get(job_id)
+    if progress is not None:
+        job_info['progress'] = float(progress[-1])
+
     return JobStatus(**job_info, job_id=job_id)
 
 # List available models
@@ -492,7 +1044,7 @@ async def get_job_status(job_id: str):
 async def list_vqc_models():
     """List all VQC models"""
     models = []
-    for model_id, vqc in VQC_MODELS.items():
+    for model_id, vqc in list(VQC_MODELS.items()):
         models.append({
             "model_id": model_id,
             "num_qubits": vqc.num_qubits,
@@ -513,7 +1065,7 @@ async def get_system_info():
         "capabilities": {
             "max_qubits_simulation": 12,
             "max_qubits_vqc": 8,
-            "supported_gates": ["H", "X", "Y", "Z", "CNOT", "RY", "RZ"],
+            "supported_gates": [name.upper() for name in GATES],
             "max_shots": 10000
         },
         "current_usage": {
@@ -5,20 +5,142 @@ Implements unitary matrix operations and tensor decomposition for quantum gate s
 
 import numpy as np
 import scipy.linalg as la
-from scipy.sparse import csr_matrix, kron
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Hashable, Literal, Callable
 import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
-import tensorly as tl
-from tensorly.decomposition import parafac, tucker
+from collections import OrderedDict
+from fractions import Fraction
+from functools import reduce, lru_cache
+import hashlib
+import io
 import redis
 import json
 import time
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = True
+except ImportError:
+    CUPY_AVAILABLE = False
+
+try:
+    import pyzx as zx
+    PYZX_AVAILABLE = True
+except ImportError:
+    PYZX_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Entry limits for the per-instance caches
+GATE_CACHE_SIZE = 512
+DECOMPOSITION_CACHE_SIZE = 128
+SIMULATION_CACHE_BYTES = 256 << 20  # evolved state vectors are 2^n amplitudes each, so bound by size
+
+# Tensor products up to this dimension are memoized by factor contents
+TENSOR_PRODUCT_CACHE_MAX_DIM = 64
+
+# Circuits this wide no longer fit in L3 and default to the GPU when CuPy is installed
+GPU_MIN_QUBITS = 18
+
+# Gate-op IR consumed by the compiled circuit loop: an op code, up to four qubit
+# indices and the row of its matrix in the accompanying (G, 4, 4) matrix stack
+OP_1Q = 0
+OP_DIAGONAL_1Q = 1
+OP_2Q = 2
+OP_X = 3
+OP_CNOT = 4
+GATE_OP_DTYPE = np.dtype([('code', np.int8), ('qubits', np.int8, (4,)), ('matrix', np.int32)])
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _apply_1q_numba(state, u00, u01, u10, u11, target, num_qubits):
+        """Apply a 2x2 gate in place to the amplitude pairs split by the target bit"""
+        bit = num_qubits - 1 - target
+        stride = 1 << bit
+        low_mask = stride - 1
+        for i in prange(1 << (num_qubits - 1)):
+            # Insert a zero at the target bit to get the |0> index of pair i
+            lo = ((i >> bit) << (bit + 1)) | (i & low_mask)
+            hi = lo | stride
+            a0 = state[lo]
+            a1 = state[hi]
+            state[lo] = u00 * a0 + u01 * a1
+            state[hi] = u10 * a0 + u11 * a1
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _apply_2q_numba(state, u, first, second, num_qubits):
+        """Apply a 4x4 gate in place to the amplitude quads split by two target bits"""
+        bit_a = num_qubits - 1 - first
+        bit_b = num_qubits - 1 - second
+        low = min(bit_a, bit_b)
+        high = max(bit_a, bit_b)
+        # Hoist the 16 entries so the loop body is pure register FMAs that LLVM
+        # can vectorize under fastmath
+        u00, u01, u02, u03 = u[0, 0], u[0, 1], u[0, 2], u[0, 3]
+        u10, u11, u12, u13 = u[1, 0], u[1, 1], u[1, 2], u[1, 3]
+        u20, u21, u22, u23 = u[2, 0], u[2, 1], u[2, 2], u[2, 3]
+        u30, u31, u32, u33 = u[3, 0], u[3, 1], u[3, 2], u[3, 3]
+        for i in prange(1 << (num_qubits - 2)):
+            # Insert zeros at both target bits to get the |00> index
+            base = ((i >> low) << (low + 1)) | (i & ((1 << low) - 1))
+            base = ((base >> high) << (high + 1)) | (base & ((1 << high) - 1))
+            i01 = base | (1 << bit_b)
+            i10 = base | (1 << bit_a)
+            i11 = i10 | (1 << bit_b)
+            a0 = state[base]
+            a1 = state[i01]
+            a2 = state[i10]
+            a3 = state[i11]
+            state[base] = u00 * a0 + u01 * a1 + u02 * a2 + u03 * a3
+            state[i01] = u10 * a0 + u11 * a1 + u12 * a2 + u13 * a3
+            state[i10] = u20 * a0 + u21 * a1 + u22 * a2 + u23 * a3
+            state[i11] = u30 * a0 + u31 * a1 + u32 * a2 + u33 * a3
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _run_circuit_njit(state, ops, matrices, num_qubits):
+        """Apply a sequence of gate ops in place without returning to the interpreter"""
+        for g in range(ops.shape[0]):
+            code = ops[g]['code']
+            u = matrices[ops[g]['matrix']]
+            if code == OP_X or code == OP_CNOT:
+                # Permutation gates: swap amplitude pairs without any arithmetic
+                bit = num_qubits - 1 - ops[g]['qubits'][1 if code == OP_CNOT else 0]
+                control_mask = 0
+                if code == OP_CNOT:
+                    control_mask = 1 << (num_qubits - 1 - ops[g]['qubits'][0])
+                stride = 1 << bit
+                for i in prange(1 << (num_qubits - 1)):
+                    lo = ((i >> bit) << (bit + 1)) | (i & (stride - 1))
+                    if lo & control_mask == control_mask:
+                        hi = lo | stride
+                        a0 = state[lo]
+                        state[lo] = state[hi]
+                        state[hi] = a0
+            elif code == OP_2Q:
+                _apply_2q_numba(state, u, ops[g]['qubits'][0], ops[g]['qubits'][1], num_qubits)
+            else:
+                bit = num_qubits - 1 - ops[g]['qubits'][0]
+                stride = 1 << bit
+                for i in prange(1 << (num_qubits - 1)):
+                    lo = ((i >> bit) << (bit + 1)) | (i & (stride - 1))
+                    hi = lo | stride
+                    if code == OP_DIAGONAL_1Q:
+                        state[lo] = u[0, 0] * state[lo]
+                        state[hi] = u[1, 1] * state[hi]
+                    else:
+                        a0 = state[lo]
+                        a1 = state[hi]
+                        state[lo] = u[0, 0] * a0 + u[0, 1] * a1
+                        state[hi] = u[1, 0] * a0 + u[1, 1] * a1
+
 class GateType(Enum):
     """Quantum gate types with their mathematical representations"""
     PAULI_X = "pauli_x"
@@ -32,6 +154,85 @@ class GateType(Enum):
     GROVER_DIFFUSER = "grover_diffuser"
     CUSTOM = "custom"
 
+# Gates whose matrix is diagonal in the computational basis
+DIAGONAL_GATES = {GateType.PAULI_Z, GateType.PHASE, GateType.T_GATE}
+
+def _array_module(array):
+    """Return cupy for device arrays and numpy otherwise"""
+    return cp.get_array_module(array) if CUPY_AVAILABLE else np
+
+def _to_host(array) -> np.ndarray:
+    """Copy a device array back to host memory (no-op for NumPy arrays)"""
+    if CUPY_AVAILABLE and isinstance(array, cp.ndarray):
+        return cp.asnumpy(array)
+    return array
+
+def _tensor_product(gates: List[np.ndarray]) -> np.ndarray:
+    """Kronecker product of dense factors, collapsing identity runs"""
+    # Merge runs of identity factors so each run costs a single kron
+    factors: List[np.ndarray] = []
+    identity_dim = 1
+    for gate in gates:
+        if gate.shape[0] == gate.shape[1] and np.array_equal(gate, np.eye(gate.shape[0])):
+            identity_dim *= gate.shape[0]
+            continue
+        if identity_dim > 1:
+            factors.append(np.eye(identity_dim, dtype=gate.dtype))
+            identity_dim = 1
+        factors.append(gate)
+        
+    if not factors:
+        return np.eye(identity_dim, dtype=gates[0].dtype)
+    if identity_dim > 1:
+        factors.append(np.eye(identity_dim, dtype=factors[-1].dtype))
+        
+    return reduce(np.kron, factors)
+
+@lru_cache(maxsize=1024)
+def _cached_tensor_product(signature: Tuple[Tuple[bytes, Tuple[int, ...], str], ...]) -> np.ndarray:
+    """Memoized _tensor_product keyed by (bytes, shape, dtype) of each factor"""
+    gates = [np.frombuffer(data, dtype=dtype).reshape(shape) for data, shape, dtype in signature]
+    result = _tensor_product(gates)
+    result.setflags(write=False)
+    return result
+
+class LRUCache(OrderedDict):
+    """Bounded mapping that evicts the least recently used entry"""
+    
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+        
+    def __getitem__(self, key: Hashable):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+        
+    def __setitem__(self, key: Hashable, value: Any):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+class ByteBoundedLRUCache(LRUCache):
+    """LRU mapping of arrays that evicts once their total nbytes exceeds max_bytes"""
+    
+    def __init__(self, max_bytes: int):
+        super().__init__(maxsize=float('inf'))
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        
+    def __setitem__(self, key: Hashable, value: Any):
+        if value.nbytes > self.max_bytes:
+            return  # would evict everything else and still not fit
+        if key in self:
+            self.nbytes -= OrderedDict.__getitem__(self, key).nbytes
+        super().__setitem__(key, value)
+        self.nbytes += value.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
 @dataclass
 class QuantumGate:
     """Represents a quantum gate with its unitary matrix"""
@@ -43,24 +244,102 @@ class QuantumGate:
 class QuantumCircuit:
     """Quantum circuit with optimized tensor operations"""
     
-    def __init__(self, num_qubits: int):
+    def __init__(self, num_qubits: int, dtype: np.dtype = np.complex64,
+                 backend: Optional[Literal['numpy', 'cupy']] = None):
         self.num_qubits = num_qubits
         self.gates: List[QuantumGate] = []
-        self.state_vector = np.zeros(2**num_qubits, dtype=complex)
+        if backend is None:
+            use_gpu = CUPY_AVAILABLE and num_qubits >= GPU_MIN_QUBITS
+            backend = 'cupy' if use_gpu else 'numpy'
+        if backend == 'cupy' and not CUPY_AVAILABLE:
+            raise ValueError("CuPy backend requested but cupy is not installed")
+        self.backend = backend
+        # complex64 halves the bytes streamed per gate; pass complex128 for full precision
+        self.state_vector = self.xp.zeros(2**num_qubits, dtype=dtype)
         self.state_vector[0] = 1.0  # |0...0⟩ initial state
+        # (dtype, per-gate matrix constructors) filled in on first simulation
+        self._resolved_gates: Optional[Tuple[np.dtype, List[Callable]]] = None
+        self._fused_gates: Optional[Tuple[Tuple, List[QuantumGate]]] = None
+        
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without the resolved-gate cache, whose constructors are closures"""
+        state = self.__dict__.copy()
+        state['_resolved_gates'] = None
+        return state
+        
+    @property
+    def xp(self):
+        """Array module (numpy or cupy) holding this circuit's state"""
+        return cp if self.backend == 'cupy' else np
         
     def add_gate(self, gate: QuantumGate):
         """Add gate to circuit with validation"""
         if max(gate.qubits) >= self.num_qubits:
             raise ValueError(f"Gate qubit index exceeds circuit size")
         self.gates.append(gate)
+        self._resolved_gates = None
+        self._fused_gates = None
+        
+    def fuse(self, linear_algebra: 'QuantumLinearAlgebra') -> List[QuantumGate]:
+        """Merge runs of same-qubit 1-qubit gates and same-pair 2-qubit gates"""
+        # Returns a new, fully resolved gate list; self.gates (and so the
+        # circuit hash) is left untouched
+        signature = (self.state_vector.dtype, tuple(
+            tuple(sorted(gate.parameters.items())) if gate.parameters else ()
+            for gate in self.gates
+        ))
+        if self._fused_gates is not None and self._fused_gates[0] == signature:
+            return self._fused_gates[1]
+            
+        fused: List[QuantumGate] = []
+        # qubit -> (accumulated 2x2, the gates merged into it)
+        pending: Dict[int, Tuple[np.ndarray, List[QuantumGate]]] = {}
+        
+        def flush(qubit: int):
+            matrix, merged = pending.pop(qubit)
+            if len(merged) == 1:
+                fused.append(replace(merged[0], matrix=matrix))
+            else:
+                fused.append(QuantumGate(GateType.CUSTOM, [qubit], matrix=matrix))
+                
+        for gate, matrix in zip(self.gates, linear_algebra.resolve_gates(self)):
+            if len(gate.qubits) == 1:
+                qubit = gate.qubits[0]
+                if qubit in pending:
+                    previous, merged = pending[qubit]
+                    pending[qubit] = (matrix @ previous, merged + [gate])
+                else:
+                    pending[qubit] = (matrix, [gate])
+                continue
+                
+            for qubit in gate.qubits:
+                if qubit in pending:
+                    flush(qubit)
+                    
+            last = fused[-1] if fused else None
+            if (len(gate.qubits) == 2 and last is not None and len(last.qubits) == 2
+                    and set(last.qubits) == set(gate.qubits)):
+                if last.qubits != gate.qubits:
+                    # Re-express the new gate in the previous gate's qubit order
+                    matrix = matrix.reshape(2, 2, 2, 2).transpose(1, 0, 3, 2).reshape(4, 4)
+                fused[-1] = QuantumGate(GateType.CUSTOM, list(last.qubits),
+                                        matrix=matrix @ last.matrix)
+            else:
+                fused.append(replace(gate, matrix=matrix))
+                
+        for qubit in sorted(pending):
+            flush(qubit)
+            
+        self._fused_gates = (signature, fused)
+        return fused
 
 class QuantumLinearAlgebra:
     """High-performance quantum linear algebra operations"""
     
     def __init__(self, redis_client: Optional[redis.Redis] = None):
         self.redis_client = redis_client
-        self.gate_cache: Dict[str, np.ndarray] = {}
+        self.standard_gates: Dict[str, np.ndarray] = {}
+        self.gate_cache: LRUCache = LRUCache(GATE_CACHE_SIZE)
         
         # Precompute standard gate matrices
         self._initialize_standard_gates()
@@ -68,15 +347,15 @@ class QuantumLinearAlgebra:
     def _initialize_standard_gates(self):
         """Initialize standard quantum gate matrices"""
         # Pauli gates
-        self.gate_cache['pauli_x'] = np.array([[0, 1], [1, 0]], dtype=complex)
-        self.gate_cache['pauli_y'] = np.array([[0, -1j], [1j, 0]], dtype=complex)
-        self.gate_cache['pauli_z'] = np.array([[1, 0], [0, -1]], dtype=complex)
+        self.standard_gates['pauli_x'] = np.array([[0, 1], [1, 0]], dtype=complex)
+        self.standard_gates['pauli_y'] = np.array([[0, -1j], [1j, 0]], dtype=complex)
+        self.standard_gates['pauli_z'] = np.array([[1, 0], [0, -1]], dtype=complex)
         
         # Hadamard gate
-        self.gate_cache['hadamard'] = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+        self.standard_gates['hadamard'] = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
         
         # CNOT gate (2-qubit)
-        self.gate_cache['cnot'] = np.array([
+        self.standard_gates['cnot'] = np.array([
             [1, 0, 0, 0],
             [0, 1, 0, 0], 
             [0, 0, 0, 1],
@@ -84,148 +363,309 @@ class QuantumLinearAlgebra:
         ], dtype=complex)
         
         # T gate
-        self.gate_cache['t_gate'] = np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=complex)
+        self.standard_gates['t_gate'] = np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=complex)
         
-    def get_gate_matrix(self, gate_type: GateType, parameters: Dict[str, float] = None) -> np.ndarray:
+    def get_gate_matrix(self, gate_type: GateType, parameters: Dict[str, float] = None,
+                        dtype: np.dtype = complex) -> np.ndarray:
         """Get gate matrix with caching for performance"""
-        cache_key = f"{gate_type.value}_{str(parameters) if parameters else 'none'}"
+        dtype = np.dtype(dtype)
+        cache_key = (gate_type, tuple(sorted(parameters.items())) if parameters else (), dtype)
         
         if cache_key in self.gate_cache:
             return self.gate_cache[cache_key]
             
         if gate_type == GateType.PHASE:
             theta = parameters.get('theta', 0) if parameters else 0
-            matrix = np.array([[1, 0], [0, np.exp(1j * theta)]], dtype=complex)
+            matrix = self._phase_matrix(theta, dtype)
         elif gate_type == GateType.QFT:
             n = parameters.get('n_qubits', 2) if parameters else 2
-            matrix = self._qft_matrix(n)
+            matrix = self._qft_matrix(n, dtype)
         elif gate_type == GateType.GROVER_DIFFUSER:
             n = parameters.get('n_qubits', 2) if parameters else 2
-            matrix = self._grover_diffuser_matrix(n)
+            matrix = self._grover_diffuser_matrix(n, dtype)
         else:
-            matrix = self.gate_cache.get(gate_type.value)
+            matrix = self.standard_gates.get(gate_type.value)
+            if matrix is not None:
+                matrix = matrix.astype(dtype, copy=False)
             
         if matrix is not None:
             self.gate_cache[cache_key] = matrix
             
         return matrix
     
-    def _qft_matrix(self, n: int) -> np.ndarray:
+    def resolve_gates(self, circuit: QuantumCircuit) -> List[np.ndarray]:
+        """Resolve the circuit's gate matrices, reusing its cached constructors"""
+        dtype = circuit.state_vector.dtype
+        if circuit._resolved_gates is None or circuit._resolved_gates[0] != dtype:
+            circuit._resolved_gates = (
+                dtype, [self._gate_constructor(gate, dtype) for gate in circuit.gates]
+            )
+        constructors = circuit._resolved_gates[1]
+        return [build(gate.parameters) for build, gate in zip(constructors, circuit.gates)]
+    
+    def _gate_constructor(self, gate: QuantumGate, dtype: np.dtype) -> Callable:
+        """Return parameters -> matrix for a gate, closed-form where it is parametrized"""
+        gate_type = gate.gate_type
+        if gate.matrix is not None:
+            return lambda parameters: gate.matrix.astype(dtype, copy=False)
+        if gate_type == GateType.PHASE:
+            return lambda parameters: self._phase_matrix(
+                parameters.get('theta', 0) if parameters else 0, dtype
+            )
+            
+        matrix = self.get_gate_matrix(gate_type, gate.parameters, dtype)
+        if matrix is None:
+            raise ValueError(f"Unknown gate type: {gate_type}")
+        if gate.parameters:
+            # Parameters may be swept in place; re-resolve through the LRU each time
+            return lambda parameters: self.get_gate_matrix(gate_type, parameters, dtype)
+        return lambda parameters: matrix
+    
+    def _phase_matrix(self, theta: float, dtype: np.dtype = complex) -> np.ndarray:
+        """Generate phase gate matrix diag(1, e^{i theta})"""
+        return np.array([[1, 0], [0, np.exp(1j * theta)]], dtype=dtype)
+    
+    def _qft_matrix(self, n: int, dtype: np.dtype = complex) -> np.ndarray:
         """Generate Quantum Fourier Transform matrix"""
         N = 2**n
-        matrix = np.zeros((N, N), dtype=complex)
-        omega = np.exp(2j * np.pi / N)
-        
-        for i in range(N):
-            for j in range(N):
-                matrix[i, j] = omega**(i * j) / np.sqrt(N)
-                
-        return matrix
+        k = np.arange(N)
+        # Reduce i*j mod N before exponentiating to keep the phase argument small
+        phases = np.multiply.outer(k, k) % N
+        return np.exp((2j * np.pi / N) * phases).astype(dtype, copy=False) / N**0.5
     
-    def _grover_diffuser_matrix(self, n: int) -> np.ndarray:
+    def _grover_diffuser_matrix(self, n: int, dtype: np.dtype = complex) -> np.ndarray:
         """Generate Grover diffuser (amplitude amplification) matrix"""
         N = 2**n
-        # 2|s⟩⟨s| - I where |s⟩ is uniform superposition
-        s = np.ones(N) / np.sqrt(N)
-        return 2 * np.outer(s, s.conj()) - np.eye(N)
+        # 2|s⟩⟨s| - I where |s⟩ is uniform superposition, i.e. 2/N everywhere minus I
+        matrix = np.full((N, N), 2 / N, dtype=dtype)
+        matrix[np.diag_indices(N)] -= 1
+        return matrix
     
     def tensor_product_gates(self, gates: List[np.ndarray]) -> np.ndarray:
-        """Efficient tensor product of multiple gates using sparse matrices"""
+        """Efficient tensor product of multiple gates using dense Kronecker products"""
         if not gates:
             return np.eye(1)
             
-        result = csr_matrix(gates[0])
-        for gate in gates[1:]:
-            result = kron(result, csr_matrix(gate))
+        gates = [np.asarray(gate) for gate in gates]
+        if np.prod([gate.shape[0] for gate in gates]) > TENSOR_PRODUCT_CACHE_MAX_DIM:
+            return _tensor_product(gates)
             
-        return result.toarray()
+        # Small products are memoized by factor contents; the cached result is read-only
+        signature = tuple(
+            (np.ascontiguousarray(gate).tobytes(), gate.shape, gate.dtype.str) for gate in gates
+        )
+        return _cached_tensor_product(signature)
     
-    def apply_gate_to_circuit(self, circuit: QuantumCircuit, gate: QuantumGate) -> np.ndarray:
+    def apply_gate_to_circuit(self, circuit: QuantumCircuit, gate: QuantumGate,
+                              gate_matrix: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply gate to quantum circuit state using optimized tensor operations"""
-        gate_matrix = self.get_gate_matrix(gate.gate_type, gate.parameters)
+        if gate_matrix is None and gate.matrix is not None:
+            gate_matrix = gate.matrix.astype(circuit.state_vector.dtype, copy=False)
+        if gate_matrix is None:
+            gate_matrix = self.get_gate_matrix(gate.gate_type, gate.parameters,
+                                               circuit.state_vector.dtype)
         
         if gate_matrix is None:
             raise ValueError(f"Unknown gate type: {gate.gate_type}")
             
-        # Build full circuit gate matrix using tensor products
-        full_gate = self._build_full_gate_matrix(gate_matrix, gate.qubits, circuit.num_qubits)
-        
-        # Apply gate to state vector
-        circuit.state_vector = full_gate @ circuit.state_vector
+        if gate.gate_type in (GateType.PAULI_X, GateType.CNOT):
+            control = gate.qubits[0] if gate.gate_type == GateType.CNOT else None
+            self._swap_amplitudes(circuit.state_vector, control, gate.qubits[-1],
+                                  circuit.num_qubits)
+            return circuit.state_vector
+            
+        if self._is_diagonal(gate, gate_matrix):
+            self._apply_diagonal(circuit.state_vector, np.diag(gate_matrix),
+                                 gate.qubits, circuit.num_qubits)
+            return circuit.state_vector
+            
+        if circuit.xp is not np:
+            circuit.state_vector = self._apply_matrix(
+                circuit.state_vector, circuit.xp.asarray(gate_matrix),
+                gate.qubits, circuit.num_qubits
+            )
+            return circuit.state_vector
+            
+        if NUMBA_AVAILABLE and len(gate.qubits) == 1 and gate_matrix.shape == (2, 2):
+            # Stream the state once in place, no temporaries
+            _apply_1q_numba(circuit.state_vector,
+                            gate_matrix[0, 0], gate_matrix[0, 1],
+                            gate_matrix[1, 0], gate_matrix[1, 1],
+                            gate.qubits[0], circuit.num_qubits)
+            return circuit.state_vector
+            
+        if NUMBA_AVAILABLE and len(gate.qubits) == 2 and gate_matrix.shape == (4, 4):
+            circuit.state_vector = np.ascontiguousarray(circuit.state_vector)
+            _apply_2q_numba(circuit.state_vector, np.ascontiguousarray(gate_matrix),
+                            gate.qubits[0], gate.qubits[1], circuit.num_qubits)
+            return circuit.state_vector
+            
+        circuit.state_vector = self._apply_matrix(
+            circuit.state_vector, gate_matrix, gate.qubits, circuit.num_qubits
+        )
         
         return circuit.state_vector
     
-    def _build_full_gate_matrix(self, gate_matrix: np.ndarray, 
-                               target_qubits: List[int], 
-                               num_qubits: int) -> np.ndarray:
-        """Build full circuit gate matrix from gate acting on subset of qubits"""
-        if len(target_qubits) == 1:
-            return self._single_qubit_full_matrix(gate_matrix, target_qubits[0], num_qubits)
-        elif len(target_qubits) == 2:
-            return self._two_qubit_full_matrix(gate_matrix, target_qubits, num_qubits)
+    def run_circuit(self, circuit: QuantumCircuit,
+                    gates: Optional[List[QuantumGate]] = None) -> np.ndarray:
+        """Apply all circuit gates, running 1- and 2-qubit stretches in one compiled call"""
+        if gates is None:
+            gates = circuit.gates
+            gate_matrices = self.resolve_gates(circuit)
         else:
-            return self._multi_qubit_full_matrix(gate_matrix, target_qubits, num_qubits)
-    
-    def _single_qubit_full_matrix(self, gate: np.ndarray, target: int, num_qubits: int) -> np.ndarray:
-        """Efficient single-qubit gate expansion"""
-        matrices = []
-        for i in range(num_qubits):
-            if i == target:
-                matrices.append(gate)
-            else:
-                matrices.append(np.eye(2))
-        return self.tensor_product_gates(matrices)
-    
-    def _two_qubit_full_matrix(self, gate: np.ndarray, targets: List[int], num_qubits: int) -> np.ndarray:
-        """Efficient two-qubit gate expansion"""
-        if abs(targets[0] - targets[1]) == 1:
-            # Adjacent qubits - direct tensor product
-            matrices = []
-            for i in range(num_qubits):
-                if i == min(targets):
-                    matrices.append(gate)
-                    i += 1  # Skip next qubit
-                elif i == max(targets):
-                    continue  # Already handled
-                else:
-                    matrices.append(np.eye(2))
-            return self.tensor_product_gates(matrices)
-        else:
-            # Non-adjacent qubits - use permutation matrices
-            return self._multi_qubit_full_matrix(gate, targets, num_qubits)
-    
-    def _multi_qubit_full_matrix(self, gate: np.ndarray, targets: List[int], num_qubits: int) -> np.ndarray:
-        """General multi-qubit gate expansion using permutation"""
-        N = 2**num_qubits
-        full_matrix = np.eye(N, dtype=complex)
-        
-        # This is a simplified implementation - in practice, we'd use more efficient
-        # permutation and partial trace operations for very large systems
-        for i in range(N):
-            for j in range(N):
-                # Extract target qubit states
-                i_bits = [(i >> k) & 1 for k in range(num_qubits)]
-                j_bits = [(j >> k) & 1 for k in range(num_qubits)]
-                
-                # Check if non-target qubits match
-                if all(i_bits[k] == j_bits[k] for k in range(num_qubits) if k not in targets):
-                    # Extract target subspace indices
-                    i_target = sum(i_bits[targets[k]] * (2**k) for k in range(len(targets)))
-                    j_target = sum(j_bits[targets[k]] * (2**k) for k in range(len(targets)))
-                    
-                    full_matrix[i, j] = gate[i_target, j_target]
-                    
-        return full_matrix
+            # Pre-resolved gate list such as the output of QuantumCircuit.fuse
+            gate_matrices = [gate.matrix for gate in gates]
+            
+        if not NUMBA_AVAILABLE or circuit.xp is not np:
+            for gate, gate_matrix in zip(gates, gate_matrices):
+                self.apply_gate_to_circuit(circuit, gate, gate_matrix)
+            return circuit.state_vector
+            
+        pending: List[Tuple[int, List[int], np.ndarray]] = []
+        for gate, gate_matrix in zip(gates, gate_matrices):
+            op = self._gate_op(gate, gate_matrix)
+            if op is not None:
+                pending.append(op)
+                continue
+            # Wider gates (QFT, diffuser) take the tensordot path between compiled runs
+            self._flush_gate_ops(circuit, pending)
+            pending = []
+            self.apply_gate_to_circuit(circuit, gate, gate_matrix)
+        self._flush_gate_ops(circuit, pending)
+        
+        return circuit.state_vector
+    
+    def _gate_op(self, gate: QuantumGate,
+                 gate_matrix: np.ndarray) -> Optional[Tuple[int, List[int], np.ndarray]]:
+        """Lower a gate to (op code, qubits, matrix) if the compiled loop supports it"""
+        if gate.gate_type == GateType.PAULI_X:
+            return OP_X, gate.qubits, gate_matrix
+        if gate.gate_type == GateType.CNOT:
+            return OP_CNOT, gate.qubits, gate_matrix
+        if len(gate.qubits) == 1 and gate_matrix.shape == (2, 2):
+            code = OP_DIAGONAL_1Q if self._is_diagonal(gate, gate_matrix) else OP_1Q
+            return code, gate.qubits, gate_matrix
+        if len(gate.qubits) == 2 and gate_matrix.shape == (4, 4):
+            return OP_2Q, gate.qubits, gate_matrix
+        return None
+    
+    def _is_diagonal(self, gate: QuantumGate, gate_matrix: np.ndarray) -> bool:
+        """Whether a gate can take the diagonal fast path"""
+        if gate.gate_type in DIAGONAL_GATES:
+            return True
+        # Fused gates are diagonal when every gate merged into them was
+        return (gate.gate_type == GateType.CUSTOM
+                and not np.any(gate_matrix - np.diag(np.diag(gate_matrix))))
+    
+    def _flush_gate_ops(self, circuit: QuantumCircuit,
+                        pending: List[Tuple[int, List[int], np.ndarray]]) -> None:
+        """Pack pending gate ops into the IR arrays and run them"""
+        if not pending:
+            return
+        ops = np.zeros(len(pending), dtype=GATE_OP_DTYPE)
+        matrices = np.zeros((len(pending), 4, 4), dtype=circuit.state_vector.dtype)
+        for i, (code, qubits, gate_matrix) in enumerate(pending):
+            ops[i]['code'] = code
+            ops[i]['qubits'][:len(qubits)] = qubits
+            ops[i]['matrix'] = i
+            dim = gate_matrix.shape[0]
+            matrices[i, :dim, :dim] = gate_matrix
+        circuit.state_vector = np.ascontiguousarray(circuit.state_vector)
+        _run_circuit_njit(circuit.state_vector, ops, matrices, circuit.num_qubits)
+    
+    def _apply_matrix(self, state: np.ndarray, gate_matrix: np.ndarray,
+                      target_qubits: List[int], num_qubits: int) -> np.ndarray:
+        """Contract a k-qubit gate with the target axes of the state tensor"""
+        # Qubit 0 is the most significant bit of the state index; the gate's
+        # own index orders its qubits as listed in target_qubits
+        xp = _array_module(state)
+        k = len(target_qubits)
+        if gate_matrix.shape != (2**k, 2**k):
+            raise ValueError(
+                f"Gate of shape {gate_matrix.shape} cannot act on {k} qubit(s)"
+            )
+            
+        state_tensor = state.reshape([2] * num_qubits)
+        gate_tensor = gate_matrix.reshape([2] * (2 * k))
+        
+        # Contract the gate's input axes with the target axes, then move the
+        # gate's output axes back to where the targets were
+        result = xp.tensordot(gate_tensor, state_tensor,
+                              axes=(list(range(k, 2 * k)), list(target_qubits)))
+        result = xp.moveaxis(result, list(range(k)), list(target_qubits))
+        
+        return result.reshape(-1)
+    
+    def apply_gate_batch(self, states: np.ndarray, gate_matrices: np.ndarray,
+                         target_qubits: List[int], num_qubits: int) -> np.ndarray:
+        """Apply one gate, or a per-row stack of gates, to a (batch, 2^n) state array"""
+        xp = _array_module(states)
+        gate_matrices = xp.asarray(gate_matrices)
+        batch = states.shape[0]
+        k = len(target_qubits)
+        target_axes = [1 + q for q in target_qubits]
+        
+        # Bring the target axes forward so the gate acts on a (batch, 2^k, rest) block
+        block = xp.moveaxis(states.reshape([batch] + [2] * num_qubits),
+                            target_axes, list(range(1, k + 1)))
+        moved_shape = block.shape
+        block = block.reshape(batch, 2**k, -1)
+        
+        subscripts = 'ab,mbr->mar' if gate_matrices.ndim == 2 else 'mab,mbr->mar'
+        block = xp.einsum(subscripts, gate_matrices, block)
+        
+        block = xp.moveaxis(block.reshape(moved_shape), list(range(1, k + 1)), target_axes)
+        return block.reshape(batch, -1)
+    
+    def _swap_amplitudes(self, state: np.ndarray, control: Optional[int],
+                         target: int, num_qubits: int) -> None:
+        """Apply X (or CNOT when control is given) in place as an amplitude swap"""
+        tensor = state.reshape([2] * num_qubits)
+        if control is not None:
+            # Restrict to the control=1 half; later axes shift down by one
+            tensor = tensor[(slice(None),) * control + (1,)]
+            if target > control:
+                target -= 1
+        # Length-1 slices keep these as writable views even for 1-D tensors
+        low = tensor[(slice(None),) * target + (slice(0, 1),)]
+        high = tensor[(slice(None),) * target + (slice(1, 2),)]
+        saved = low.copy()
+        low[...] = high
+        high[...] = saved
+    
+    def _apply_diagonal(self, state: np.ndarray, diagonal: np.ndarray,
+                        target_qubits: List[int], num_qubits: int) -> None:
+        """Multiply the state in place by a diagonal gate's phases"""
+        if len(target_qubits) == 1 and diagonal[0] == 1:
+            # Only amplitudes with the target bit set change
+            target = target_qubits[0]
+            view = state.reshape(2**target, 2, 2**(num_qubits - target - 1))
+            view[:, 1, :] *= diagonal[1]
+            return
+            
+        # Lay the diagonal out along the target axes and broadcast over the rest
+        k = len(target_qubits)
+        phases = diagonal.reshape([2] * k).transpose(np.argsort(target_qubits))
+        shape = [1] * num_qubits
+        for q in target_qubits:
+            shape[q] = 2
+        xp = _array_module(state)
+        state.reshape([2] * num_qubits)[...] *= xp.asarray(phases.reshape(shape))
 
 class TensorDecompositionOptimizer:
     """Tensor decomposition for quantum simulation complexity reduction"""
     
     def __init__(self):
-        self.decomposition_cache: Dict[str, Tuple] = {}
+        self.decomposition_cache: LRUCache = LRUCache(DECOMPOSITION_CACHE_SIZE)
         
     def decompose_circuit_tensor(self, circuit: QuantumCircuit, 
-                                method: str = "parafac") -> Tuple[List[np.ndarray], float]:
+                                method: str = "mps",
+                                max_bond_dim: int = 64,
+                                tolerance: float = 1e-10) -> Tuple[List[np.ndarray], float]:
         """Decompose circuit tensor to reduce classical simulation complexity"""
+        if method != "mps":
+            raise ValueError(f"Unknown decomposition method: {method}")
+            
         cache_key = self._circuit_hash(circuit)
         
         if cache_key in self.decomposition_cache:
@@ -233,34 +673,103 @@ class TensorDecompositionOptimizer:
             
         # Convert circuit to tensor representation
         circuit_tensor = self._circuit_to_tensor(circuit)
-        
-        if method == "parafac":
-            factors = parafac(circuit_tensor, rank=min(8, circuit.num_qubits))
-            compression_ratio = self._calculate_compression_ratio(circuit_tensor, factors)
-        elif method == "tucker":
-            core, factors = tucker(circuit_tensor, rank=[2] * circuit_tensor.ndim)
-            factors = [core] + factors
-            compression_ratio = self._calculate_compression_ratio(circuit_tensor, factors)
-        else:
-            raise ValueError(f"Unknown decomposition method: {method}")
+        factors = self._matrix_product_state(circuit_tensor, max_bond_dim, tolerance)
+        compression_ratio = self._calculate_compression_ratio(circuit_tensor, factors)
             
         result = (factors, compression_ratio)
         self.decomposition_cache[cache_key] = result
         
         return result
     
+    def _matrix_product_state(self, state_tensor: np.ndarray, max_bond_dim: int,
+                              tolerance: float) -> List[np.ndarray]:
+        """Split a [2]*n state tensor into MPS cores of shape (chi_left, 2, chi_right)"""
+        # Sweep left to right, peeling one qubit off per SVD and truncating the
+        # bond to singular values above tolerance (relative), capped at max_bond_dim
+        num_sites = state_tensor.ndim
+        cores = []
+        bond = 1
+        remainder = state_tensor.reshape(1, -1)
+        for _ in range(num_sites - 1):
+            u, singular_values, vh = la.svd(remainder.reshape(bond * 2, -1),
+                                            full_matrices=False, lapack_driver='gesdd')
+            cutoff = tolerance * singular_values[0]
+            keep = int(np.count_nonzero(singular_values > cutoff))
+            keep = max(1, min(max_bond_dim, keep))
+            cores.append(u[:, :keep].reshape(bond, 2, keep))
+            remainder = singular_values[:keep, None] * vh[:keep]
+            bond = keep
+        cores.append(remainder.reshape(bond, 2, 1))
+        return cores
+    
     def _circuit_to_tensor(self, circuit: QuantumCircuit) -> np.ndarray:
         """Convert quantum circuit to tensor representation for decomposition"""
         # Simplified tensor representation - in practice this would be more sophisticated
-        state_tensor = circuit.state_vector.reshape([2] * circuit.num_qubits)
+        state_tensor = _to_host(circuit.state_vector).reshape([2] * circuit.num_qubits)
         return state_tensor
     
     def _circuit_hash(self, circuit: QuantumCircuit) -> str:
-        """Generate hash for circuit caching"""
+        """Generate a process-stable hash for circuit caching
+        
+        Circuits equal up to ZX rewriting (and hence up to a global phase)
+        may share this key, so it must not index evolved state vectors; use
+        _exact_circuit_hash for those.
+        """
+        if PYZX_AVAILABLE:
+            zx_hash = self._zx_hash(circuit)
+            if zx_hash is not None:
+                return zx_hash
+        return self._exact_circuit_hash(circuit)
+    
+    @staticmethod
+    def _exact_circuit_hash(circuit: QuantumCircuit) -> str:
+        """Process-stable hash of the exact gate list, custom matrices included"""
         gate_data = []
         for gate in circuit.gates:
-            gate_data.append(f"{gate.gate_type.value}_{gate.qubits}_{gate.parameters}")
-        return str(hash(tuple(gate_data)))
+            parameters = sorted((name, value.item() if isinstance(value, np.generic) else value)
+                                for name, value in (gate.parameters or {}).items())
+            entry = [gate.gate_type.value, [int(q) for q in gate.qubits], parameters]
+            if gate.matrix is not None:
+                matrix = np.ascontiguousarray(_to_host(gate.matrix))
+                entry.append([matrix.dtype.str, list(matrix.shape),
+                              hashlib.sha256(matrix.tobytes()).hexdigest()])
+            gate_data.append(entry)
+        encoding = json.dumps(
+            [circuit.num_qubits, circuit.state_vector.dtype.name, gate_data],
+            separators=(',', ':')
+        )
+        return hashlib.sha256(encoding.encode()).hexdigest()
+    
+    def _zx_hash(self, circuit: QuantumCircuit) -> Optional[str]:
+        """Hash the ZX-calculus reduced form so equivalent circuits share a key"""
+        zx_circuit = zx.Circuit(circuit.num_qubits)
+        for gate in circuit.gates:
+            if gate.gate_type == GateType.HADAMARD:
+                zx_circuit.add_gate("HAD", gate.qubits[0])
+            elif gate.gate_type == GateType.PAULI_X:
+                zx_circuit.add_gate("NOT", gate.qubits[0])
+            elif gate.gate_type == GateType.PAULI_Z:
+                zx_circuit.add_gate("Z", gate.qubits[0])
+            elif gate.gate_type == GateType.T_GATE:
+                zx_circuit.add_gate("T", gate.qubits[0])
+            elif gate.gate_type == GateType.CNOT:
+                zx_circuit.add_gate("CNOT", gate.qubits[0], gate.qubits[1])
+            elif gate.gate_type == GateType.PHASE:
+                theta = (gate.parameters or {}).get('theta', 0)
+                phase = Fraction(theta / np.pi).limit_denominator(1 << 16)
+                # Only exact rational multiples of pi, so distinct angles never collide
+                if abs(float(phase) * np.pi - theta) > 1e-12:
+                    return None
+                zx_circuit.add_gate("ZPhase", gate.qubits[0], phase=phase)
+            else:
+                # No ZX translation for this gate; use the gate-list hash instead
+                return None
+                
+        graph = zx_circuit.to_graph()
+        zx.full_reduce(graph)
+        reduced = zx.extract_circuit(graph).to_basic_gates().to_qasm()
+        encoding = f"zx:{circuit.state_vector.dtype.name}:{reduced}"
+        return hashlib.sha256(encoding.encode()).hexdigest()
     
     def _calculate_compression_ratio(self, original: np.ndarray, factors: List[np.ndarray]) -> float:
         """Calculate compression ratio achieved by tensor decomposition"""
@@ -276,70 +785,158 @@ class QuantumSimulationService:
             redis.Redis.from_url(redis_url) if redis_url else None
         )
         self.tensor_optimizer = TensorDecompositionOptimizer()
-        self.simulation_cache: Dict[str, Dict] = {}
+        self.simulation_cache = ByteBoundedLRUCache(SIMULATION_CACHE_BYTES)
         
     async def simulate_circuit(self, circuit: QuantumCircuit, 
                               shots: int = 1000,
-                              optimize: bool = True) -> Dict[str, Any]:
+                              optimize: bool = True,
+                              return_statevector: bool = True) -> Dict[str, Any]:
         """Simulate quantum circuit with optional tensor optimization"""
         start_time = time.time()
         
-        # Apply tensor decomposition optimization if requested
-        if optimize and circuit.num_qubits > 4:
-            factors, compression_ratio = self.tensor_optimizer.decompose_circuit_tensor(circuit)
-            logger.info(f"Tensor compression ratio: {compression_ratio:.2f}")
-        
-        # Apply gates sequentially
-        for gate in circuit.gates:
-            self.linear_algebra.apply_gate_to_circuit(circuit, gate)
+        circuit_key = self.tensor_optimizer._exact_circuit_hash(circuit)
+        memo_key = self._memo_key(circuit_key, circuit.state_vector)
+        if memo_key in self.simulation_cache:
+            # Same gates from the same input state: reuse the evolved state, but
+            # still move the circuit to it and sample fresh counts
+            circuit.state_vector = circuit.xp.array(self.simulation_cache[memo_key])
+        else:
+            # Apply tensor decomposition optimization if requested
+            if optimize and circuit.num_qubits > 4:
+                factors, compression_ratio = self.tensor_optimizer.decompose_circuit_tensor(circuit)
+                logger.info(f"Tensor compression ratio: {compression_ratio:.2f}")
             
+            # Apply gates sequentially after merging adjacent same-support gates
+            self.linear_algebra.run_circuit(circuit, circuit.fuse(self.linear_algebra))
+            self.simulation_cache[memo_key] = circuit.state_vector.copy()
+            
+        return self._build_result(circuit, circuit_key, shots, start_time, return_statevector)
+    
+    @staticmethod
+    def _memo_key(circuit_key: str, initial_state) -> str:
+        """Key of an evolved state: the circuit's gates plus the state they were applied to"""
+        state_digest = hashlib.sha256(_to_host(initial_state).tobytes()).hexdigest()
+        return f"{circuit_key}_{state_digest}"
+    
+    def _build_result(self, circuit: QuantumCircuit, circuit_key: str,
+                      shots: int, start_time: float,
+                      return_statevector: bool = True) -> Dict[str, Any]:
+        """Sample the evolved circuit state and publish the result to Redis"""
         # Calculate measurement probabilities
-        probabilities = np.abs(circuit.state_vector)**2
+        # Accumulate in float64 so complex64 states still give a well-formed CDF
+        xp = circuit.xp
+        probabilities = xp.abs(circuit.state_vector).astype(xp.float64)**2
+        probabilities /= probabilities.sum()
         
-        # Simulate measurements
-        outcomes = np.random.choice(
-            len(probabilities), 
-            size=shots, 
-            p=probabilities
-        )
+        # Simulate measurements by inverse-CDF sampling on the state's device;
+        # side='right' never lands on a zero-probability outcome
+        cdf = xp.cumsum(probabilities)
+        draws = xp.random.random(shots)
+        outcomes = xp.searchsorted(cdf, draws, side='right')
+        outcomes = _to_host(xp.minimum(outcomes, len(probabilities) - 1))
+        probabilities = _to_host(probabilities)
         
-        # Count measurement results
-        counts = {}
-        for outcome in outcomes:
-            bit_string = format(outcome, f'0{circuit.num_qubits}b')
-            counts[bit_string] = counts.get(bit_string, 0) + 1
+        # Count measurement results and render the distinct outcomes as bitstrings
+        # in one vectorized pass: shift out each bit (qubit 0 first) into '0'/'1' bytes
+        values, frequencies = np.unique(outcomes, return_counts=True)
+        n = circuit.num_qubits
+        shifts = np.arange(n - 1, -1, -1, dtype=values.dtype)
+        chars = (((values[:, None] >> shifts) & 1) + ord('0')).astype(np.uint8)
+        bit_strings = chars.view(f'S{n}').ravel().astype(f'U{n}')
+        counts = dict(zip(bit_strings.tolist(), frequencies.tolist()))
             
         simulation_time = time.time() - start_time
         
-        result = {
+        result_meta = {
             'counts': counts,
-            'probabilities': probabilities.tolist(),
-            'state_vector': circuit.state_vector.tolist(),
             'simulation_time': simulation_time,
             'num_qubits': circuit.num_qubits,
             'num_gates': len(circuit.gates),
             'shots': shots
         }
+        result = dict(result_meta)
+        if return_statevector:
+            # Both are 2^n long, so callers that only need counts can skip them
+            result['probabilities'] = probabilities.tolist()
+            result['state_vector'] = _to_host(circuit.state_vector).tolist()
         
         # Cache result if Redis is available
         if self.linear_algebra.redis_client:
-            cache_key = f"simulation_{self.tensor_optimizer._circuit_hash(circuit)}"
+            cache_key = f"simulation_{circuit_key}"
             self.linear_algebra.redis_client.setex(
                 cache_key, 
                 3600,  # 1 hour TTL
-                json.dumps(result, default=str)
+                json.dumps(result_meta)
             )
+            if return_statevector:
+                # Keep the state as a binary .npy blob rather than JSON text
+                buffer = io.BytesIO()
+                np.save(buffer, _to_host(circuit.state_vector), allow_pickle=False)
+                self.linear_algebra.redis_client.set(
+                    f"{cache_key}_state", buffer.getvalue(), ex=3600
+                )
             
         return result
     
     async def batch_simulate(self, circuits: List[QuantumCircuit], 
-                           shots_per_circuit: int = 1000) -> List[Dict[str, Any]]:
+                           shots_per_circuit: int = 1000,
+                           return_statevector: bool = True) -> List[Dict[str, Any]]:
         """Batch simulation of multiple circuits for cloud efficiency"""
         tasks = [
-            self.simulate_circuit(circuit, shots_per_circuit) 
+            self.simulate_circuit(circuit, shots_per_circuit,
+                                  return_statevector=return_statevector)
             for circuit in circuits
         ]
         return await asyncio.gather(*tasks)
+    
+    async def batch_simulate_stacked(self, circuits: List[QuantumCircuit],
+                                     shots_per_circuit: int = 1000,
+                                     return_statevector: bool = True) -> List[Dict[str, Any]]:
+        """Simulate same-structure circuits (e.g. a parameter sweep) as one stacked state array"""
+        if not self._same_structure(circuits):
+            return await self.batch_simulate(circuits, shots_per_circuit, return_statevector)
+            
+        start_time = time.time()
+        num_qubits = circuits[0].num_qubits
+        dtype = circuits[0].state_vector.dtype
+        xp = circuits[0].xp
+        states = xp.stack([circuit.state_vector for circuit in circuits]).astype(dtype, copy=False)
+        circuit_keys = [self.tensor_optimizer._exact_circuit_hash(circuit) for circuit in circuits]
+        memo_keys = [self._memo_key(key, circuit.state_vector)
+                     for key, circuit in zip(circuit_keys, circuits)]
+        
+        resolved = [self.linear_algebra.resolve_gates(circuit) for circuit in circuits]
+        for position, gate in enumerate(circuits[0].gates):
+            matrices = [circuit_matrices[position] for circuit_matrices in resolved]
+            # Share one matrix across the batch when every circuit resolved the same entry
+            if all(m is matrices[0] for m in matrices):
+                gate_matrices = matrices[0]
+            else:
+                gate_matrices = np.stack(matrices)
+            states = self.linear_algebra.apply_gate_batch(states, gate_matrices,
+                                                          gate.qubits, num_qubits)
+            
+        results = []
+        for circuit, state, circuit_key, memo_key in zip(circuits, states, circuit_keys, memo_keys):
+            circuit.state_vector = xp.ascontiguousarray(state)
+            self.simulation_cache[memo_key] = circuit.state_vector.copy()
+            results.append(self._build_result(circuit, circuit_key, shots_per_circuit,
+                                              start_time, return_statevector))
+        return results
+    
+    def _same_structure(self, circuits: List[QuantumCircuit]) -> bool:
+        """Check that circuits share qubit count, dtype, gate types and gate placement"""
+        if not circuits:
+            return False
+        first = circuits[0]
+        signature = [(g.gate_type, list(g.qubits)) for g in first.gates]
+        return all(
+            c.num_qubits == first.num_qubits
+            and c.state_vector.dtype == first.state_vector.dtype
+            and c.backend == first.backend
+            and [(g.gate_type, list(g.qubits)) for g in c.gates] == signature
+            for c in circuits[1:]
+        )
 
 # Example usage and testing functions
 def create_qft_circuit(n_qubits: int) -> QuantumCircuit:
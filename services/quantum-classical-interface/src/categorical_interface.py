@@ -4,19 +4,27 @@ Uses category theory, type theory, and formal verification for safe quantum-clas
 """
 
 import numpy as np
-from typing import Any, Dict, List, Tuple, Optional, Union, Callable, Generic, TypeVar
-from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple, Optional, Union, Callable, Generic, TypeVar, TYPE_CHECKING
+from dataclasses import dataclass
 from abc import ABC, abstractmethod
-from enum import Enum
+from enum import IntEnum
 import asyncio
 import logging
 import time
 import json
-from functools import wraps
-import sympy as sp
-from sympy.logic import satisfiable
-from sympy.logic.boolalg import BooleanFunction
-import z3
+import math
+from functools import wraps, lru_cache
+
+# sympy and z3 are heavy to import and only needed by opt-in features,
+# so they are imported on first use
+if TYPE_CHECKING:
+    import z3
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -25,30 +33,102 @@ T = TypeVar('T')
 U = TypeVar('U')
 V = TypeVar('V')
 
-class DataType(Enum):
+def _frozen_gate(rows: List[List[complex]]) -> np.ndarray:
+    """Build a read-only gate matrix shared by every call site"""
+    gate = np.array(rows, dtype=np.complex128)
+    gate.setflags(write=False)
+    return gate
+
+# Single precision halves state-vector memory traffic; results are measured or
+# checked against NORMALIZATION_TOLERANCE, so the lost digits do not matter
+DEFAULT_CDTYPE = np.complex64
+PRECISION_DTYPES = {'single': np.complex64, 'double': np.complex128}
+NORMALIZATION_TOLERANCE = 1e-5
+
+# Single-qubit gate matrices, built once at import
+_PAULI_X = _frozen_gate([[0, 1], [1, 0]])
+_PAULI_Y = _frozen_gate([[0, -1j], [1j, 0]])
+_PAULI_Z = _frozen_gate([[1, 0], [0, -1]])
+_HADAMARD = _frozen_gate([[1 / np.sqrt(2), 1 / np.sqrt(2)], [1 / np.sqrt(2), -1 / np.sqrt(2)]])
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+# Computational basis kets; copied on use so each QuantumValue owns its buffer
+_KET0 = np.array([1.0, 0.0], dtype=DEFAULT_CDTYPE)
+_KET1 = np.array([0.0, 1.0], dtype=DEFAULT_CDTYPE)
+_KET0.setflags(write=False)
+_KET1.setflags(write=False)
+
+_GATE_MATRIX = {
+    'pauli_x': _PAULI_X,
+    'pauli_y': _PAULI_Y,
+    'pauli_z': _PAULI_Z,
+    'hadamard': _HADAMARD,
+}
+
+@lru_cache(maxsize=256)
+def _fused_unitary(ops: Tuple[str, ...]) -> np.ndarray:
+    """Single matrix equivalent to applying the named gates in order"""
+    if len(ops) == 1:
+        return _GATE_MATRIX[ops[0]]
+    # Later gates multiply from the left
+    fused = np.linalg.multi_dot([_GATE_MATRIX[op] for op in reversed(ops)])
+    fused.setflags(write=False)
+    return fused
+
+_RNG = np.random.default_rng()
+
+def _json_dumps(obj: Any) -> str:
+    """Indented JSON, via orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                            default=str).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+class DataType(IntEnum):
     """Types in the quantum-classical type system"""
-    CLASSICAL_BIT = "classical_bit"
-    CLASSICAL_INT = "classical_int" 
-    CLASSICAL_FLOAT = "classical_float"
-    CLASSICAL_COMPLEX = "classical_complex"
-    QUANTUM_BIT = "quantum_bit"
-    QUANTUM_STATE = "quantum_state"
-    QUANTUM_OPERATOR = "quantum_operator"
-    MEASUREMENT_RESULT = "measurement_result"
-    PROBABILITY_DISTRIBUTION = "probability_distribution"
-
-@dataclass
+    # Stable integer tags so type comparisons are plain int compares
+    CLASSICAL_BIT = 0
+    CLASSICAL_INT = 1
+    CLASSICAL_FLOAT = 2
+    CLASSICAL_COMPLEX = 3
+    QUANTUM_BIT = 4
+    QUANTUM_STATE = 5
+    QUANTUM_OPERATOR = 6
+    MEASUREMENT_RESULT = 7
+    PROBABILITY_DISTRIBUTION = 8
+
+@dataclass(slots=True, frozen=True)
 class TypeSignature:
     """Type signature for quantum-classical functions"""
-    input_types: List[DataType]
-    output_types: List[DataType]
-    side_effects: List[str] = field(default_factory=list)
+    input_types: Tuple[DataType, ...]
+    output_types: Tuple[DataType, ...]
+    side_effects: Tuple[str, ...] = ()
     purity_level: str = "pure"  # pure, quantum_pure, classical_side_effects, quantum_side_effects
     
+    def __post_init__(self):
+        # Accept any sequence; tuples are hashable, so compatibility checks can be memoized
+        object.__setattr__(self, 'input_types', tuple(self.input_types))
+        object.__setattr__(self, 'output_types', tuple(self.output_types))
+        object.__setattr__(self, 'side_effects', tuple(self.side_effects))
+    
     def is_compatible(self, other: 'TypeSignature') -> bool:
         """Check if two type signatures are compatible for composition"""
-        return (len(self.output_types) == len(other.input_types) and
-                all(o == i for o, i in zip(self.output_types, other.input_types)))
+        return TypeSignature._types_compatible(self.output_types, other.input_types)
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _types_compatible(output_types: Tuple[DataType, ...], input_types: Tuple[DataType, ...]) -> bool:
+        """Memoized output/input type sequence match"""
+        return output_types == input_types
+
+def _outcome_probabilities(v: np.ndarray) -> np.ndarray:
+    """Born-rule probabilities in float64, renormalized for the sampler's sum check"""
+    probabilities = (v.real * v.real + v.imag * v.imag).astype(np.float64, copy=False)
+    return probabilities / probabilities.sum()
+
+def _state_dtype(v: np.ndarray) -> np.dtype:
+    """Complex dtype a gate output keeps for the given input state"""
+    return v.dtype if v.dtype.kind == 'c' else DEFAULT_CDTYPE
 
 class QuantumValue:
     """Represents a quantum value with type safety"""
@@ -59,12 +139,12 @@ class QuantumValue:
         self.creation_time = time.time()
         self.coherence_time = coherence_time
         self.measured = False
+        # Monotonic cutoff, so each coherence check is a single compare
+        self._deadline = (time.monotonic() + coherence_time) if coherence_time is not None else math.inf
         
     def is_coherent(self) -> bool:
         """Check if quantum value is still coherent"""
-        if self.coherence_time is None:
-            return True
-        return (time.time() - self.creation_time) < self.coherence_time
+        return time.monotonic() < self._deadline
     
     def measure(self) -> 'ClassicalValue':
         """Collapse quantum value to classical measurement result"""
@@ -73,12 +153,14 @@ class QuantumValue:
         
         if self.data_type == DataType.QUANTUM_BIT:
             # Single qubit measurement
-            prob_0 = np.abs(self.value[0])**2
+            c = self.value[0]
+            prob_0 = c.real * c.real + c.imag * c.imag
             measurement = 0 if np.random.random() < prob_0 else 1
             result = ClassicalValue(measurement, DataType.CLASSICAL_BIT)
         elif self.data_type == DataType.QUANTUM_STATE:
             # Multi-qubit measurement
-            probabilities = np.abs(self.value)**2
+            v = self.value
+            probabilities = _outcome_probabilities(v)
             outcome = np.random.choice(len(probabilities), p=probabilities)
             result = ClassicalValue(outcome, DataType.MEASUREMENT_RESULT)
         else:
@@ -88,6 +170,20 @@ class QuantumValue:
         logger.info(f"Quantum value measured: {result.value}")
         return result
 
+    def measure_many(self, n_shots: int) -> np.ndarray:
+        """Sample n_shots computational-basis outcomes from one probability pass"""
+        if self.measured:
+            raise ValueError("Quantum value already measured")
+        if self.data_type not in (DataType.QUANTUM_BIT, DataType.QUANTUM_STATE):
+            raise ValueError(f"Cannot measure {self.data_type}")
+
+        probabilities = _outcome_probabilities(self.value)
+        outcomes = _RNG.choice(len(probabilities), size=n_shots, p=probabilities)
+
+        self.measured = True
+        logger.info(f"Quantum value measured over {n_shots} shots")
+        return outcomes.astype(np.int64, copy=False)
+
 class ClassicalValue:
     """Represents a classical value with type information"""
     
@@ -96,18 +192,15 @@ class ClassicalValue:
         self.data_type = data_type
         self.creation_time = time.time()
     
-    def to_quantum(self) -> QuantumValue:
+    def to_quantum(self, dtype: np.dtype = DEFAULT_CDTYPE) -> QuantumValue:
         """Convert classical value to quantum representation"""
         if self.data_type == DataType.CLASSICAL_BIT:
-            if self.value == 0:
-                qstate = np.array([1.0, 0.0], dtype=complex)
-            else:
-                qstate = np.array([0.0, 1.0], dtype=complex)
+            qstate = (_KET0 if self.value == 0 else _KET1).astype(dtype)
             return QuantumValue(qstate, DataType.QUANTUM_BIT)
         elif self.data_type == DataType.CLASSICAL_INT:
             # Encode integer in computational basis
             n_bits = max(1, int(np.ceil(np.log2(abs(self.value) + 1))))
-            qstate = np.zeros(2**n_bits, dtype=complex)
+            qstate = np.zeros(2**n_bits, dtype=dtype)
             qstate[self.value % (2**n_bits)] = 1.0
             return QuantumValue(qstate, DataType.QUANTUM_STATE)
         else:
@@ -141,6 +234,15 @@ class Category(ABC):
 class QuantumCategory(Category):
     """Category of quantum types and quantum operations"""
     
+    def __init__(self):
+        # Named single-qubit gates, dispatched by operation name
+        self._gate_ops: Dict[str, Callable[[QuantumValue], QuantumValue]] = {
+            'pauli_x': self._apply_pauli_x,
+            'pauli_y': self._apply_pauli_y,
+            'pauli_z': self._apply_pauli_z,
+            'hadamard': self._apply_hadamard,
+        }
+    
     def objects(self) -> List[DataType]:
         return [DataType.QUANTUM_BIT, DataType.QUANTUM_STATE, DataType.QUANTUM_OPERATOR]
     
@@ -151,10 +253,10 @@ class QuantumCategory(Category):
         if source == target == DataType.QUANTUM_BIT:
             # Single qubit gates
             morphisms.extend([
-                lambda q: self._apply_pauli_x(q),
-                lambda q: self._apply_pauli_y(q),
-                lambda q: self._apply_pauli_z(q),
-                lambda q: self._apply_hadamard(q),
+                self._apply_pauli_x,
+                self._apply_pauli_y,
+                self._apply_pauli_z,
+                self._apply_hadamard,
             ])
         elif source == DataType.QUANTUM_STATE and target == DataType.QUANTUM_STATE:
             # Multi-qubit operations
@@ -164,32 +266,53 @@ class QuantumCategory(Category):
     
     def _apply_pauli_x(self, qubit: QuantumValue) -> QuantumValue:
         """Apply Pauli-X gate"""
-        x_gate = np.array([[0, 1], [1, 0]], dtype=complex)
-        new_value = x_gate @ qubit.value
+        v = qubit.value
+        if v.shape[0] != 2:
+            return QuantumValue(_PAULI_X @ v, qubit.data_type, qubit.coherence_time)
+        # Length-2 states: explicit scalar forms skip the matmul dispatch
+        new_value = np.empty(2, dtype=_state_dtype(v))
+        new_value[0] = v[1]
+        new_value[1] = v[0]
         return QuantumValue(new_value, qubit.data_type, qubit.coherence_time)
     
     def _apply_pauli_y(self, qubit: QuantumValue) -> QuantumValue:
         """Apply Pauli-Y gate"""
-        y_gate = np.array([[0, -1j], [1j, 0]], dtype=complex)
-        new_value = y_gate @ qubit.value
+        v = qubit.value
+        if v.shape[0] != 2:
+            return QuantumValue(_PAULI_Y @ v, qubit.data_type, qubit.coherence_time)
+        new_value = np.empty(2, dtype=_state_dtype(v))
+        new_value[0] = -1j * v[1]
+        new_value[1] = 1j * v[0]
         return QuantumValue(new_value, qubit.data_type, qubit.coherence_time)
     
     def _apply_pauli_z(self, qubit: QuantumValue) -> QuantumValue:
         """Apply Pauli-Z gate"""
-        z_gate = np.array([[1, 0], [0, -1]], dtype=complex)
-        new_value = z_gate @ qubit.value
+        v = qubit.value
+        if v.shape[0] != 2:
+            return QuantumValue(_PAULI_Z @ v, qubit.data_type, qubit.coherence_time)
+        new_value = np.empty(2, dtype=_state_dtype(v))
+        new_value[0] = v[0]
+        new_value[1] = -v[1]
         return QuantumValue(new_value, qubit.data_type, qubit.coherence_time)
     
     def _apply_hadamard(self, qubit: QuantumValue) -> QuantumValue:
         """Apply Hadamard gate"""
-        h_gate = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
-        new_value = h_gate @ qubit.value
+        v = qubit.value
+        if v.shape[0] != 2:
+            return QuantumValue(_HADAMARD @ v, qubit.data_type, qubit.coherence_time)
+        a, b = v[0], v[1]
+        new_value = np.empty(2, dtype=_state_dtype(v))
+        new_value[0] = _INV_SQRT2 * (a + b)
+        new_value[1] = _INV_SQRT2 * (a - b)
         return QuantumValue(new_value, qubit.data_type, qubit.coherence_time)
     
-    def _apply_generic_unitary(self, state: QuantumValue) -> QuantumValue:
+    def _apply_generic_unitary(self, state: QuantumValue, unitary: Optional[np.ndarray] = None) -> QuantumValue:
         """Apply generic unitary operation"""
-        # Placeholder for general unitary
-        return state
+        if unitary is None:
+            # Placeholder for general unitary
+            return state
+        new_value = (unitary @ state.value).astype(_state_dtype(state.value), copy=False)
+        return QuantumValue(new_value, state.data_type, state.coherence_time)
     
     def compose(self, f: Callable, g: Callable) -> Callable:
         """Compose quantum operations"""
@@ -295,27 +418,46 @@ class PreparationFunctor(Functor):
 
 # Formal verification system
 
+def _pred_normalized(quantum_value: QuantumValue) -> bool:
+    """State vector has unit norm"""
+    v = quantum_value.value
+    return abs(math.sqrt((v.real * v.real + v.imag * v.imag).sum()) - 1.0) < NORMALIZATION_TOLERANCE
+
+def _pred_coherent(quantum_value: QuantumValue) -> bool:
+    """Quantum value has not decohered"""
+    return quantum_value.is_coherent()
+
+def _pred_entangled(quantum_value: QuantumValue) -> bool:
+    """Simple entanglement check for 2-qubit states"""
+    if len(quantum_value.value) == 4:
+        state = quantum_value.value.reshape(2, 2)
+        return np.linalg.matrix_rank(state) > 1
+    return True
+
+def _pred_true(quantum_value: QuantumValue) -> bool:
+    """Fallback for predicates without a concrete check"""
+    return True
+
+_PREDICATES: Dict[str, Callable[[QuantumValue], bool]] = {
+    'normalized': _pred_normalized,
+    'coherent': _pred_coherent,
+    'entangled': _pred_entangled,
+}
+
 class QuantumPredicate:
     """Predicate for quantum states and operations"""
     
-    def __init__(self, name: str, formula: sp.Basic):
+    def __init__(self, name: str, formula: Any = None):
         self.name = name
+        # Symbolic form is descriptive metadata only; verification uses _PREDICATES
+        if isinstance(formula, str):
+            import sympy as sp
+            formula = sp.sympify(formula)
         self.formula = formula
     
     def verify(self, quantum_value: QuantumValue) -> bool:
         """Verify predicate holds for quantum value"""
-        # Simplified verification - in practice would use quantum state properties
-        if self.name == "normalized":
-            return abs(np.linalg.norm(quantum_value.value) - 1.0) < 1e-10
-        elif self.name == "coherent":
-            return quantum_value.is_coherent()
-        elif self.name == "entangled":
-            # Simple entanglement check for 2-qubit states
-            if len(quantum_value.value) == 4:
-                state = quantum_value.value.reshape(2, 2)
-                return np.linalg.matrix_rank(state) > 1
-        
-        return True
+        return _PREDICATES.get(self.name, _pred_true)(quantum_value)
 
 class InterfaceContract:
     """Contract for quantum-classical interface functions"""
@@ -351,12 +493,45 @@ class InterfaceContract:
 class TypeChecker:
     """Static type checker for quantum-classical interfaces"""
     
-    def __init__(self):
+    def __init__(self, enable_z3_backend: bool = False):
         self.type_rules: Dict[str, TypeSignature] = {}
-        self.z3_solver = z3.Solver()
+        self.enable_z3_backend = enable_z3_backend
+        self._z3_solver: Optional['z3.Solver'] = None
+        # (func1, func2) -> (Z3 compatibility variable, composition result)
+        self._pair_cache: Dict[Tuple[str, str], Tuple['z3.BoolRef', bool]] = {}
+        # Per-category function counts, maintained on registration
+        self._stats = {'quantum': 0, 'classical': 0, 'interface': 0}
+    
+    @property
+    def z3_solver(self) -> 'z3.Solver':
+        """Persistent Z3 solver, created on first use"""
+        if self._z3_solver is None:
+            import z3
+            self._z3_solver = z3.Solver()
+        return self._z3_solver
+    
+    @staticmethod
+    def _signature_stats(signature: TypeSignature) -> Dict[str, int]:
+        """Categories a signature counts towards in the interface statistics"""
+        return {
+            'quantum': int(any(t.name.startswith('QUANTUM') for t in signature.input_types)),
+            'classical': int(any(t.name.startswith('CLASSICAL') for t in signature.input_types)),
+            'interface': int('measurement' in signature.side_effects or
+                             'preparation' in signature.side_effects)
+        }
     
     def register_function(self, func_name: str, signature: TypeSignature):
         """Register function with its type signature"""
+        previous = self.type_rules.get(func_name)
+        if previous is not None:
+            for key, count in self._signature_stats(previous).items():
+                self._stats[key] -= count
+        for key, count in self._signature_stats(signature).items():
+            self._stats[key] += count
+        
+        # Drop cached pairs involving this name, including ones cached before it was known
+        self._pair_cache = {pair: entry for pair, entry in self._pair_cache.items()
+                            if func_name not in pair}
         self.type_rules[func_name] = signature
     
     def check_composition(self, func1: str, func2: str) -> bool:
@@ -413,33 +588,70 @@ class TypeChecker:
         
         return False
     
-    def generate_z3_constraints(self, function_chain: List[str]) -> List[z3.BoolRef]:
+    @staticmethod
+    def _chain_edges(function_chain: List[str],
+                     edges: Optional[List[Tuple[int, int]]]) -> List[Tuple[int, int]]:
+        """Producer -> consumer step pairs; consecutive steps unless data-flow edges are given"""
+        if edges is None:
+            return [(i, i + 1) for i in range(len(function_chain) - 1)]
+        return list(edges)
+    
+    def generate_z3_constraints(self, function_chain: List[str],
+                                edges: Optional[List[Tuple[int, int]]] = None) -> List['z3.BoolRef']:
         """Generate Z3 constraints for formal verification"""
+        import z3
         constraints = []
         
-        for i in range(len(function_chain) - 1):
-            func1, func2 = function_chain[i], function_chain[i + 1]
+        for src, dst in self._chain_edges(function_chain, edges):
+            func1, func2 = function_chain[src], function_chain[dst]
             
-            # Create Z3 variables for type compatibility
-            compatible = z3.Bool(f"compatible_{func1}_{func2}")
+            # Create Z3 variables for type compatibility once per pair
+            pair = (func1, func2)
+            entry = self._pair_cache.get(pair)
+            if entry is None:
+                entry = (z3.Bool(f"compatible_{func1}_{func2}"), self.check_composition(func1, func2))
+                self._pair_cache[pair] = entry
+            compatible, is_compatible = entry
             
             # Add constraint based on type checking
-            if self.check_composition(func1, func2):
+            if is_compatible:
                 constraints.append(compatible)
             else:
                 constraints.append(z3.Not(compatible))
         
         return constraints
     
-    def verify_chain(self, function_chain: List[str]) -> Tuple[bool, Optional[str]]:
+    def verify_chain(self, function_chain: List[str],
+                     edges: Optional[List[Tuple[int, int]]] = None) -> Tuple[bool, Optional[str]]:
+        """Verify entire function chain
+        
+        ``edges`` lists (producer, consumer) step indices; without it each step
+        is assumed to feed the next one.
+        """
+        if self.enable_z3_backend:
+            return self._verify_chain_z3(function_chain, edges)
+        
+        # Pairwise compatibility is decidable directly; no solver needed
+        for src, dst in self._chain_edges(function_chain, edges):
+            func1, func2 = function_chain[src], function_chain[dst]
+            if not self.check_composition(func1, func2):
+                return False, f"Verification failed: incompatible pair ({func1}, {func2})"
+        return True, None
+    
+    def _verify_chain_z3(self, function_chain: List[str],
+                         edges: Optional[List[Tuple[int, int]]] = None) -> Tuple[bool, Optional[str]]:
         """Verify entire function chain using Z3"""
-        constraints = self.generate_z3_constraints(function_chain)
+        import z3
+        constraints = self.generate_z3_constraints(function_chain, edges)
         
         self.z3_solver.push()
         for constraint in constraints:
             self.z3_solver.add(constraint)
         
-        result = self.z3_solver.check()
+        # Every edge must be compatible; assuming so lets the unsat core name the bad pairs
+        required = [self._pair_cache[(function_chain[src], function_chain[dst])][0]
+                    for src, dst in self._chain_edges(function_chain, edges)]
+        result = self.z3_solver.check(*required)
         
         if result == z3.sat:
             self.z3_solver.pop()
@@ -454,18 +666,11 @@ def verified_interface(contract: InterfaceContract):
     """Decorator for verified quantum-classical interface functions"""
     
     def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            # Verify preconditions
-            if not contract.verify_preconditions(list(args)):
-                raise ValueError("Precondition verification failed")
-            
-            # Execute function
-            start_time = time.time()
-            result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            
-            # Verify postconditions
+        # Contracts are fixed at decoration time, so pick a wrapper that skips empty checks
+        has_pre = bool(contract.preconditions)
+        has_post = bool(contract.postconditions)
+        
+        def check_post(result):
             if isinstance(result, (list, tuple)):
                 results = list(result)
             else:
@@ -473,17 +678,75 @@ def verified_interface(contract: InterfaceContract):
             
             if not contract.verify_postconditions(results):
                 raise ValueError("Postcondition verification failed")
-            
-            logger.info(f"Verified function {func.__name__} executed in {execution_time:.4f}s")
-            return result
+        
+        if has_pre and has_post:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not contract.verify_preconditions(list(args)):
+                    raise ValueError("Precondition verification failed")
+                start_time = time.time()
+                result = func(*args, **kwargs)
+                execution_time = time.time() - start_time
+                check_post(result)
+                logger.info(f"Verified function {func.__name__} executed in {execution_time:.4f}s")
+                return result
+        elif has_pre:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not contract.verify_preconditions(list(args)):
+                    raise ValueError("Precondition verification failed")
+                start_time = time.time()
+                result = func(*args, **kwargs)
+                execution_time = time.time() - start_time
+                logger.info(f"Verified function {func.__name__} executed in {execution_time:.4f}s")
+                return result
+        elif has_post:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start_time = time.time()
+                result = func(*args, **kwargs)
+                execution_time = time.time() - start_time
+                check_post(result)
+                logger.info(f"Verified function {func.__name__} executed in {execution_time:.4f}s")
+                return result
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start_time = time.time()
+                result = func(*args, **kwargs)
+                execution_time = time.time() - start_time
+                logger.info(f"Verified function {func.__name__} executed in {execution_time:.4f}s")
+                return result
         
         return wrapper
     return decorator
 
+# Standard interface functions; signatures are immutable, so every interface shares them
+_STANDARD_SIGS: Tuple[Tuple[str, TypeSignature], ...] = tuple(
+    (func_name, TypeSignature(inputs, outputs, side_effects, purity_level))
+    for func_name, inputs, outputs, side_effects, purity_level in (
+        # Quantum operations
+        ("pauli_x", (DataType.QUANTUM_BIT,), (DataType.QUANTUM_BIT,), (), "quantum_pure"),
+        ("pauli_y", (DataType.QUANTUM_BIT,), (DataType.QUANTUM_BIT,), (), "quantum_pure"),
+        ("pauli_z", (DataType.QUANTUM_BIT,), (DataType.QUANTUM_BIT,), (), "quantum_pure"),
+        ("hadamard", (DataType.QUANTUM_BIT,), (DataType.QUANTUM_BIT,), (), "quantum_pure"),
+        # Measurement operation
+        ("measure_qubit", (DataType.QUANTUM_BIT,), (DataType.CLASSICAL_BIT,), ("measurement",),
+         "quantum_side_effects"),
+        # Classical operations
+        ("classical_not", (DataType.CLASSICAL_BIT,), (DataType.CLASSICAL_BIT,), (), "pure"),
+        # State preparation
+        ("prepare_qubit", (DataType.CLASSICAL_BIT,), (DataType.QUANTUM_BIT,), (), "quantum_pure"),
+    )
+)
+
 class QuantumClassicalInterface:
     """Main interface service for quantum-classical boundaries"""
     
-    def __init__(self):
+    def __init__(self, precision: str = 'single'):
+        if precision not in PRECISION_DTYPES:
+            raise ValueError(f"Unknown precision: {precision}")
+        self.cdtype = PRECISION_DTYPES[precision]
         self.quantum_category = QuantumCategory()
         self.classical_category = ClassicalCategory()
         self.type_checker = TypeChecker()
@@ -494,65 +757,34 @@ class QuantumClassicalInterface:
     
     def _register_standard_functions(self):
         """Register standard quantum-classical interface functions"""
-        
-        # Quantum operations
-        self.type_checker.register_function("pauli_x", TypeSignature(
-            input_types=[DataType.QUANTUM_BIT],
-            output_types=[DataType.QUANTUM_BIT],
-            purity_level="quantum_pure"
-        ))
-        
-        self.type_checker.register_function("hadamard", TypeSignature(
-            input_types=[DataType.QUANTUM_BIT],
-            output_types=[DataType.QUANTUM_BIT], 
-            purity_level="quantum_pure"
-        ))
-        
-        # Measurement operation
-        self.type_checker.register_function("measure_qubit", TypeSignature(
-            input_types=[DataType.QUANTUM_BIT],
-            output_types=[DataType.CLASSICAL_BIT],
-            side_effects=["measurement"],
-            purity_level="quantum_side_effects"
-        ))
-        
-        # Classical operations
-        self.type_checker.register_function("classical_not", TypeSignature(
-            input_types=[DataType.CLASSICAL_BIT],
-            output_types=[DataType.CLASSICAL_BIT],
-            purity_level="pure"
-        ))
-        
-        # State preparation
-        self.type_checker.register_function("prepare_qubit", TypeSignature(
-            input_types=[DataType.CLASSICAL_BIT],
-            output_types=[DataType.QUANTUM_BIT],
-            purity_level="quantum_pure"
-        ))
+        for func_name, signature in _STANDARD_SIGS:
+            self.type_checker.register_function(func_name, signature)
     
     @verified_interface(InterfaceContract(
-        preconditions=[QuantumPredicate("normalized", sp.Symbol("normalized"))],
-        postconditions=[QuantumPredicate("normalized", sp.Symbol("normalized"))]
+        preconditions=[QuantumPredicate("normalized")],
+        postconditions=[QuantumPredicate("normalized")]
     ))
-    async def safe_quantum_operation(self, qubit: QuantumValue, operation: str) -> QuantumValue:
+    def _safe_quantum_operation_sync(self, qubit: QuantumValue, operation: str) -> QuantumValue:
         """Safely apply quantum operation with verification"""
         
-        if operation == "pauli_x":
-            return self.quantum_category._apply_pauli_x(qubit)
-        elif operation == "pauli_y":
-            return self.quantum_category._apply_pauli_y(qubit)
-        elif operation == "pauli_z":
-            return self.quantum_category._apply_pauli_z(qubit)
-        elif operation == "hadamard":
-            return self.quantum_category._apply_hadamard(qubit)
-        else:
+        op = self.quantum_category._gate_ops.get(operation)
+        if op is None:
             raise ValueError(f"Unknown quantum operation: {operation}")
+        return op(qubit)
+    
+    @verified_interface(InterfaceContract(
+        preconditions=[QuantumPredicate("normalized")],
+        postconditions=[QuantumPredicate("normalized")]
+    ))
+    def _safe_unitary_sync(self, qubit: QuantumValue, unitary: np.ndarray) -> QuantumValue:
+        """Safely apply a precomputed unitary with verification"""
+        return self.quantum_category._apply_generic_unitary(qubit, unitary)
     
     @verified_interface(InterfaceContract(
-        preconditions=[QuantumPredicate("coherent", sp.Symbol("coherent"))],
+        preconditions=[QuantumPredicate("coherent")],
         postconditions=[]  # Measurement destroys quantum state
     ))
-    async def safe_measurement(self, qubit: QuantumValue) -> ClassicalValue:
+    def _safe_measurement_sync(self, qubit: QuantumValue) -> ClassicalValue:
         """Safely measure quantum state with verification"""
         
         if not qubit.is_coherent():
@@ -562,15 +794,64 @@ class QuantumClassicalInterface:
     
     @verified_interface(InterfaceContract(
         preconditions=[],
-        postconditions=[QuantumPredicate("normalized", sp.Symbol("normalized"))]
+        postconditions=[QuantumPredicate("normalized")]
     ))
-    async def safe_state_preparation(self, classical_bit: ClassicalValue) -> QuantumValue:
+    def _safe_state_preparation_sync(self, classical_bit: ClassicalValue) -> QuantumValue:
         """Safely prepare quantum state from classical data"""
         
         if classical_bit.data_type != DataType.CLASSICAL_BIT:
             raise ValueError("Can only prepare quantum state from classical bit")
         
-        return classical_bit.to_quantum()
+        return classical_bit.to_quantum(self.cdtype)
+    
+    # Async entrypoints kept for API compatibility; the work is purely CPU-bound
+    
+    async def safe_quantum_operation(self, qubit: QuantumValue, operation: str) -> QuantumValue:
+        """Safely apply quantum operation with verification"""
+        return self._safe_quantum_operation_sync(qubit, operation)
+    
+    async def safe_measurement(self, qubit: QuantumValue) -> ClassicalValue:
+        """Safely measure quantum state with verification"""
+        return self._safe_measurement_sync(qubit)
+    
+    async def safe_state_preparation(self, classical_bit: ClassicalValue) -> QuantumValue:
+        """Safely prepare quantum state from classical data"""
+        return self._safe_state_preparation_sync(classical_bit)
+    
+    @staticmethod
+    def _fuse_gate_sequence(algorithm_steps: List[Dict[str, Any]]) -> Dict[int, Tuple[int, Tuple[str, ...]]]:
+        """Find runs of chained single-qubit gates that can execute as one unitary
+        
+        Maps the index of each run's first step to (index of last step, gate names).
+        A run only continues while the intermediate result is read by the next
+        gate alone, so skipping its materialization is unobservable.
+        """
+        def only_read_by_next(k: int) -> bool:
+            var = algorithm_steps[k].get('output_var')
+            if algorithm_steps[k + 1].get('output_var') == var:
+                return True
+            for later in algorithm_steps[k + 2:]:
+                if later.get('input_var') == var:
+                    return False
+                if later.get('output_var') == var:
+                    break
+            return True
+        
+        groups = {}
+        n = len(algorithm_steps)
+        i = 0
+        while i < n:
+            end = i
+            if algorithm_steps[i]['operation'] in _GATE_MATRIX:
+                while (end + 1 < n and
+                       algorithm_steps[end + 1]['operation'] in _GATE_MATRIX and
+                       algorithm_steps[end + 1].get('input_var') == algorithm_steps[end].get('output_var') and
+                       only_read_by_next(end)):
+                    end += 1
+            if end > i:
+                groups[i] = (end, tuple(step['operation'] for step in algorithm_steps[i:end + 1]))
+            i = end + 1
+        return groups
     
     async def verify_quantum_algorithm(self, algorithm_steps: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Verify complete quantum algorithm with type safety"""
@@ -585,16 +866,26 @@ class QuantumClassicalInterface:
         # Extract function names for verification
         function_names = [step['operation'] for step in algorithm_steps]
         
-        # Verify function chain
-        chain_valid, error_msg = self.type_checker.verify_chain(function_names)
+        # Verify function chain along the data flow: each read is checked against its writer
+        last_writer = {}
+        edges = []
+        for i, step in enumerate(algorithm_steps):
+            src = last_writer.get(step.get('input_var'))
+            if src is not None:
+                edges.append((src, i))
+            if step.get('output_var') is not None:
+                last_writer[step['output_var']] = i
+        chain_valid, error_msg = self.type_checker.verify_chain(function_names, edges)
         
         if not chain_valid:
             verification_result['algorithm_valid'] = False
             verification_result['type_errors'].append(error_msg)
             return verification_result
         
-        # Simulate algorithm execution with verification
+        # Simulate algorithm execution with verification; each variable holds its own value
         current_values = {}
+        fused_groups = self._fuse_gate_sequence(algorithm_steps)
+        fused_until, fused_outputs = -1, []
         
         for i, step in enumerate(algorithm_steps):
             step_result = {
@@ -605,23 +896,37 @@ class QuantumClassicalInterface:
                 'verification_passed': True
             }
             
+            if i <= fused_until:
+                # Already applied as part of the fused unitary at the head of this run
+                step_result['outputs'] = list(fused_outputs)
+                verification_result['execution_trace'].append(step_result)
+                continue
+            
             try:
                 # Simulate step execution (simplified)
-                if step['operation'] == 'prepare_qubit':
+                if i in fused_groups:
+                    end, ops = fused_groups[i]
+                    quantum_input = current_values[step['input_var']]
+                    quantum_output = self._safe_unitary_sync(quantum_input, _fused_unitary(ops))
+                    current_values[algorithm_steps[end]['output_var']] = quantum_output
+                    step_result['outputs'] = [quantum_output.data_type.name]
+                    fused_until, fused_outputs = end, step_result['outputs']
+                
+                elif step['operation'] == 'prepare_qubit':
                     classical_input = ClassicalValue(step['inputs'][0], DataType.CLASSICAL_BIT)
-                    quantum_output = await self.safe_state_preparation(classical_input)
+                    quantum_output = self._safe_state_preparation_sync(classical_input)
                     current_values[step['output_var']] = quantum_output
                     step_result['outputs'] = [quantum_output.data_type.name]
                 
-                elif step['operation'] in ['pauli_x', 'pauli_y', 'pauli_z', 'hadamard']:
+                elif step['operation'] in _GATE_MATRIX:
                     quantum_input = current_values[step['input_var']]
-                    quantum_output = await self.safe_quantum_operation(quantum_input, step['operation'])
+                    quantum_output = self._safe_quantum_operation_sync(quantum_input, step['operation'])
                     current_values[step['output_var']] = quantum_output
                     step_result['outputs'] = [quantum_output.data_type.name]
                 
                 elif step['operation'] == 'measure_qubit':
                     quantum_input = current_values[step['input_var']]
-                    classical_output = await self.safe_measurement(quantum_input)
+                    classical_output = self._safe_measurement_sync(quantum_input)
                     current_values[step['output_var']] = classical_output
                     step_result['outputs'] = [classical_output.data_type.name]
                 
@@ -638,14 +943,12 @@ class QuantumClassicalInterface:
     def get_interface_statistics(self) -> Dict[str, Any]:
         """Get statistics about quantum-classical interface usage"""
         
+        stats = self.type_checker._stats
         return {
             'registered_functions': len(self.type_checker.type_rules),
-            'quantum_operations': len([f for f, sig in self.type_checker.type_rules.items() 
-                                     if any(t.name.startswith('QUANTUM') for t in sig.input_types)]),
-            'classical_operations': len([f for f, sig in self.type_checker.type_rules.items() 
-                                       if any(t.name.startswith('CLASSICAL') for t in sig.input_types)]),
-            'interface_operations': len([f for f, sig in self.type_checker.type_rules.items() 
-                                       if 'measurement' in sig.side_effects or 'preparation' in sig.side_effects])
+            'quantum_operations': stats['quantum'],
+            'classical_operations': stats['classical'],
+            'interface_operations': stats['interface']
         }
 
 # Example usage
@@ -682,7 +985,7 @@ async def example_quantum_classical_interface():
     verification_result = await interface.verify_quantum_algorithm(algorithm_steps)
     
     print("Algorithm verification result:")
-    print(json.dumps(verification_result, indent=2, default=str))
+    print(_json_dumps(verification_result))
     
     # Print interface statistics
     stats = interface.get_interface_statistics()
@@ -4,26 +4,86 @@ Implements VQCs with careful tuning of cost functions on complex vector spaces
 """
 
 import numpy as np
-import torch
-import torch.nn as nn
-import torch.optim as optim
 from typing import List, Dict, Tuple, Optional, Any, Callable, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
 import logging
+import os
+import sys
+import threading
 import time
 import json
+import warnings
 from abc import ABC, abstractmethod
 import matplotlib.pyplot as plt
 from scipy.optimize import minimize
 import pennylane as qml
 from pennylane import numpy as pnp
+from pennylane.devices import ExecutionConfig
 import redis
 import pickle
+import zlib
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache, partial
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import jax
+    import jax.numpy as jnp
+    import optax
+    jax.config.update("jax_enable_x64", True)
+    JAX_AVAILABLE = True
+except ImportError:
+    JAX_AVAILABLE = False
+
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = True
+except ImportError:
+    CUPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+TRAINING_RESULT_TTL = 3600
+GPU_MIN_QUBITS = 10
+NATIVE_MAX_QUBITS = 8
+NATIVE_MAX_AMPLITUDES = 1 << 22  # bounds the (rows, 2^n) state block simulated at once
+GPU_MIN_BATCH_ROWS = 10_000  # below this, kernel launch and transfer cost more than the CPU paths
+PREDICTION_CACHE_SIZE = 32  # (parameters, data) pairs memoized per model
+ENCODING_CACHE_SIZE = 8  # encoded batches kept per simulator: train/validation/test sets of a few models
+MAX_CONCURRENT_TRAININGS = 2  # fits the service runs at once on its training threads
+
+ROTATION_GATES = {"rx": qml.RX, "ry": qml.RY, "rz": qml.RZ}
+ENTANGLING_GATES = {"cx": qml.CNOT, "cnot": qml.CNOT, "cz": qml.CZ, "iswap": qml.ISWAP}
+
+# Merges each run of single-qubit rotations into one qml.Rot and drops cancelling pairs
+SINGLE_QUBIT_FUSION_PIPELINE = [
+    partial(qml.transforms.commute_controlled, direction='left'),
+    qml.transforms.single_qubit_fusion,
+    qml.transforms.cancel_inverses,
+]
+
 class OptimizationMethod(Enum):
     """Optimization methods for VQC training"""
     ADAM = "adam"
@@ -52,6 +112,10 @@ class VQCParameters:
     entangling_gates: List[str] = field(default_factory=lambda: ["cx"])
     rotation_gates: List[str] = field(default_factory=lambda: ["ry", "rz"])
     parameter_initialization: str = "random"  # random, zeros, pi_half
+    device_name: str = "auto"  # auto, native, or a PennyLane device such as lightning.qubit
+    fuse_single_qubit_gates: bool = False  # pays off once state-vector passes outweigh transform overhead
+    inference_dtype: str = "fp64"  # fp64, fp32, int8
+    dtype: str = "complex64"  # native simulator state precision: complex64 or complex128
     
 @dataclass
 class TrainingConfig:
@@ -63,14 +127,16 @@ class TrainingConfig:
     batch_size: int = 32
     validation_split: float = 0.2
     early_stopping_patience: int = 50
+    use_jax_jit: bool = False  # compile ADAM/gradient-descent steps with jax.jit
     
 @dataclass
 class CostFunction:
     """Cost function specification for VQC optimization"""
     name: str
     function: Callable
-    gradient_method: str = "auto"  # auto, finite_diff, parameter_shift
+    gradient_method: str = "auto"  # auto, adjoint, finite_diff, parameter_shift
     regularization_weight: float = 0.0
+    function_vec: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None  # (..., N, Q) -> (..., N)
     
 class QuantumFeatureMap(ABC):
     """Abstract base class for quantum feature maps"""
@@ -85,30 +151,25 @@ class AngleEmbedding(QuantumFeatureMap):
     
     def encode(self, classical_data: np.ndarray, qubits: List[int]) -> None:
         """Encode data as rotation angles"""
+        # Features sit on the last axis so a leading batch axis broadcasts
         for i, qubit in enumerate(qubits):
-            if i < len(classical_data):
-                qml.RY(classical_data[i], wires=qubit)
+            if i < classical_data.shape[-1]:
+                qml.RY(classical_data[..., i], wires=qubit)
 
 class AmplitudeEmbedding(QuantumFeatureMap):
     """Amplitude embedding feature map"""
     
     def encode(self, classical_data: np.ndarray, qubits: List[int]) -> None:
         """Encode data as quantum state amplitudes"""
-        # Normalize data for valid quantum state
-        normalized_data = classical_data / np.linalg.norm(classical_data)
-        
-        # Pad to power of 2 if necessary
-        n_qubits = len(qubits)
-        required_length = 2**n_qubits
+        required_length = 2**len(qubits)
+        num_features = classical_data.shape[-1]
         
-        if len(normalized_data) < required_length:
-            padded_data = np.zeros(required_length)
-            padded_data[:len(normalized_data)] = normalized_data
-            normalized_data = padded_data
-        elif len(normalized_data) > required_length:
-            normalized_data = normalized_data[:required_length]
+        # Truncation is a view; padding and the single normalization happen inside PennyLane
+        if num_features > required_length:
+            classical_data = classical_data[..., :required_length]
         
-        qml.AmplitudeEmbedding(normalized_data, wires=qubits, normalize=True)
+        qml.AmplitudeEmbedding(classical_data, wires=qubits, normalize=True,
+                               pad_with=0.0 if num_features < required_length else None)
 
 class IQPEmbedding(QuantumFeatureMap):
     """Instantaneous Quantum Polynomial (IQP) embedding"""
@@ -120,18 +181,679 @@ class IQPEmbedding(QuantumFeatureMap):
             qml.Hadamard(wires=qubit)
         
         # Data encoding with Z rotations
+        num_features = classical_data.shape[-1]
         for i, qubit in enumerate(qubits):
-            if i < len(classical_data):
-                qml.RZ(classical_data[i], wires=qubit)
+            if i < num_features:
+                qml.RZ(classical_data[..., i], wires=qubit)
         
         # Entangling layer
         for i in range(len(qubits) - 1):
             qml.CNOT(wires=[qubits[i], qubits[i + 1]])
-            if i < len(classical_data):
-                qml.RZ(classical_data[i] * classical_data[(i + 1) % len(classical_data)], 
+            if i < num_features:
+                qml.RZ(classical_data[..., i] * classical_data[..., (i + 1) % num_features], 
                        wires=qubits[i + 1])
             qml.CNOT(wires=[qubits[i], qubits[i + 1]])
 
+def _array_digest(array: np.ndarray) -> int:
+    """Fast content hash of an array's bytes"""
+    buffer = np.ascontiguousarray(array)
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh64(buffer).intdigest()
+    return int.from_bytes(hashlib.blake2b(buffer, digest_size=8).digest(), 'little')
+
+def _host_array(array: np.ndarray, dtype: Optional[type] = None) -> np.ndarray:
+    """C-contiguous copy of an array, in page-locked memory when CuPy is available"""
+    array = np.asarray(array, dtype=dtype)
+    if not CUPY_AVAILABLE:
+        return np.ascontiguousarray(array)
+    
+    # Pinned host buffers let device uploads run as asynchronous DMA instead of staging through pageable memory
+    memory = cp.cuda.alloc_pinned_memory(array.nbytes)
+    pinned = np.frombuffer(memory, dtype=array.dtype, count=array.size).reshape(array.shape)
+    pinned[...] = array
+    return pinned
+
+@lru_cache(maxsize=1)
+def _lightning_gpu_available() -> bool:
+    """Whether lightning.gpu is installed and can reach a CUDA device"""
+    try:
+        qml.device("lightning.gpu", wires=1)
+        return True
+    except Exception:
+        return False
+
+def _select_device_name(device_name: str, num_qubits: int, native_supported: bool) -> str:
+    """Resolve 'auto' to a concrete simulator for the circuit width"""
+    if device_name == "native" and not native_supported:
+        raise ValueError("The native simulator only supports AngleEmbedding feature maps")
+    if device_name != "auto":
+        return device_name
+    if native_supported and num_qubits <= NATIVE_MAX_QUBITS:
+        return "native"
+    if num_qubits >= GPU_MIN_QUBITS and _lightning_gpu_available():
+        return "lightning.gpu"
+    return "lightning.qubit"
+
+@lru_cache(maxsize=128)
+def _build_gate_sequence(num_qubits: int, num_layers: int,
+                         rotation_gates: Tuple[str, ...],
+                         entangling_gates: Tuple[str, ...]) -> Tuple[Tuple[Callable, Tuple[int, ...], Optional[int]], ...]:
+    """Resolve the layer layout into (gate class, wires, parameter index) triples"""
+    sequence = []
+    param_idx = 0
+    
+    for layer in range(num_layers):
+        # Rotation gates; unknown names still consume a parameter slot
+        for qubit in range(num_qubits):
+            for gate_type in rotation_gates:
+                if gate_type in ROTATION_GATES:
+                    sequence.append((ROTATION_GATES[gate_type], (qubit,), param_idx))
+                param_idx += 1
+        
+        # Entangling gates
+        for i in range(num_qubits - 1):
+            for gate_type in entangling_gates:
+                if gate_type in ENTANGLING_GATES:
+                    sequence.append((ENTANGLING_GATES[gate_type], (i, i + 1), None))
+    
+    return tuple(sequence)
+
+@lru_cache(maxsize=128)
+def _build_circuit_fn(num_qubits: int, gate_sequence: Tuple, feature_map_cls: type) -> Callable:
+    """Circuit function shared by every model with the same layout and feature map"""
+    # Feature maps carry no configuration, so one instance serves every model
+    feature_map = feature_map_cls()
+    wires = list(range(num_qubits))
+    
+    def circuit(params, classical_input=None):
+        # Feature map encoding
+        if classical_input is not None:
+            feature_map.encode(classical_input, wires)
+        
+        # Variational layers
+        for gate_cls, gate_wires, param_idx in gate_sequence:
+            if param_idx is None:
+                gate_cls(wires=gate_wires)
+            else:
+                gate_cls(params[..., param_idx], wires=gate_wires)
+        
+        # Return expectation values for classification/regression
+        return [qml.expval(qml.PauliZ(i)) for i in wires]
+    
+    return circuit
+
+# Gate kinds understood by the compiled simulator; runs of rotations on one wire are fused into a single unitary
+_KIND_RX, _KIND_RY, _KIND_RZ, _KIND_TABLE, _KIND_UNITARY = 0, 1, 2, 3, 4
+_ROTATION_KINDS = {qml.RX: _KIND_RX, qml.RY: _KIND_RY, qml.RZ: _KIND_RZ}
+
+if NUMBA_AVAILABLE:
+    # Serial and GIL-free: the service calls this from worker threads, where a parallel=True
+    # kernel hangs TBB at exit and aborts workqueue when two fits overlap; the training pool
+    # overlaps fits instead
+    @njit(fastmath=True, cache=True, nogil=True)
+    def _simulate_numba(unitaries, unitary_rows, initial_states, sample_index, num_qubits, op_kinds, op_bitmasks,
+                        op_index, perms, phases, z_signs):
+        """One state vector per row: start from its encoded sample, apply the fused program, return <Z_q>"""
+        num_rows = sample_index.shape[0]
+        dim = 1 << num_qubits
+        out = np.empty((num_rows, num_qubits))
+        
+        # Arithmetic stays in the precision of the state and unitary tables
+        for row in range(num_rows):
+            state = initial_states[sample_index[row]].copy()
+            scratch = np.empty_like(state)
+            u = unitary_rows[row]
+            
+            for g in range(op_kinds.shape[0]):
+                index = op_index[g]
+                if op_kinds[g] == _KIND_TABLE:
+                    for i in range(dim):
+                        scratch[i] = phases[index, i] * state[perms[index, i]]
+                    state, scratch = scratch, state
+                    continue
+                
+                u00 = unitaries[u, index, 0, 0]
+                u01 = unitaries[u, index, 0, 1]
+                u10 = unitaries[u, index, 1, 0]
+                u11 = unitaries[u, index, 1, 1]
+                mask = op_bitmasks[g]
+                for i in range(dim):
+                    if i & mask == 0:
+                        a = state[i]
+                        b = state[i | mask]
+                        state[i] = u00 * a + u01 * b
+                        state[i | mask] = u10 * a + u11 * b
+            
+            for q in range(num_qubits):
+                total = 0.0
+                for i in range(dim):
+                    total += (state[i].real**2 + state[i].imag**2) * z_signs[i, q]
+                out[row, q] = total
+        
+        return out
+    
+    @njit(fastmath=True, cache=True, nogil=True)
+    def _adam_step_inplace(theta, m, v, g, lr, beta1, beta2, eps, t):
+        """Fused ADAM update of theta, m and v in a single pass"""
+        bias1 = 1.0 - beta1**t
+        bias2 = 1.0 - beta2**t
+        for i in range(theta.shape[0]):
+            m[i] = beta1 * m[i] + (1.0 - beta1) * g[i]
+            v[i] = beta2 * v[i] + (1.0 - beta2) * g[i] * g[i]
+            theta[i] -= lr * (m[i] / bias1) / (np.sqrt(v[i] / bias2) + eps)
+    
+    @njit(cache=True, nogil=True)
+    def _classification_counts(y_true, y_pred):
+        """Single pass over the labels: (correct, tp, tn, fp, fn) with class 1 as positive"""
+        correct = tp = tn = fp = fn = 0
+        for i in range(y_true.shape[0]):
+            t, p = y_true[i], y_pred[i]
+            correct += t == p
+            tp += (p == 1) & (t == 1)
+            tn += (p == 0) & (t == 0)
+            fp += (p == 1) & (t == 0)
+            fn += (p == 0) & (t == 1)
+        return correct, tp, tn, fp, fn
+    
+    @njit(cache=True, nogil=True)
+    def _regression_sums(y_true, y_pred):
+        """Single pass over the residuals: (squared error, absolute error, total sum of squares)"""
+        sq_err = abs_err = mean = ss_tot = 0.0
+        for i in range(y_true.shape[0]):
+            residual = y_pred[i] - y_true[i]
+            sq_err += residual * residual
+            abs_err += abs(residual)
+            
+            # Welford update keeps the spread of y_true exact without a second pass for its mean
+            delta = y_true[i] - mean
+            mean += delta / (i + 1)
+            ss_tot += delta * (y_true[i] - mean)
+        return sq_err, abs_err, ss_tot
+
+# One thread per amplitude, several state vectors per block held in shared memory
+_GPU_FORWARD_SOURCE = r'''
+#include <cupy/complex.cuh>
+typedef REAL real_t;
+
+extern "C" __global__
+void vqc_forward(const complex<real_t>* initial_states, const long long* sample_index,
+                 const complex<real_t>* unitaries, const long long* unitary_rows, const long long* op_kinds,
+                 const long long* op_bitmasks, const long long* op_index, const long long* perms,
+                 const complex<real_t>* phases,
+                 const real_t* z_signs, real_t* out,
+                 int num_rows, int num_ops, int num_runs, int dim, int num_qubits)
+{
+    extern __shared__ unsigned char shared[];
+    complex<real_t>* block_states = reinterpret_cast<complex<real_t>*>(shared);
+    const int rows_per_block = blockDim.x / dim;
+    const int local_row = threadIdx.x / dim;
+    const int k = threadIdx.x % dim;
+    const long long row = (long long)blockIdx.x * rows_per_block + local_row;
+    const bool active = local_row < rows_per_block && row < num_rows;
+    complex<real_t>* state = block_states + local_row * dim;
+
+    if (active) state[k] = initial_states[sample_index[row] * dim + k];
+    __syncthreads();
+
+    for (int g = 0; g < num_ops; ++g) {
+        complex<real_t> value;
+        if (active) {
+            if (op_kinds[g] == 3) {
+                const long long t = op_index[g] * dim + k;
+                value = phases[t] * state[perms[t]];
+            } else {
+                const complex<real_t>* u = unitaries + (unitary_rows[row] * num_runs + op_index[g]) * 4;
+                const bool upper = (k & op_bitmasks[g]) != 0;
+                const complex<real_t> own = state[k], partner = state[k ^ op_bitmasks[g]];
+                value = upper ? u[2] * partner + u[3] * own : u[0] * own + u[1] * partner;
+            }
+        }
+        __syncthreads();
+        if (active) state[k] = value;
+        __syncthreads();
+    }
+
+    if (active) {
+        const real_t probability = norm(state[k]);
+        for (int q = 0; q < num_qubits; ++q)
+            atomicAdd(&out[row * num_qubits + q], probability * z_signs[k * num_qubits + q]);
+    }
+}
+'''
+
+@lru_cache(maxsize=2)
+def _gpu_forward_kernel(real_type: str):
+    """Compile the batched forward kernel for float or double state vectors"""
+    return cp.RawKernel(_GPU_FORWARD_SOURCE.replace('REAL', real_type), 'vqc_forward')
+
+def _entangler_table(gate_cls: type, wires: Tuple[int, int], num_qubits: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Basis permutation and phases so that new[i] = phase[i] * old[perm[i]]"""
+    index = np.arange(1 << num_qubits)
+    control_mask = 1 << (num_qubits - 1 - wires[0])
+    target_mask = 1 << (num_qubits - 1 - wires[1])
+    control_set = (index & control_mask) != 0
+    target_set = (index & target_mask) != 0
+    
+    if gate_cls is qml.CNOT:
+        return np.where(control_set, index ^ target_mask, index), np.ones(len(index))
+    if gate_cls is qml.CZ:
+        return index, np.where(control_set & target_set, -1.0, 1.0)
+    
+    # ISWAP swaps |01> and |10> with a factor of i
+    differs = control_set != target_set
+    return np.where(differs, index ^ control_mask ^ target_mask, index), np.where(differs, 1j, 1.0)
+
+@lru_cache(maxsize=128)
+def _codegen_simulator(num_qubits: int, gate_sequence: Tuple) -> Callable:
+    """Compile a loop-free NumPy simulator specialised to one gate layout, starting from encoded states"""
+    tables = _precompute_circuit(num_qubits, gate_sequence)
+    dim = 1 << num_qubits
+    lines = [
+        "def simulate(unitaries, state, perms, phases):",
+        "    rows = state.shape[0]",
+    ]
+    
+    for kind, wire, index in zip(tables.op_kinds, tables.op_wires, tables.op_index):
+        if kind == _KIND_TABLE:
+            # Pure permutations (CNOT) and pure phases (CZ) drop the other half of the update
+            if np.all(tables.phases[index] == 1):
+                lines.append(f"    state = state[:, perms[{index}]]")
+            elif np.array_equal(tables.perms[index], np.arange(dim)):
+                lines.append(f"    state = state * phases[{index}]")
+            else:
+                lines.append(f"    state = state[:, perms[{index}]] * phases[{index}]")
+            continue
+        
+        lines += [
+            f"    u = unitaries[:, {index}, :, :, None, None]",
+            f"    blocks = state.reshape(rows, {1 << wire}, 2, {dim >> (wire + 1)})",
+            "    a, b = blocks[:, :, 0], blocks[:, :, 1]",
+            "    pair = (u[:, 0, 0] * a + u[:, 0, 1] * b, u[:, 1, 0] * a + u[:, 1, 1] * b)",
+            f"    state = np.stack(pair, axis=2).reshape(rows, {dim})",
+        ]
+    
+    lines.append("    return state")
+    
+    namespace = {"np": np}
+    exec(compile("\n".join(lines), f"<vqc simulator {num_qubits}q/{len(gate_sequence)}g>", "exec"), namespace)
+    return namespace["simulate"]
+
+@dataclass(frozen=True)
+class _PrecomputedCircuit:
+    """Angle-independent simulator tables for one (num_qubits, gate_sequence) layout"""
+    rotation_kinds: np.ndarray   # (R,) _KIND_RX/RY/RZ of every rotation, in gate order
+    rotation_params: np.ndarray  # (R,) parameter slot of every rotation
+    run_members: np.ndarray      # (U, L) rotations fused into each run in application order, padded with R
+    op_kinds: np.ndarray         # (O,) _KIND_UNITARY or _KIND_TABLE for each step of the fused program
+    op_wires: np.ndarray         # (O,) target wire of each fused unitary (first wire for entanglers)
+    op_bitmasks: np.ndarray      # (O,) basis-index bit of op_wires
+    op_index: np.ndarray         # (O,) run index for unitaries, perms/phases row for entanglers
+    perms: np.ndarray            # (E, 2^n) entangler basis permutations
+    phases: np.ndarray           # (E, 2^n) entangler phases
+    observable_diag: np.ndarray  # (2^n, Q) Z eigenvalue of every basis state on every wire
+
+@lru_cache(maxsize=128)
+def _precompute_circuit(num_qubits: int, gate_sequence: Tuple) -> _PrecomputedCircuit:
+    """Build the read-only tables once per layout, shared by every model that uses it"""
+    dim = 1 << num_qubits
+    rotation_kinds, rotation_params, entanglers = [], [], []
+    runs: List[List[int]] = []
+    open_runs: Dict[int, int] = {}
+    op_kinds, op_wires, op_index = [], [], []
+    
+    for gate_cls, wires, param_idx in gate_sequence:
+        if param_idx is None:
+            entanglers.append(_entangler_table(gate_cls, wires, num_qubits))
+            op_kinds.append(_KIND_TABLE)
+            op_wires.append(wires[0])
+            op_index.append(len(entanglers) - 1)
+            for wire in wires:
+                open_runs.pop(wire, None)
+            continue
+        
+        # A rotation joins the open run on its wire: gates in between act on other wires and commute with it
+        rotation_kinds.append(_ROTATION_KINDS[gate_cls])
+        rotation_params.append(param_idx)
+        wire = wires[0]
+        if wire in open_runs:
+            runs[open_runs[wire]].append(len(rotation_kinds) - 1)
+        else:
+            open_runs[wire] = len(runs)
+            runs.append([len(rotation_kinds) - 1])
+            op_kinds.append(_KIND_UNITARY)
+            op_wires.append(wire)
+            op_index.append(open_runs[wire])
+    
+    run_members = np.full((len(runs), max(map(len, runs), default=0)), len(rotation_kinds), dtype=np.int64)
+    for run, members in enumerate(runs):
+        run_members[run, :len(members)] = members
+    
+    index = np.arange(dim)[:, None]
+    shifts = num_qubits - 1 - np.arange(num_qubits)
+    op_wires = np.array(op_wires, dtype=np.int64)
+    
+    tables = _PrecomputedCircuit(
+        rotation_kinds=np.array(rotation_kinds, dtype=np.int64),
+        rotation_params=np.array(rotation_params, dtype=np.int64),
+        run_members=run_members,
+        op_kinds=np.array(op_kinds, dtype=np.int64),
+        op_wires=op_wires,
+        op_bitmasks=np.left_shift(1, num_qubits - 1 - op_wires),
+        op_index=np.array(op_index, dtype=np.int64),
+        perms=np.array([perm for perm, _ in entanglers], dtype=np.int64).reshape(-1, dim),
+        phases=np.array([phase for _, phase in entanglers], dtype=np.complex128).reshape(-1, dim),
+        observable_diag=1.0 - 2.0 * ((index >> shifts) & 1),
+    )
+    for name in tables.__dataclass_fields__:
+        getattr(tables, name).setflags(write=False)
+    return tables
+
+@lru_cache(maxsize=32)
+def _worker_circuit(num_qubits: int, gate_sequence: Tuple, dtype: type) -> '_StateVectorCircuit':
+    """Simulator rebuilt once per worker process and layout"""
+    return _StateVectorCircuit(num_qubits, gate_sequence, dtype)
+
+def _shifted_block(num_qubits: int, gate_sequence: Tuple, dtype: type, shm_name: str,
+                   states_shape: Tuple[int, int], params: np.ndarray,
+                   shifts: List[Tuple[int, int]]) -> np.ndarray:
+    """Worker task: (S, N, Q) expectation values under each (parameter index, sign) shift"""
+    circuit = _worker_circuit(num_qubits, gate_sequence, dtype)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        states = np.ndarray(states_shape, dtype=dtype, buffer=shm.buf)
+        params_batch = np.repeat(params[None, :], len(shifts), axis=0)
+        for k, (j, sign) in enumerate(shifts):
+            params_batch[k, j] += sign * np.pi / 2
+        
+        num_samples = states_shape[0]
+        outputs = circuit._evolve(np.repeat(params_batch, num_samples, axis=0), states,
+                                  np.tile(np.arange(num_samples), len(shifts)))
+        return outputs.reshape(len(shifts), num_samples, -1)
+    finally:
+        del states
+        shm.close()
+
+class _StateVectorCircuit:
+    """Batched NumPy state-vector simulator for angle-embedded variational circuits"""
+    
+    def __init__(self, num_qubits: int, gate_sequence: Tuple, dtype: type = np.complex128):
+        self.num_qubits = num_qubits
+        self.gate_sequence = gate_sequence
+        self.dtype = np.dtype(dtype).type
+        self.real_dtype = np.float32 if self.dtype == np.complex64 else np.float64
+        self.tables = _precompute_circuit(num_qubits, gate_sequence)
+        self._phases = self.tables.phases.astype(self.dtype)
+        self._generated = _codegen_simulator(num_qubits, gate_sequence)
+        self._encodings: 'OrderedDict[Tuple, Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+        # Guards the per-encoding caches; models of one layout share a simulator across fit threads
+        self._encoding_lock = threading.Lock()
+        
+        # Optional process pool for parameter-shift batches when the Numba kernel is unavailable
+        self.executor: Optional[Executor] = None
+        # id(encoded batch) -> [shared memory, batch, calls using it]
+        self._shared: 'OrderedDict[int, list]' = OrderedDict()
+        self._device_tables = None
+        # id(encoded batch) -> (batch, device copy)
+        self._device_states: 'OrderedDict[int, Tuple[np.ndarray, Any]]' = OrderedDict()
+        self._stream = None
+    
+    def __call__(self, params: np.ndarray, classical_input: np.ndarray = None) -> List[np.ndarray]:
+        """Same calling convention and output layout as the PennyLane QNode"""
+        params = np.asarray(params, dtype=np.float64)
+        X = np.zeros((1, 0)) if classical_input is None else np.asarray(classical_input, dtype=np.float64)
+        unbatched = params.ndim == 1 and X.ndim == 1
+        
+        params, X = np.atleast_2d(params), np.atleast_2d(X)
+        num_rows = max(len(params), len(X))
+        outputs = self._evolve(np.broadcast_to(params, (num_rows, params.shape[-1])), self.encode(X),
+                               np.broadcast_to(np.arange(len(X)), num_rows))
+        
+        return list(outputs[0] if unbatched else outputs.T)
+    
+    def encode(self, X: np.ndarray) -> np.ndarray:
+        """(N, 2^n) RY angle-embedded product states, reused for recently seen batches"""
+        X = np.asarray(X, dtype=np.float64)
+        key = (_array_digest(X), X.shape)
+        with self._encoding_lock:
+            entry = self._encodings.get(key)
+            if entry is not None and np.array_equal(entry[0], X):
+                self._encodings.move_to_end(key)
+                return entry[1]
+        
+        # The embedding is parameter-independent, so the same (N, 2^n) batch serves every training step
+        half = X[:, :self.num_qubits] / 2
+        cos_half, sin_half = np.cos(half), np.sin(half)
+        states = np.ones((len(X), 1))
+        for qubit in range(self.num_qubits):
+            if qubit < half.shape[1]:
+                states = np.einsum('ni,nj->nij', states, np.stack([cos_half[:, qubit], sin_half[:, qubit]], axis=-1))
+            else:
+                states = np.einsum('ni,j->nij', states, [1.0, 0.0])
+            states = states.reshape(len(X), -1)
+        states = _host_array(states, self.dtype)
+        states.setflags(write=False)
+        
+        with self._encoding_lock:
+            self._encodings[key] = (X.copy(), states)
+            if len(self._encodings) > ENCODING_CACHE_SIZE:
+                self._encodings.popitem(last=False)
+        return states
+    
+    def expectations(self, params: np.ndarray, X: np.ndarray) -> np.ndarray:
+        """(B, Q) expectation values for B paired (parameter vector, sample) rows"""
+        return self._evolve(params, self.encode(X), np.arange(len(X)))
+    
+    def _evolve(self, params: np.ndarray, initial_states: np.ndarray, sample_index: np.ndarray) -> np.ndarray:
+        """(B, Q) expectation values for row b run from initial_states[sample_index[b]]"""
+        t = self.tables
+        params = np.asarray(params, dtype=self.real_dtype)
+        
+        # Rows arrive as runs of one parameter vector (broadcast, or np.repeat per shift),
+        # so each run's rotations are fused once and rows index into the result
+        starts = np.flatnonzero(np.r_[len(params) > 0, np.any(params[1:] != params[:-1], axis=1)])
+        unitary_rows = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(params)]))
+        unitaries = self._fused_unitaries(params[starts])
+        
+        if CUPY_AVAILABLE and len(params) >= GPU_MIN_BATCH_ROWS:
+            return self._evolve_gpu(unitaries, unitary_rows, initial_states, sample_index)
+        if NUMBA_AVAILABLE:
+            # The kernel holds one state per row, so the batch needs no blocking
+            return _simulate_numba(unitaries, unitary_rows, initial_states,
+                                   np.ascontiguousarray(sample_index, dtype=np.int64), self.num_qubits,
+                                   t.op_kinds, t.op_bitmasks, t.op_index, t.perms, self._phases, t.observable_diag)
+        
+        rows_per_block = max(1, NATIVE_MAX_AMPLITUDES >> self.num_qubits)
+        return np.concatenate([
+            self._simulate(unitaries[unitary_rows[start:start + rows_per_block]],
+                           initial_states[sample_index[start:start + rows_per_block]])
+            for start in range(0, len(params), rows_per_block)
+        ])
+    
+    def _fused_unitaries(self, params: np.ndarray, dtype: Optional[type] = None) -> np.ndarray:
+        """(B, U, 2, 2) unitary of every fused rotation run, for B parameter rows"""
+        t = self.tables
+        dtype = dtype or self.dtype
+        num_rows, num_runs, run_length = len(params), *t.run_members.shape
+        if run_length == 0:
+            return np.zeros((num_rows, 0, 2, 2), dtype=dtype)
+        
+        # All RX/RY/RZ matrices as one (B, R, 2, 2) stack, then one batched matmul per run position
+        half = params[:, t.rotation_params] * 0.5
+        c, s = np.cos(half), np.sin(half)
+        kinds = t.rotation_kinds
+        off_diagonal = np.where(kinds == _KIND_RX, -1j * s, np.where(kinds == _KIND_RY, -s, 0.0))
+        matrices = np.stack([
+            np.where(kinds == _KIND_RZ, c - 1j * s, c),
+            off_diagonal,
+            np.where(kinds == _KIND_RY, s, off_diagonal),
+            np.where(kinds == _KIND_RZ, c + 1j * s, c),
+        ], axis=-1).reshape(num_rows, len(kinds), 2, 2).astype(dtype)
+        
+        # Index R is the identity that pads runs shorter than the longest one
+        identity = np.broadcast_to(np.eye(2, dtype=dtype), (num_rows, 1, 2, 2))
+        matrices = np.concatenate([matrices, identity], axis=1)
+        fused = matrices[:, t.run_members[:, 0]]
+        for position in range(1, run_length):
+            fused = matrices[:, t.run_members[:, position]] @ fused
+        return fused
+    
+    def predict(self, params: np.ndarray, X: np.ndarray, dtype: Optional[type] = None) -> np.ndarray:
+        """(N, Q) expectation values for one shared parameter vector applied to every row"""
+        t = self.tables
+        dtype = dtype or self.dtype
+        real_dtype = np.float32 if dtype == np.complex64 else np.float64
+        state = self.encode(X).astype(dtype)
+        num_rows, dim = len(state), 1 << self.num_qubits
+        
+        # Every row sees the same gates, so each fused run's matrix is built once
+        matrices = self._fused_unitaries(np.asarray(params, dtype=real_dtype)[None, :], dtype)[0]
+        
+        for kind, wire, index in zip(t.op_kinds, t.op_wires, t.op_index):
+            if kind == _KIND_TABLE:
+                state = state[:, t.perms[index]] * t.phases[index].astype(dtype)
+            else:
+                # (N, 2^n) rows stay contiguous, so the target-qubit split is a free reshape
+                (m00, m01), (m10, m11) = matrices[index]
+                blocks = state.reshape(num_rows << wire, 2, -1)
+                a, b = blocks[:, 0], blocks[:, 1]
+                state = np.stack((m00 * a + m01 * b, m10 * a + m11 * b), axis=1).reshape(num_rows, dim)
+        
+        probabilities = state.real**2 + state.imag**2
+        return probabilities @ t.observable_diag.astype(real_dtype)
+    
+    def jacobian(self, params: np.ndarray, X: np.ndarray) -> np.ndarray:
+        """(Q, N, P) Jacobian from all 2P shifted parameter vectors simulated as one batch"""
+        num_params, num_samples = len(params), len(X)
+        shifts = (np.pi / 2) * np.eye(num_params)
+        params_batch = np.concatenate([params + shifts, params - shifts])
+        
+        states = self.encode(X)
+        if self.executor is not None and not NUMBA_AVAILABLE:
+            outputs = self._parallel_shifts(params, states)
+        else:
+            # Every shifted row starts from the same encoded sample batch
+            outputs = self._evolve(np.repeat(params_batch, num_samples, axis=0), states,
+                                   np.tile(np.arange(num_samples), 2 * num_params))
+            outputs = outputs.reshape(2 * num_params, num_samples, -1)
+        
+        return ((outputs[:num_params] - outputs[num_params:]) / 2).transpose(2, 1, 0)
+    
+    def _evolve_gpu(self, unitaries: np.ndarray, unitary_rows: np.ndarray, initial_states: np.ndarray,
+                    sample_index: np.ndarray) -> np.ndarray:
+        """Run every row in one CUDA launch; tables and the encoded batch stay resident on the device"""
+        t = self.tables
+        if self._stream is None:
+            self._stream = cp.cuda.Stream(non_blocking=True)
+        
+        # Uploads, launch and download share one stream; encoded states are pinned, so their copy is a direct DMA
+        with self._stream:
+            if self._device_tables is None:
+                self._device_tables = {
+                    name: cp.asarray(getattr(t, name))
+                    for name in ('op_kinds', 'op_bitmasks', 'op_index', 'perms')
+                }
+                self._device_tables['phases'] = cp.asarray(self._phases)
+                self._device_tables['z_signs'] = cp.asarray(t.observable_diag, dtype=self.real_dtype)
+            device_states = self._device_copy(initial_states)
+            d = self._device_tables
+            
+            num_rows, dim = len(sample_index), 1 << self.num_qubits
+            rows_per_block = max(1, 256 // dim)
+            out = cp.zeros((num_rows, self.num_qubits), dtype=self.real_dtype)
+            _gpu_forward_kernel('float' if self.real_dtype == np.float32 else 'double')(
+                ((num_rows + rows_per_block - 1) // rows_per_block,), (rows_per_block * dim,),
+                (device_states, cp.asarray(sample_index, dtype=cp.int64),
+                 cp.asarray(unitaries), cp.asarray(unitary_rows, dtype=cp.int64),
+                 d['op_kinds'], d['op_bitmasks'], d['op_index'], d['perms'], d['phases'], d['z_signs'], out,
+                 np.int32(num_rows), np.int32(len(t.op_kinds)), np.int32(len(t.run_members)),
+                 np.int32(dim), np.int32(self.num_qubits)),
+                shared_mem=rows_per_block * dim * np.dtype(self.dtype).itemsize,
+            )
+            outputs = cp.asnumpy(out, stream=self._stream)
+        self._stream.synchronize()
+        return outputs.astype(np.float64)
+    
+    def _device_copy(self, states: np.ndarray):
+        """Device-resident copy of an encoded batch, uploaded once per encoding"""
+        with self._encoding_lock:
+            entry = self._device_states.get(id(states))
+            if entry is not None and entry[0] is states:
+                self._device_states.move_to_end(id(states))
+                return entry[1]
+        
+        device_states = cp.empty(states.shape, dtype=states.dtype)
+        device_states.set(states, stream=self._stream)
+        with self._encoding_lock:
+            self._device_states[id(states)] = (states, device_states)
+            if len(self._device_states) > ENCODING_CACHE_SIZE:
+                self._device_states.popitem(last=False)
+        return device_states
+    
+    def _parallel_shifts(self, params: np.ndarray, states: np.ndarray) -> np.ndarray:
+        """(2P, N, Q) shifted evaluations split by parameter index across the executor's workers"""
+        shm = self._share_states(states)
+        try:
+            num_params = len(params)
+            shifts = [(j, 1) for j in range(num_params)] + [(j, -1) for j in range(num_params)]
+            num_tasks = min(len(shifts), os.cpu_count() or 1)
+            
+            futures = [
+                self.executor.submit(_shifted_block, self.num_qubits, self.gate_sequence, self.dtype,
+                                     shm.name, states.shape, params, [shifts[i] for i in chunk])
+                for chunk in np.array_split(np.arange(len(shifts)), num_tasks)
+            ]
+            return np.concatenate([future.result() for future in futures])
+        finally:
+            self._unshare_states(states)
+    
+    def _share_states(self, states: np.ndarray) -> shared_memory.SharedMemory:
+        """Shared-memory copy of the encoded batch, made once per encoding so tasks only pickle names
+        
+        Each call holds a reference until _unshare_states, so a concurrent fit on the same
+        simulator never unlinks a block whose tasks are still running.
+        """
+        with self._encoding_lock:
+            entry = self._shared.get(id(states))
+            if entry is not None and entry[1] is states:
+                entry[2] += 1
+                self._shared.move_to_end(id(states))
+                return entry[0]
+            
+            shm = shared_memory.SharedMemory(create=True, size=states.nbytes)
+            np.ndarray(states.shape, dtype=states.dtype, buffer=shm.buf)[:] = states
+            self._shared[id(states)] = [shm, states, 1]
+            self._evict_shared()
+            return shm
+    
+    def _unshare_states(self, states: np.ndarray):
+        """Drop one call's reference to the encoded batch's shared-memory copy"""
+        with self._encoding_lock:
+            self._shared[id(states)][2] -= 1
+            self._evict_shared()
+    
+    def _evict_shared(self):
+        """Unlink the least recently used idle blocks beyond ENCODING_CACHE_SIZE; caller holds the lock"""
+        for key in [key for key, (_, _, users) in self._shared.items() if users == 0]:
+            if len(self._shared) <= ENCODING_CACHE_SIZE:
+                break
+            shm, _, _ = self._shared.pop(key)
+            shm.close()
+            shm.unlink()
+    
+    def release_shared_memory(self):
+        """Free the shared-memory copies of encoded batches"""
+        with self._encoding_lock:
+            while self._shared:
+                shm, _, _ = self._shared.popitem()[1]
+                shm.close()
+                shm.unlink()
+    
+    def _simulate(self, unitaries: np.ndarray, initial_states: np.ndarray) -> np.ndarray:
+        """Expectation values for one block of rows, given each row's fused unitaries"""
+        state = self._generated(unitaries, initial_states, self.tables.perms, self._phases)
+        probabilities = state.real**2 + state.imag**2
+        return probabilities @ self.tables.observable_diag
+
 class VariationalQuantumCircuit:
     """Variational Quantum Circuit implementation"""
     
@@ -139,15 +861,36 @@ class VariationalQuantumCircuit:
         self.parameters = parameters
         self.feature_map = feature_map or AngleEmbedding()
         
-        # Initialize quantum device
-        self.device = qml.device('default.qubit', wires=parameters.num_qubits)
+        # Initialize quantum device; the native simulator needs none
+        native_supported = type(self.feature_map) is AngleEmbedding
+        self.device_name = _select_device_name(parameters.device_name, parameters.num_qubits, native_supported)
+        self.is_native = self.device_name == "native"
+        if self.is_native:
+            self.device = None
+            self.supports_adjoint = False
+        else:
+            device_options = {'batch_obs': True} if self.device_name.startswith('lightning') else {}
+            self.device = qml.device(self.device_name, wires=parameters.num_qubits, **device_options)
+            self.supports_adjoint = self.device.supports_derivatives(ExecutionConfig(gradient_method='adjoint'))
         
         # Initialize variational parameters
         self.num_parameters = self._calculate_num_parameters()
         self.variational_params = self._initialize_parameters()
+        self._inference_params = None
+        self._q_params = None
+        self._prediction_cache: 'OrderedDict[Tuple, np.ndarray]' = OrderedDict()
+        self._prediction_lock = threading.Lock()
         
         # Create quantum circuit
-        self.qnode = self._create_circuit()
+        self._gate_sequence = _build_gate_sequence(
+            parameters.num_qubits, parameters.num_layers,
+            tuple(parameters.rotation_gates), tuple(parameters.entangling_gates)
+        )
+        if self.is_native:
+            self.qnode = _StateVectorCircuit(parameters.num_qubits, self._gate_sequence, np.dtype(parameters.dtype))
+        else:
+            self.qnode = self._create_circuit()
+        self.single_precision = self.is_native and self.qnode.dtype == np.complex64
         
     def _calculate_num_parameters(self) -> int:
         """Calculate number of variational parameters"""
@@ -174,41 +917,17 @@ class VariationalQuantumCircuit:
         else:
             return np.random.uniform(0, 2*np.pi, self.num_parameters)
     
-    def _create_circuit(self) -> qml.QNode:
+    def _create_circuit(self, interface: str = 'auto') -> qml.QNode:
         """Create the variational quantum circuit"""
         
-        @qml.qnode(self.device, interface='autograd')
-        def circuit(params, classical_input=None):
-            # Feature map encoding
-            if classical_input is not None:
-                self.feature_map.encode(classical_input, list(range(self.parameters.num_qubits)))
-            
-            # Variational layers
-            param_idx = 0
-            for layer in range(self.parameters.num_layers):
-                # Rotation gates
-                for qubit in range(self.parameters.num_qubits):
-                    for gate_type in self.parameters.rotation_gates:
-                        if gate_type == "rx":
-                            qml.RX(params[param_idx], wires=qubit)
-                        elif gate_type == "ry":
-                            qml.RY(params[param_idx], wires=qubit)
-                        elif gate_type == "rz":
-                            qml.RZ(params[param_idx], wires=qubit)
-                        param_idx += 1
-                
-                # Entangling gates
-                for i in range(self.parameters.num_qubits - 1):
-                    for gate_type in self.parameters.entangling_gates:
-                        if gate_type == "cx" or gate_type == "cnot":
-                            qml.CNOT(wires=[i, i + 1])
-                        elif gate_type == "cz":
-                            qml.CZ(wires=[i, i + 1])
-                        elif gate_type == "iswap":
-                            qml.ISWAP(wires=[i, i + 1])
-            
-            # Return expectation values for classification/regression
-            return [qml.expval(qml.PauliZ(i)) for i in range(self.parameters.num_qubits)]
+        circuit_fn = _build_circuit_fn(self.parameters.num_qubits, self._gate_sequence, type(self.feature_map))
+        circuit = qml.QNode(circuit_fn, self.device, interface=interface,
+                            diff_method='adjoint' if self.supports_adjoint else 'best')
+        
+        if self.parameters.fuse_single_qubit_gates:
+            # single_qubit_fusion cannot handle broadcasted angles, so split batches into tapes first
+            circuit = qml.compile(qml.transforms.broadcast_expand(circuit),
+                                  pipeline=SINGLE_QUBIT_FUSION_PIPELINE)
         
         return circuit
     
@@ -216,9 +935,77 @@ class VariationalQuantumCircuit:
         """Forward pass through VQC"""
         return np.array(self.qnode(self.variational_params, classical_input))
     
+    def forward_batch(self, X: np.ndarray, params: Optional[np.ndarray] = None) -> np.ndarray:
+        """Forward pass for a whole (N, F) batch in one broadcasted QNode call"""
+        params = self.variational_params if params is None else params
+        if self.is_native and not NUMBA_AVAILABLE and np.ndim(params) == 1:
+            # Without the compiled kernel, share the gate matrices across rows;
+            # float32 inference parameters run the simulator in complex64
+            dtype = np.complex64 if params.dtype == np.float32 else self.qnode.dtype
+            return self.qnode.predict(params, X, dtype)
+        return np.stack(self.qnode(params, X), axis=-1)
+    
+    def forward_broadcast(self, params_batch: np.ndarray, X: np.ndarray) -> np.ndarray:
+        """Expectation values for every (parameter set, sample) pair in one QNode call"""
+        num_sets, num_samples = len(params_batch), len(X)
+        
+        # PennyLane broadcasts over a single leading axis, so flatten the (K, N) grid onto it
+        params_flat = np.repeat(params_batch, num_samples, axis=0)
+        X_flat = np.tile(X, (num_sets, 1))
+        outputs = np.stack(self.qnode(params_flat, X_flat), axis=-1)
+        
+        return outputs.reshape(num_sets, num_samples, -1)
+    
     def update_parameters(self, new_params: np.ndarray):
         """Update variational parameters"""
         self.variational_params = new_params.copy()
+        self._inference_params = None
+        self._q_params = None
+        self._prediction_cache.clear()
+    
+    def quantize_parameters(self) -> float:
+        """Snapshot the parameters at inference_dtype, returning the largest angle error"""
+        dtype = self.parameters.inference_dtype
+        if dtype == "fp64":
+            return 0.0
+        
+        self._inference_params = self.variational_params.astype(np.float32)
+        if dtype == "int8":
+            # Expectation values are 2*pi periodic in every angle, so 256 levels span one full turn
+            self._q_scale = 2 * np.pi / 256
+            levels = np.round(self.variational_params / self._q_scale).astype(np.int64)
+            self._q_params = ((levels + 128) % 256 - 128).astype(np.int8)
+        
+        error = self.variational_params - self.inference_parameters()
+        return float(np.max(np.abs((error + np.pi) % (2 * np.pi) - np.pi)))
+    
+    def predict_outputs(self, X: np.ndarray) -> np.ndarray:
+        """forward_batch at the inference parameters, memoized per (parameters, data) pair"""
+        params = self.inference_parameters()
+        X = np.asarray(X)
+        key = (_array_digest(params), _array_digest(X), X.shape, X.dtype.str)
+        
+        with self._prediction_lock:
+            outputs = self._prediction_cache.get(key)
+            if outputs is not None:
+                self._prediction_cache.move_to_end(key)
+                return outputs
+        
+        outputs = self.forward_batch(X, params)
+        outputs.setflags(write=False)
+        with self._prediction_lock:
+            self._prediction_cache[key] = outputs
+            if len(self._prediction_cache) > PREDICTION_CACHE_SIZE:
+                self._prediction_cache.popitem(last=False)
+        return outputs
+    
+    def inference_parameters(self) -> np.ndarray:
+        """Parameters to run predictions with, dequantized into a reused float32 buffer"""
+        if self._inference_params is None:
+            return self.variational_params
+        if self._q_params is not None:
+            np.multiply(self._q_params, self._q_scale, out=self._inference_params, casting='unsafe')
+        return self._inference_params
 
 class VQCOptimizer:
     """Optimizer for Variational Quantum Circuits"""
@@ -226,20 +1013,47 @@ class VQCOptimizer:
     def __init__(self, vqc: VariationalQuantumCircuit, training_config: TrainingConfig):
         self.vqc = vqc
         self.config = training_config
+        self._rng = np.random.default_rng()
         self.training_history = {
-            'loss': [],
-            'validation_loss': [],
-            'parameters': [],
+            'loss': np.empty(0, dtype=np.float32),
+            'validation_loss': np.empty(0, dtype=np.float32),
+            'parameters': np.empty((0, vqc.num_parameters), dtype=np.float32),
             'gradients': []
         }
         
-        # Initialize optimizer based on method
-        if training_config.optimization_method == OptimizationMethod.ADAM:
-            self.torch_optimizer = optim.Adam([torch.tensor(vqc.variational_params, requires_grad=True)], 
-                                            lr=training_config.learning_rate)
-        elif training_config.optimization_method == OptimizationMethod.GRADIENT_DESCENT:
-            self.torch_optimizer = optim.SGD([torch.tensor(vqc.variational_params, requires_grad=True)], 
-                                           lr=training_config.learning_rate)
+        # Adam moment estimates, kept as plain arrays next to the parameters
+        self._adam_m = np.zeros(vqc.num_parameters)
+        self._adam_v = np.zeros(vqc.num_parameters)
+        self._adam_t = 0
+    
+    def _gradient_step(self, parameters: np.ndarray, gradient: np.ndarray) -> np.ndarray:
+        """Apply one ADAM or plain gradient-descent update"""
+        lr = self.config.learning_rate
+        if self.config.optimization_method != OptimizationMethod.ADAM:
+            return parameters - lr * gradient
+        
+        # Gradients that should vanish carry ~1e-8 of float32 noise; a larger eps keeps
+        # ADAM from normalising that noise into full-size steps
+        beta1, beta2 = 0.9, 0.999
+        eps = 1e-6 if self.vqc.single_precision else 1e-8
+        self._adam_t += 1
+        theta = np.array(parameters, dtype=np.float64)
+        gradient = np.asarray(gradient, dtype=np.float64)
+        
+        if NUMBA_AVAILABLE:
+            _adam_step_inplace(theta, self._adam_m, self._adam_v, gradient, lr, beta1, beta2, eps, self._adam_t)
+            return theta
+        
+        # Same update with in-place NumPy ops on the moment buffers
+        self._adam_m *= beta1
+        self._adam_m += (1 - beta1) * gradient
+        self._adam_v *= beta2
+        self._adam_v += (1 - beta2) * gradient * gradient
+        step = self._adam_m / (1 - beta1**self._adam_t)
+        step /= np.sqrt(self._adam_v / (1 - beta2**self._adam_t)) + eps
+        theta -= lr * step
+        
+        return theta
     
     def compute_cost_function(self, parameters: np.ndarray, 
                             X: np.ndarray, y: np.ndarray, 
@@ -247,69 +1061,174 @@ class VQCOptimizer:
         """Compute cost function value"""
         self.vqc.update_parameters(parameters)
         
-        total_cost = 0.0
-        batch_size = min(self.config.batch_size, len(X))
+        predictions = self.vqc.forward_batch(X)
+        sample_costs = self._sample_costs(predictions, y, cost_function)
         
-        for i in range(0, len(X), batch_size):
-            batch_X = X[i:i+batch_size]
-            batch_y = y[i:i+batch_size]
-            
-            batch_cost = 0.0
-            for x, target in zip(batch_X, batch_y):
-                prediction = self.vqc.forward(x)
-                batch_cost += cost_function.function(prediction, target)
-            
-            total_cost += batch_cost / len(batch_X)
+        return float(self._aggregate_costs(sample_costs, parameters, cost_function))
+    
+    def _sample_costs(self, predictions: np.ndarray, y: np.ndarray,
+                      cost_function: CostFunction) -> np.ndarray:
+        """Per-sample costs for (..., N, Q) predictions"""
+        if cost_function.function_vec is not None:
+            return cost_function.function_vec(predictions, y)
+        
+        warnings.warn(f"Cost function {cost_function.name} has no function_vec; the per-sample "
+                      "path is deprecated and will be removed", DeprecationWarning, stacklevel=2)
+        flat = predictions.reshape(-1, *predictions.shape[-2:])
+        costs = [[cost_function.function(prediction, target) for prediction, target in zip(outputs, y)]
+                 for outputs in flat]
+        return np.array(costs).reshape(predictions.shape[:-1])
+    
+    def _aggregate_costs(self, sample_costs: np.ndarray, parameters: np.ndarray,
+                         cost_function: CostFunction) -> np.ndarray:
+        """Reduce (K, N) per-sample costs the same way compute_cost_function does"""
+        num_samples = sample_costs.shape[-1]
+        batch_size = min(self.config.batch_size, num_samples)
+        starts = np.arange(0, num_samples, batch_size)
+        counts = np.diff(np.append(starts, num_samples))
         
-        # Add regularization
+        # Sum of minibatch means, plus regularization, over the number of minibatches
+        total_cost = np.sum(np.add.reduceat(sample_costs, starts, axis=-1) / counts, axis=-1)
         if cost_function.regularization_weight > 0:
-            regularization = cost_function.regularization_weight * np.sum(parameters**2)
-            total_cost += regularization
+            total_cost = total_cost + cost_function.regularization_weight * np.sum(parameters**2, axis=-1)
         
-        return total_cost / (len(X) // batch_size + (1 if len(X) % batch_size > 0 else 0))
+        return total_cost / len(starts)
     
     def compute_gradient(self, parameters: np.ndarray, 
                         X: np.ndarray, y: np.ndarray, 
                         cost_function: CostFunction) -> np.ndarray:
         """Compute gradient using parameter shift rule or finite differences"""
+        method = self._resolve_gradient_method(cost_function)
         
-        if cost_function.gradient_method == "parameter_shift":
+        if method == "adjoint":
+            return self._adjoint_gradient(parameters, X, y, cost_function)
+        elif method == "parameter_shift":
             return self._parameter_shift_gradient(parameters, X, y, cost_function)
-        elif cost_function.gradient_method == "finite_diff":
-            return self._finite_difference_gradient(parameters, X, y, cost_function)
         else:
+            return self._finite_difference_gradient(parameters, X, y, cost_function)
+    
+    def loss_and_grad(self, parameters: np.ndarray,
+                      X: np.ndarray, y: np.ndarray,
+                      cost_function: CostFunction) -> Tuple[float, np.ndarray]:
+        """Cost and gradient at parameters, sharing the circuit evaluations between them"""
+        method = self._resolve_gradient_method(cost_function)
+        
+        if method == "finite_diff":
+            loss = self.compute_cost_function(parameters, X, y, cost_function)
+            return loss, self._finite_difference_gradient(parameters, X, y, cost_function)
+        
+        # The unshifted outputs needed for the chain rule also give the loss
+        jacobian, predictions = self._circuit_jacobian(parameters, X, method)
+        sample_costs = self._sample_costs(predictions, y, cost_function)
+        loss = float(self._aggregate_costs(sample_costs, parameters, cost_function))
+        
+        return loss, self._chain_rule_gradient(jacobian, predictions, parameters, y, cost_function)
+    
+    def _resolve_gradient_method(self, cost_function: CostFunction) -> str:
+        """Map the requested gradient method onto one the device can run"""
+        method = cost_function.gradient_method
+        
+        if method == "adjoint" and not self.vqc.supports_adjoint:
+            return "parameter_shift"
+        if method not in ("adjoint", "parameter_shift", "finite_diff"):
             # Auto-differentiation (if supported)
-            return self._autograd_gradient(parameters, X, y, cost_function)
+            return "adjoint" if self.vqc.supports_adjoint else "finite_diff"
+        return method
+    
+    def _circuit_jacobian(self, parameters: np.ndarray, X: np.ndarray,
+                          method: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(Q, N, P) Jacobian of the circuit outputs, and the (N, Q) outputs themselves"""
+        if self.vqc.is_native:
+            return self.vqc.qnode.jacobian(parameters, X), np.stack(self.vqc.qnode(parameters, X), axis=-1)
+        
+        params = pnp.array(parameters, requires_grad=True)
+        inputs = pnp.array(X, requires_grad=False)
+        
+        # param_shift cannot see through the nonlinear angle arithmetic of gate fusion,
+        # so fused circuits are differentiated end to end by autograd instead
+        if method == "adjoint" or self.vqc.parameters.fuse_single_qubit_gates:
+            jacobian = qml.jacobian(lambda p: qml.math.stack(self.vqc.qnode(p, inputs)))(params)
+        else:
+            # 2P shifted tapes, each evaluating the whole batch in one broadcasted execution
+            jacobian = np.stack(qml.gradients.param_shift(self.vqc.qnode)(params, inputs))
+        predictions = np.stack(self.vqc.qnode(parameters, X), axis=-1)
+        
+        return np.asarray(jacobian), predictions
     
     def _parameter_shift_gradient(self, parameters: np.ndarray,
                                 X: np.ndarray, y: np.ndarray,
                                 cost_function: CostFunction) -> np.ndarray:
         """Compute gradient using parameter shift rule"""
-        gradient = np.zeros_like(parameters)
-        shift = np.pi / 2
+        jacobian, predictions = self._circuit_jacobian(parameters, X, "parameter_shift")
+        return self._chain_rule_gradient(jacobian, predictions, parameters, y, cost_function)
+    
+    def _adjoint_gradient(self, parameters: np.ndarray,
+                        X: np.ndarray, y: np.ndarray,
+                        cost_function: CostFunction) -> np.ndarray:
+        """Compute gradient from the adjoint Jacobian of the circuit outputs"""
+        jacobian, predictions = self._circuit_jacobian(parameters, X, "adjoint")
+        return self._chain_rule_gradient(jacobian, predictions, parameters, y, cost_function)
+    
+    def _chain_rule_gradient(self, jacobian: np.ndarray, predictions: np.ndarray,
+                             parameters: np.ndarray, y: np.ndarray,
+                             cost_function: CostFunction) -> np.ndarray:
+        """Combine a (Q, N, P) circuit Jacobian with the cost's dependence on the outputs"""
+        # The cost is an arbitrary classical function of the outputs, so differentiate it
+        # numerically: a (Q, 1, Q) stack of shifts evaluates every output direction at once
+        epsilon = 1e-6
+        shifts = epsilon * np.eye(predictions.shape[1])[:, None, :]
+        cost_plus = self._sample_costs(predictions + shifts, y, cost_function)
+        cost_minus = self._sample_costs(predictions - shifts, y, cost_function)
+        cost_grads = ((cost_plus - cost_minus) / (2 * epsilon)).T
         
-        for i in range(len(parameters)):
-            # Forward shift
-            params_plus = parameters.copy()
-            params_plus[i] += shift
-            cost_plus = self.compute_cost_function(params_plus, X, y, cost_function)
-            
-            # Backward shift
-            params_minus = parameters.copy()
-            params_minus[i] -= shift
-            cost_minus = self.compute_cost_function(params_minus, X, y, cost_function)
-            
-            # Parameter shift rule
-            gradient[i] = (cost_plus - cost_minus) / 2
+        # Chain rule through the minibatch means used by compute_cost_function
+        sample_weights, num_batches = self._sample_weights(len(predictions))
+        gradient = np.einsum('qnp,nq,n->p', jacobian, cost_grads, sample_weights)
+        
+        if cost_function.regularization_weight > 0:
+            gradient += 2 * cost_function.regularization_weight * parameters / num_batches
         
         return gradient
     
+    def _sample_weights(self, num_samples: int) -> Tuple[np.ndarray, int]:
+        """Weight of each sample in the minibatch-averaged cost, and the minibatch count"""
+        batch_size = min(self.config.batch_size, num_samples)
+        num_batches = -(-num_samples // batch_size)
+        sample_sizes = np.minimum(batch_size, num_samples - (np.arange(num_samples) // batch_size) * batch_size)
+        return 1.0 / (sample_sizes * num_batches), num_batches
+    
+    def _build_jax_step(self, cost_function: CostFunction) -> Callable:
+        """Compile cost, gradient and optax update into a single jitted step"""
+        qnode = self.vqc._create_circuit(interface='jax')
+        if self.config.optimization_method == OptimizationMethod.ADAM:
+            optimizer = optax.adam(self.config.learning_rate)
+        else:
+            optimizer = optax.sgd(self.config.learning_rate)
+        self._opt_state = optimizer.init(jnp.asarray(self.vqc.variational_params))
+        
+        def cost_fn(params, X, y):
+            # Shapes are static under jit, so the minibatch weights fold into constants
+            sample_weights, num_batches = self._sample_weights(X.shape[0])
+            predictions = jnp.stack(qnode(params, X), axis=-1)
+            cost = jnp.sum(cost_function.function_vec(predictions, y) * sample_weights)
+            if cost_function.regularization_weight > 0:
+                cost = cost + cost_function.regularization_weight * jnp.sum(params**2) / num_batches
+            return cost
+        
+        def step(params, opt_state, X, y):
+            loss, grads = jax.value_and_grad(cost_fn)(params, X, y)
+            updates, opt_state = optimizer.update(grads, opt_state, params)
+            return optax.apply_updates(params, updates), opt_state, loss, grads
+        
+        return jax.jit(step)
+    
     def _finite_difference_gradient(self, parameters: np.ndarray,
                                   X: np.ndarray, y: np.ndarray,
                                   cost_function: CostFunction) -> np.ndarray:
         """Compute gradient using finite differences"""
         gradient = np.zeros_like(parameters)
-        epsilon = 1e-6
+        # A single-precision simulator resolves differences of about 1e-7, so step further out
+        epsilon = 1e-3 if self.vqc.single_precision else 1e-6
         
         for i in range(len(parameters)):
             params_plus = parameters.copy()
@@ -324,14 +1243,6 @@ class VQCOptimizer:
         
         return gradient
     
-    def _autograd_gradient(self, parameters: np.ndarray,
-                          X: np.ndarray, y: np.ndarray,
-                          cost_function: CostFunction) -> np.ndarray:
-        """Compute gradient using automatic differentiation"""
-        # This would use PennyLane's autograd capabilities
-        # Simplified implementation here
-        return self._finite_difference_gradient(parameters, X, y, cost_function)
-    
     def train(self, X_train: np.ndarray, y_train: np.ndarray,
              X_val: np.ndarray, y_val: np.ndarray,
              cost_function: CostFunction) -> Dict[str, Any]:
@@ -341,13 +1252,45 @@ class VQCOptimizer:
         best_loss = float('inf')
         patience_counter = 0
         
+        # Per-iteration history lives in contiguous float32 buffers, trimmed once training stops
+        max_iterations = self.config.max_iterations
+        loss_log = np.empty(max_iterations, dtype=np.float32)
+        val_loss_log = np.empty(max_iterations, dtype=np.float32)
+        param_log = np.empty((max_iterations, self.vqc.num_parameters), dtype=np.float32)
+        num_iterations = 0
+        
         logger.info(f"Starting VQC training with {self.config.optimization_method.name}")
         
-        for iteration in range(self.config.max_iterations):
-            # Compute current loss
-            current_loss = self.compute_cost_function(
-                self.vqc.variational_params, X_train, y_train, cost_function
-            )
+        gradient_based = self.config.optimization_method in [OptimizationMethod.ADAM, OptimizationMethod.GRADIENT_DESCENT]
+        
+        jax_step = None
+        if self.config.use_jax_jit and gradient_based:
+            if not JAX_AVAILABLE:
+                logger.warning("JAX/optax not installed, falling back to the uncompiled training step")
+            elif self.vqc.is_native:
+                logger.warning("The native simulator cannot be traced by JAX, using the uncompiled training step")
+            elif cost_function.function_vec is None:
+                logger.warning(f"Cost function {cost_function.name} has no function_vec, cannot jit the training step")
+            else:
+                jax_step = self._build_jax_step(cost_function)
+                X_jax, y_jax = jnp.asarray(X_train), jnp.asarray(y_train)
+        
+        for iteration in range(max_iterations):
+            # Compute current loss, together with the gradient when the optimizer needs one
+            gradient = None
+            if jax_step is not None:
+                new_params, self._opt_state, current_loss, gradient = jax_step(
+                    jnp.asarray(self.vqc.variational_params), self._opt_state, X_jax, y_jax
+                )
+                current_loss, gradient = float(current_loss), np.asarray(gradient)
+            elif gradient_based:
+                current_loss, gradient = self.loss_and_grad(
+                    self.vqc.variational_params, X_train, y_train, cost_function
+                )
+            else:
+                current_loss = self.compute_cost_function(
+                    self.vqc.variational_params, X_train, y_train, cost_function
+                )
             
             # Compute validation loss
             val_loss = self.compute_cost_function(
@@ -355,9 +1298,10 @@ class VQCOptimizer:
             )
             
             # Store history
-            self.training_history['loss'].append(current_loss)
-            self.training_history['validation_loss'].append(val_loss)
-            self.training_history['parameters'].append(self.vqc.variational_params.copy())
+            loss_log[iteration] = current_loss
+            val_loss_log[iteration] = val_loss
+            param_log[iteration] = self.vqc.variational_params
+            num_iterations = iteration + 1
             
             # Check convergence
             if abs(current_loss - best_loss) < self.config.convergence_threshold:
@@ -374,28 +1318,24 @@ class VQCOptimizer:
                     logger.info(f"Early stopping at iteration {iteration}")
                     break
             
-            # Compute gradient and update parameters
-            if self.config.optimization_method in [OptimizationMethod.ADAM, OptimizationMethod.GRADIENT_DESCENT]:
-                gradient = self.compute_gradient(
-                    self.vqc.variational_params, X_train, y_train, cost_function
-                )
+            # Update parameters
+            if gradient is not None:
                 self.training_history['gradients'].append(gradient.copy())
+            
+            if jax_step is not None:
+                self.vqc.update_parameters(np.asarray(new_params))
                 
-                # PyTorch optimization step
-                self.torch_optimizer.zero_grad()
-                params_tensor = torch.tensor(self.vqc.variational_params, requires_grad=True)
-                params_tensor.grad = torch.tensor(gradient)
-                self.torch_optimizer.step()
-                
-                self.vqc.update_parameters(params_tensor.detach().numpy())
+            elif gradient_based:
+                self.vqc.update_parameters(self._gradient_step(self.vqc.variational_params, gradient))
                 
             elif self.config.optimization_method == OptimizationMethod.BFGS:
-                # Use scipy optimization
+                # Use scipy optimization; fun returns (cost, gradient) so no finite-difference probing
                 result = minimize(
-                    fun=lambda p: self.compute_cost_function(p, X_train, y_train, cost_function),
+                    fun=lambda p: self.loss_and_grad(p, X_train, y_train, cost_function),
                     x0=self.vqc.variational_params,
-                    method='BFGS',
-                    options={'maxiter': 10}  # Limit iterations per update
+                    jac=True,
+                    method='L-BFGS-B',
+                    options={'maxiter': 10, 'gtol': 1e-5}  # Limit iterations per update
                 )
                 self.vqc.update_parameters(result.x)
             
@@ -409,11 +1349,15 @@ class VQCOptimizer:
         
         training_time = time.time() - start_time
         
+        self.training_history['loss'] = loss_log[:num_iterations]
+        self.training_history['validation_loss'] = val_loss_log[:num_iterations]
+        self.training_history['parameters'] = param_log[:num_iterations]
+        
         return {
             'final_loss': current_loss,
             'final_validation_loss': val_loss,
             'training_time': training_time,
-            'iterations': len(self.training_history['loss']),
+            'iterations': num_iterations,
             'converged': abs(current_loss - best_loss) < self.config.convergence_threshold,
             'history': self.training_history
         }
@@ -431,15 +1375,17 @@ class VQCOptimizer:
         ak = a / ((iteration + 1) ** alpha)
         ck = c / ((iteration + 1) ** gamma)
         
-        # Generate random perturbation
-        delta = 2 * np.random.randint(0, 2, size=len(self.vqc.variational_params)) - 1
+        # Generate random perturbation: one random bit per parameter, mapped to +/-1
+        num_params = len(self.vqc.variational_params)
+        bits = np.unpackbits(np.frombuffer(self._rng.bytes((num_params + 7) // 8), dtype=np.uint8))
+        delta = bits[:num_params].astype(np.float32) * 2 - 1
         
-        # Evaluate cost at perturbed points
-        params_plus = self.vqc.variational_params + ck * delta
-        params_minus = self.vqc.variational_params - ck * delta
-        
-        cost_plus = self.compute_cost_function(params_plus, X, y, cost_function)
-        cost_minus = self.compute_cost_function(params_minus, X, y, cost_function)
+        # Evaluate cost at both perturbed points in one broadcasted call
+        params_stack = np.stack([self.vqc.variational_params + ck * delta,
+                                 self.vqc.variational_params - ck * delta])
+        predictions = self.vqc.forward_broadcast(params_stack, X)
+        sample_costs = self._sample_costs(predictions, y, cost_function)
+        cost_plus, cost_minus = self._aggregate_costs(sample_costs, params_stack, cost_function)
         
         # SPSA gradient estimate
         gradient_estimate = (cost_plus - cost_minus) / (2 * ck * delta)
@@ -460,7 +1406,8 @@ class VQCClassifier:
         self.cost_function = CostFunction(
             name="cross_entropy",
             function=self._cross_entropy_loss,
-            gradient_method="parameter_shift"
+            gradient_method="adjoint",
+            function_vec=self._cross_entropy_loss_vec
         )
     
     def _cross_entropy_loss(self, prediction: np.ndarray, target: float) -> float:
@@ -474,6 +1421,12 @@ class VQCClassifier:
         else:
             return -np.log(1 - prob)
     
+    def _cross_entropy_loss_vec(self, predictions: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """Cross-entropy loss over a batch of predictions"""
+        # qml.math dispatches on the array type, so this also traces under jax.jit
+        prob = qml.math.clip((predictions[..., 0] + 1) / 2, 1e-10, 1 - 1e-10)
+        return qml.math.where(targets == 1, -qml.math.log(prob), -qml.math.log(1 - prob))
+    
     def fit(self, X_train: np.ndarray, y_train: np.ndarray,
            X_val: np.ndarray = None, y_val: np.ndarray = None) -> Dict[str, Any]:
         """Train the VQC classifier"""
@@ -487,6 +1440,7 @@ class VQCClassifier:
             y_train = y_train[:split_idx]
         
         training_result = self.optimizer.train(X_train, y_train, X_val, y_val, self.cost_function)
+        training_result['quantization_error'] = self.vqc.quantize_parameters()
         self.is_trained = True
         
         return training_result
@@ -496,13 +1450,10 @@ class VQCClassifier:
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction")
         
-        probabilities = []
-        for x in X:
-            output = self.vqc.forward(x)
-            prob = (output[0] + 1) / 2  # Map from [-1, 1] to [0, 1]
-            probabilities.append([1 - prob, prob])
+        outputs = self.vqc.predict_outputs(X)
+        prob = (outputs[:, 0] + 1) / 2  # Map from [-1, 1] to [0, 1]
         
-        return np.array(probabilities)
+        return np.stack([1 - prob, prob], axis=1)
     
     def predict(self, X: np.ndarray) -> np.ndarray:
         """Predict class labels"""
@@ -521,7 +1472,8 @@ class VQCRegressor:
         self.cost_function = CostFunction(
             name="mse",
             function=self._mse_loss,
-            gradient_method="parameter_shift"
+            gradient_method="adjoint",
+            function_vec=self._mse_loss_vec
         )
     
     def _mse_loss(self, prediction: np.ndarray, target: float) -> float:
@@ -530,6 +1482,10 @@ class VQCRegressor:
         pred_value = prediction[0]
         return (pred_value - target) ** 2
     
+    def _mse_loss_vec(self, predictions: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """Mean squared error loss over a batch of predictions"""
+        return (predictions[..., 0] - targets) ** 2
+    
     def fit(self, X_train: np.ndarray, y_train: np.ndarray,
            X_val: np.ndarray = None, y_val: np.ndarray = None) -> Dict[str, Any]:
         """Train the VQC regressor"""
@@ -549,6 +1505,7 @@ class VQCRegressor:
             y_val = 2 * (y_val - self.y_min) / (self.y_max - self.y_min) - 1
         
         training_result = self.optimizer.train(X_train, y_train_normalized, X_val, y_val, self.cost_function)
+        training_result['quantization_error'] = self.vqc.quantize_parameters()
         self.is_trained = True
         
         return training_result
@@ -558,15 +1515,23 @@ class VQCRegressor:
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction")
         
-        predictions = []
-        for x in X:
-            output = self.vqc.forward(x)
-            # Denormalize prediction
-            pred_normalized = output[0]
-            pred = (pred_normalized + 1) * (self.y_max - self.y_min) / 2 + self.y_min
-            predictions.append(pred)
+        outputs = self.vqc.predict_outputs(X)
         
-        return np.array(predictions)
+        # Denormalize prediction
+        pred_normalized = outputs[:, 0]
+        return (pred_normalized + 1) * (self.y_max - self.y_min) / 2 + self.y_min
+
+def _compress(payload: bytes) -> Tuple[bytes, bytes]:
+    """Compress a cache payload, returning (codec, data)"""
+    if ZSTD_AVAILABLE:
+        return b"zstd", zstandard.ZstdCompressor(level=3).compress(payload)
+    return b"zlib", zlib.compress(payload, 6)
+
+def _decompress(codec: bytes, data: bytes) -> bytes:
+    """Inverse of _compress"""
+    if codec == b"zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
 
 class VQCMLService:
     """Main service for Variational Quantum Circuit Machine Learning"""
@@ -575,11 +1540,49 @@ class VQCMLService:
         self.models: Dict[str, Union[VQCClassifier, VQCRegressor]] = {}
         self.redis_client = redis.Redis.from_url(redis_url) if redis_url else None
         
+        # Parameter-shift batches fan out to worker processes only where the compiled
+        # kernel is missing
+        cpu_count = os.cpu_count() or 1
+        self._gradient_pool = ProcessPoolExecutor(max_workers=cpu_count) if cpu_count > 1 and not NUMBA_AVAILABLE else None
+        
+        # Fits run off the event loop on these threads; the serial kernel releases the GIL,
+        # so overlapping fits share the cores
+        self._training_pool = ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_TRAININGS, cpu_count),
+                                                 thread_name_prefix="vqc-train")
+        
+        # Native simulators by (num_qubits, gate sequence, dtype), shared by every model of that layout
+        self._circuit_cache: Dict[Tuple, _StateVectorCircuit] = {}
+    
+    def _share_circuit(self, model: Union['VQCClassifier', 'VQCRegressor']):
+        """Point a native-simulator model at the service-wide simulator for its layout"""
+        vqc = model.vqc
+        if not vqc.is_native:
+            return
+        
+        # Models differ only in their output head and loss, so the simulator and
+        # its encoded-batch, shared-memory and device caches serve them all
+        key = (vqc.parameters.num_qubits, vqc._gate_sequence, vqc.qnode.dtype)
+        circuit = self._circuit_cache.get(key)
+        if circuit is None:
+            circuit = self._circuit_cache[key] = vqc.qnode
+            circuit.executor = self._gradient_pool
+        vqc.qnode = circuit
+    
+    def shutdown(self):
+        """Stop the worker pools and free shared-memory batches"""
+        for circuit in self._circuit_cache.values():
+            circuit.release_shared_memory()
+        if self._gradient_pool is not None:
+            self._gradient_pool.shutdown()
+            self._gradient_pool = None
+        self._training_pool.shutdown()
+        
     async def create_classifier(self, model_id: str, 
                               vqc_parameters: VQCParameters,
                               training_config: TrainingConfig) -> str:
         """Create a new VQC classifier"""
         classifier = VQCClassifier(vqc_parameters, training_config)
+        self._share_circuit(classifier)
         self.models[model_id] = classifier
         
         logger.info(f"Created VQC classifier {model_id}")
@@ -590,6 +1593,7 @@ class VQCMLService:
                              training_config: TrainingConfig) -> str:
         """Create a new VQC regressor"""
         regressor = VQCRegressor(vqc_parameters, training_config)
+        self._share_circuit(regressor)
         self.models[model_id] = regressor
         
         logger.info(f"Created VQC regressor {model_id}")
@@ -602,27 +1606,70 @@ class VQCMLService:
         if model_id not in self.models:
             raise ValueError(f"Model {model_id} not found")
         
-        model = self.models[model_id]
-        training_result = model.fit(X_train, y_train, X_val, y_val)
+        # The whole optimization loop runs synchronously on the training thread
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._training_pool, self._train_sync,
+                                          model_id, X_train, y_train, X_val, y_val)
+    
+    def _train_sync(self, model_id: str, X_train: np.ndarray, y_train: np.ndarray,
+                    X_val: Optional[np.ndarray], y_val: Optional[np.ndarray]) -> Dict[str, Any]:
+        """Fit a model and cache its result, without touching the event loop"""
+        training_result = self.models[model_id].fit(X_train, y_train, X_val, y_val)
         
         # Cache training result
         if self.redis_client:
-            cache_key = f"training_result:{model_id}"
-            self.redis_client.setex(cache_key, 3600, pickle.dumps(training_result))
+            self._cache_training_result(model_id, training_result)
         
         logger.info(f"Training completed for model {model_id}")
         return training_result
     
+    def _cache_training_result(self, model_id: str, training_result: Dict[str, Any]):
+        """Store a training result as a Redis hash with the history compressed"""
+        cache_key = f"training_result:{model_id}"
+        
+        # Summary fields stay individually readable; only the bulky history is compressed
+        fields = {key: pickle.dumps(value) for key, value in training_result.items() if key != 'history'}
+        fields['codec'], fields['history'] = _compress(pickle.dumps(training_result['history']))
+        
+        pipe = self.redis_client.pipeline()
+        pipe.delete(cache_key)
+        pipe.hset(cache_key, mapping=fields)
+        pipe.expire(cache_key, TRAINING_RESULT_TTL)
+        pipe.execute()
+    
+    def get_cached_training_result(self, model_id: str,
+                                   include_history: bool = True) -> Optional[Dict[str, Any]]:
+        """Read a cached training result, optionally skipping the history blob"""
+        if not self.redis_client:
+            return None
+        
+        fields = self.redis_client.hgetall(f"training_result:{model_id}")
+        if not fields:
+            return None
+        
+        codec = fields.pop(b'codec')
+        history = fields.pop(b'history')
+        result = {key.decode(): pickle.loads(value) for key, value in fields.items()}
+        if include_history:
+            result['history'] = pickle.loads(_decompress(codec, history))
+        
+        return result
+    
     async def predict(self, model_id: str, X: np.ndarray) -> np.ndarray:
         """Make predictions with a trained model"""
         if model_id not in self.models:
             raise ValueError(f"Model {model_id} not found")
         
         model = self.models[model_id]
-        predictions = model.predict(X)
+        predictions = await asyncio.to_thread(model.predict, X)
         
         return predictions
     
+    async def predict_many(self, model_ids: List[str], X: np.ndarray) -> Dict[str, np.ndarray]:
+        """Run several models on the same inputs concurrently"""
+        predictions = await asyncio.gather(*(self.predict(model_id, X) for model_id in model_ids))
+        return dict(zip(model_ids, predictions))
+    
     async def predict_proba(self, model_id: str, X: np.ndarray) -> np.ndarray:
         """Get prediction probabilities (for classifiers)"""
         if model_id not in self.models:
@@ -632,7 +1679,7 @@ class VQCMLService:
         if not isinstance(model, VQCClassifier):
             raise ValueError(f"Model {model_id} is not a classifier")
         
-        probabilities = model.predict_proba(X)
+        probabilities = await asyncio.to_thread(model.predict_proba, X)
         return probabilities
     
     async def evaluate_model(self, model_id: str,
@@ -642,17 +1689,20 @@ class VQCMLService:
             raise ValueError(f"Model {model_id} not found")
         
         model = self.models[model_id]
-        predictions = model.predict(X_test)
+        predictions = await asyncio.to_thread(model.predict, X_test)
         
         if isinstance(model, VQCClassifier):
-            # Classification metrics
-            accuracy = np.mean(predictions == y_test)
-            
-            # Compute confusion matrix elements
-            tp = np.sum((predictions == 1) & (y_test == 1))
-            tn = np.sum((predictions == 0) & (y_test == 0))
-            fp = np.sum((predictions == 1) & (y_test == 0))
-            fn = np.sum((predictions == 0) & (y_test == 1))
+            # Classification metrics, with the confusion matrix elements
+            if NUMBA_AVAILABLE:
+                correct, tp, tn, fp, fn = _classification_counts(np.asarray(y_test, dtype=np.int64),
+                                                                 np.asarray(predictions, dtype=np.int64))
+                accuracy = correct / len(y_test) if len(y_test) else np.nan
+            else:
+                accuracy = np.mean(predictions == y_test)
+                tp = np.sum((predictions == 1) & (y_test == 1))
+                tn = np.sum((predictions == 0) & (y_test == 0))
+                fp = np.sum((predictions == 1) & (y_test == 0))
+                fn = np.sum((predictions == 0) & (y_test == 1))
             
             precision = tp / (tp + fp) if (tp + fp) > 0 else 0
             recall = tp / (tp + fn) if (tp + fn) > 0 else 0
@@ -667,12 +1717,18 @@ class VQCMLService:
         
         else:  # Regressor
             # Regression metrics
-            mse = np.mean((predictions - y_test) ** 2)
-            mae = np.mean(np.abs(predictions - y_test))
+            if NUMBA_AVAILABLE:
+                ss_res, abs_err, ss_tot = _regression_sums(np.asarray(y_test, dtype=np.float64),
+                                                           np.asarray(predictions, dtype=np.float64))
+                mse = ss_res / len(y_test) if len(y_test) else np.nan
+                mae = abs_err / len(y_test) if len(y_test) else np.nan
+            else:
+                mse = np.mean((predictions - y_test) ** 2)
+                mae = np.mean(np.abs(predictions - y_test))
+                ss_res = np.sum((y_test - predictions) ** 2)
+                ss_tot = np.sum((y_test - np.mean(y_test)) ** 2)
             
             # R-squared
-            ss_res = np.sum((y_test - predictions) ** 2)
-            ss_tot = np.sum((y_test - np.mean(y_test)) ** 2)
             r2_score = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
             
             return {
@@ -696,6 +1752,7 @@ class VQCMLService:
             'num_layers': model.vqc.parameters.num_layers,
             'architecture': model.vqc.parameters.architecture.name,
             'num_parameters': model.vqc.num_parameters,
+            'device': model.vqc.device_name,
             'is_trained': model.is_trained
         }
         
@@ -720,13 +1777,13 @@ async def example_vqc_ml():
     y_classification = (X[:, 0] + X[:, 1] > 0).astype(int)  # Simple classification rule
     y_regression = X[:, 0] ** 2 + X[:, 1] ** 2  # Simple regression target
     
-    # Split data
+    # Split data once into contiguous (pinned, on GPU builds) buffers reused by every call below
     split_idx = int(0.8 * n_samples)
-    X_train, X_test = X[:split_idx], X[split_idx:]
-    y_class_train, y_class_test = y_classification[:split_idx], y_classification[split_idx:]
-    y_reg_train, y_reg_test = y_regression[:split_idx], y_regression[split_idx:]
+    X_train, X_test = _host_array(X[:split_idx]), _host_array(X[split_idx:])
+    y_class_train, y_class_test = _host_array(y_classification[:split_idx]), _host_array(y_classification[split_idx:])
+    y_reg_train, y_reg_test = _host_array(y_regression[:split_idx]), _host_array(y_regression[split_idx:])
     
-    # Create and train classifier
+    # Circuit and training settings shared by both models
     vqc_params = VQCParameters(
         num_qubits=4,
         num_layers=3,
@@ -739,31 +1796,42 @@ async def example_vqc_ml():
         optimization_method=OptimizationMethod.ADAM
     )
     
-    # Classification
+    # The two models share no state, so they train and evaluate concurrently
     classifier_id = await service.create_classifier("test_classifier", vqc_params, training_config)
-    class_training_result = await service.train_model(classifier_id, X_train, y_class_train)
-    class_metrics = await service.evaluate_model(classifier_id, X_test, y_class_test)
-    
-    print("Classification Results:")
-    print(f"Training completed in {class_training_result['training_time']:.2f}s")
-    print(f"Final loss: {class_training_result['final_loss']:.4f}")
-    print(f"Test accuracy: {class_metrics['accuracy']:.4f}")
-    print(f"Test F1-score: {class_metrics['f1_score']:.4f}")
-    
-    # Regression
     regressor_id = await service.create_regressor("test_regressor", vqc_params, training_config)
-    reg_training_result = await service.train_model(regressor_id, X_train, y_reg_train)
-    reg_metrics = await service.evaluate_model(regressor_id, X_test, y_reg_test)
+    class_training_result, reg_training_result = await asyncio.gather(
+        service.train_model(classifier_id, X_train, y_class_train),
+        service.train_model(regressor_id, X_train, y_reg_train),
+    )
+    class_metrics, reg_metrics = await asyncio.gather(
+        service.evaluate_model(classifier_id, X_test, y_class_test),
+        service.evaluate_model(regressor_id, X_test, y_reg_test),
+    )
+    
+    # Report lines are collected and written once, so sweeps driving this example don't contend on stdout
+    lines = [
+        "Classification Results:\n",
+        f"Training completed in {class_training_result['training_time']:.2f}s\n",
+        f"Final loss: {class_training_result['final_loss']:.4f}\n",
+        f"Test accuracy: {class_metrics['accuracy']:.4f}\n",
+        f"Test F1-score: {class_metrics['f1_score']:.4f}\n",
+    ]
     
-    print("\nRegression Results:")
-    print(f"Training completed in {reg_training_result['training_time']:.2f}s")
-    print(f"Final loss: {reg_training_result['final_loss']:.4f}")
-    print(f"Test MSE: {reg_metrics['mse']:.4f}")
-    print(f"Test R²: {reg_metrics['r2_score']:.4f}")
+    lines += [
+        "\nRegression Results:\n",
+        f"Training completed in {reg_training_result['training_time']:.2f}s\n",
+        f"Final loss: {reg_training_result['final_loss']:.4f}\n",
+        f"Test MSE: {reg_metrics['mse']:.4f}\n",
+        f"Test R²: {reg_metrics['r2_score']:.4f}\n",
+    ]
     
     # List all models
     models = service.list_models()
-    print(f"\nCreated models: {[model['model_id'] for model in models]}")
+    lines.append(f"\nCreated models: {[model['model_id'] for model in models]}\n")
+    
+    sys.stdout.writelines(lines)
+    sys.stdout.flush()
+    service.shutdown()
 
 if __name__ == "__main__":
     asyncio.run(example_vqc_ml())